@@ -0,0 +1,38 @@
+"""Performance scripts for the task manager.
+
+Run them as modules from the project root, e.g.
+``python -m benchmarks.explain_task_filters --help``. They use the
+database configured through ``DATABASE_URL``; the ones that seed data or
+change the schema work in a ``throwaway_database()`` next to it.
+"""
+
+import os
+from contextlib import contextmanager
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def throwaway_database():
+    """Create a test database next to the configured one and drop it after.
+
+    In memory for SQLite, ``test_<name>`` for PostgreSQL, so seeded rows
+    and dropped indexes never reach a real database, even when the run
+    is interrupted.
+    """
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -0,0 +1,101 @@
+"""Measure page latency and throughput of a running server.
+
+Start the server under test in another terminal, e.g. ``make
+render-start`` (gunicorn, WSGI) or ``make asgi-start`` (uvicorn with the
+async views), then:
+
+    python -m benchmarks.latency --base-url http://127.0.0.1:8000 \\
+        --username admin --password secret --concurrency 32 \\
+        /tasks/ /tasks/1/ /statuses/
+
+Every path is requested ``--requests`` times by ``--concurrency``
+threads sharing one logged-in session, and p50/p99 latency and requests
+per second are printed per path. The script needs only the standard
+library, so the same command measures both deployments.
+"""
+
+import argparse
+import http.cookiejar
+import statistics
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def login(base_url, username, password):
+    """Return an opener that carries the session cookie of ``username``."""
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(
+        urllib.request.HTTPCookieProcessor(jar)
+    )
+    login_url = urllib.parse.urljoin(base_url, "/login/")
+    opener.open(login_url).read()
+    csrf_token = next(
+        (cookie.value for cookie in jar if cookie.name == "csrftoken"), ""
+    )
+    data = urllib.parse.urlencode({
+        "username": username,
+        "password": password,
+        "csrfmiddlewaretoken": csrf_token,
+    }).encode()
+    request = urllib.request.Request(
+        login_url, data=data, headers={"Referer": login_url}
+    )
+    opener.open(request).read()
+    if not any(cookie.name == "sessionid" for cookie in jar):
+        raise SystemExit(f"Could not log in as {username!r}")
+    return opener
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def measure(opener, url, requests, concurrency):
+    """Return per-request latencies in seconds and the wall time."""
+
+    def fetch(_):
+        started = time.perf_counter()
+        with opener.open(url) as response:
+            response.read()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(fetch, range(requests)))
+    return latencies, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", default=["/tasks/"])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20)
+    args = parser.parse_args()
+
+    opener = login(args.base_url, args.username, args.password)
+    print(f"{'path':<30} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>8}")
+    for path in args.paths:
+        url = urllib.parse.urljoin(args.base_url, path)
+        # Прогрев: кэши строк и списков выбора, соединения воркеров.
+        measure(opener, url, args.warmup, args.concurrency)
+        latencies, elapsed = measure(
+            opener, url, args.requests, args.concurrency
+        )
+        print(
+            f"{path:<30} "
+            f"{statistics.median(latencies) * 1000:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.1f} "
+            f"{len(latencies) / elapsed:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Measure how many logins per second a password hasher setting allows.
+
+Without ``--base-url`` only the hashers are measured, in this process
+and with the cost settings of the current environment:
+
+    PASSWORD_SCRYPT_WORK_FACTOR=32768 \\
+        python -m benchmarks.login_throughput scrypt pbkdf2 --concurrency 4
+
+Each hasher checks ``--logins`` passwords in ``--concurrency`` threads,
+like that many workers logging users in at once.
+
+With ``--base-url`` whole logins go to a running server, each with a
+fresh session, e.g. after ``make asgi-start``:
+
+    python -m benchmarks.login_throughput --base-url http://127.0.0.1:8000 \\
+        --username admin --password secret --concurrency 32
+
+p50/p99 latency and logins per second are printed in both modes.
+"""
+
+import argparse
+import importlib.util
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import setup_django
+from benchmarks.latency import login, percentile
+
+HASHERS = ("scrypt", "argon2", "pbkdf2")
+
+
+def run(func, logins, concurrency):
+    """Call ``func`` ``logins`` times; return latencies and the wall time."""
+
+    def timed(_):
+        started = time.perf_counter()
+        func()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, range(logins)))
+    return latencies, time.perf_counter() - started
+
+
+def report(name, latencies, elapsed):
+    print(
+        f"{name:<30} "
+        f"{statistics.median(latencies) * 1000:>8.1f} "
+        f"{percentile(latencies, 0.99) * 1000:>8.1f} "
+        f"{len(latencies) / elapsed:>10.1f}"
+    )
+
+
+def measure_hashers(names, logins, concurrency):
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth.hashers import check_password, make_password
+    from django.test import override_settings
+
+    for name in names:
+        if name == "argon2" and importlib.util.find_spec("argon2") is None:
+            print(f"{name:<30} skipped: argon2-cffi is not installed")
+            continue
+        path = next(p for p in settings.PASSWORD_HASHERS if name in p.lower())
+        with override_settings(PASSWORD_HASHERS=[path]):
+            encoded = make_password("benchmark password")
+            latencies, elapsed = run(
+                lambda: check_password("benchmark password", encoded),
+                logins,
+                concurrency,
+            )
+        report(encoded.split("$", 1)[0], latencies, elapsed)
+
+
+def measure_server(args):
+    def log_in():
+        login(args.base_url, args.username, args.password)
+
+    # Прогрев: соединения воркеров и первые импорты.
+    run(log_in, min(args.logins, args.concurrency), args.concurrency)
+    latencies, elapsed = run(log_in, args.logins, args.concurrency)
+    report(args.base_url, latencies, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "hashers", nargs="*", metavar="hasher", help=", ".join(HASHERS)
+    )
+    parser.add_argument("--base-url")
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    unknown = set(args.hashers) - set(HASHERS)
+    if unknown:
+        parser.error(f"unknown hashers: {', '.join(sorted(unknown))}")
+
+    print(f"{'':<30} {'p50 ms':>8} {'p99 ms':>8} {'logins/s':>10}")
+    if args.base_url:
+        if not (args.username and args.password):
+            parser.error("--base-url needs --username and --password")
+        measure_server(args)
+    else:
+        measure_hashers(
+            args.hashers or HASHERS, args.logins, args.concurrency
+        )
+
+
+if __name__ == "__main__":
+    main()
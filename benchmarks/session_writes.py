@@ -0,0 +1,122 @@
+"""Count the queries each session storage makes on a typical visit.
+
+    CACHE_URL=redis://localhost:6379/0 python -m benchmarks.session_writes
+
+A test client walks through login, the task list, creating a status
+(which sets a success message), the status list (which shows it) and
+logout once for every ``SESSION_STORAGE`` mode. For each request the
+queries touching ``django_session`` and all writes are printed. The
+database from ``DATABASE_URL`` must be migrated; everything the walk
+creates is rolled back.
+"""
+
+import argparse
+
+from benchmarks import setup_django
+
+MODES = ("db", "cached_db", "signed_cookies")
+PASSWORD = "benchmark password"
+
+
+def steps():
+    from django.urls import reverse
+
+    return [
+        ("login", "post", reverse("login"),
+         {"username": "session_bench", "password": PASSWORD}),
+        ("task list", "get", reverse("tasks_index"), None),
+        ("create status", "post", reverse("status_create"),
+         {"name": "session bench status"}),
+        ("status list", "get", reverse("statuses_index"), None),
+        ("logout", "post", reverse("logout"), None),
+    ]
+
+
+def count(queries):
+    """Return session reads, session writes and all writes."""
+    reads = session_writes = writes = 0
+    for query in queries:
+        sql = query["sql"].lstrip().upper()
+        is_write = sql.startswith(("INSERT", "UPDATE", "DELETE"))
+        writes += is_write
+        if "DJANGO_SESSION" in sql:
+            session_writes += is_write
+            reads += not is_write
+    return reads, session_writes, writes
+
+
+def walk(mode):
+    from django.conf import settings
+    from django.db import connection, transaction
+    from django.test import Client, override_settings
+    from django.test.utils import CaptureQueriesContext
+
+    from task_manager.users.models import User
+
+    overrides = {
+        "SESSION_ENGINE": settings._SESSION_ENGINES[mode],
+        "MESSAGE_STORAGE": (
+            "django.contrib.messages.storage.fallback.FallbackStorage"
+            if mode == "db"
+            else "django.contrib.messages.storage.cookie.CookieStorage"
+        ),
+        "ALLOWED_HOSTS": ["testserver"],
+        "STORAGES": {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": (
+                    "django.contrib.staticfiles.storage.StaticFilesStorage"
+                ),
+            },
+        },
+    }
+    rows = []
+    with override_settings(**overrides), transaction.atomic():
+        User.objects.create_user(
+            username="session_bench",
+            password=PASSWORD,
+            first_name="Session",
+            last_name="Bench",
+        )
+        client = Client()
+        for name, method, url, data in steps():
+            with CaptureQueriesContext(connection) as queries:
+                response = getattr(client, method)(url, data)
+            if response.status_code >= 400:
+                raise SystemExit(f"{mode}: {name} -> {response.status_code}")
+            rows.append((name, *count(queries.captured_queries)))
+        transaction.set_rollback(True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "modes", nargs="*", metavar="mode", help=", ".join(MODES)
+    )
+    args = parser.parse_args()
+    unknown = set(args.modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+    setup_django()
+
+    print(
+        f"{'mode':<16} {'request':<16} {'session reads':>14} "
+        f"{'session writes':>15} {'all writes':>11}"
+    )
+    for mode in args.modes or MODES:
+        rows = walk(mode)
+        for name, reads, session_writes, writes in rows:
+            print(
+                f"{mode:<16} {name:<16} {reads:>14} "
+                f"{session_writes:>15} {writes:>11}"
+            )
+        total_writes = sum(row[2] for row in rows)
+        print(f"{mode:<16} {'total':<16} {'':>14} {total_writes:>15}")
+
+
+if __name__ == "__main__":
+    main()
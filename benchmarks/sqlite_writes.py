@@ -0,0 +1,97 @@
+"""Compare concurrent SQLite writes with and without ``SQLITE_TUNED``.
+
+    python -m benchmarks.sqlite_writes --workers 4 --writes 200
+
+For each profile a fresh database is migrated in a temporary directory.
+Then ``--workers`` processes, like gunicorn workers, run ``--writes``
+transactions each. A transaction reads and then inserts a label, the
+pattern that makes SQLite fail with "database is locked" when two
+workers try to upgrade their read locks at once. Committed writes per
+second, p99 latency and the share of transactions that failed are
+printed.
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.latency import percentile
+
+PROFILES = {"default": "0", "tuned": "1"}
+
+
+def write(worker, writes):
+    from benchmarks import setup_django
+
+    setup_django()
+    from django.db import OperationalError, transaction
+
+    from task_manager.labels.models import Label
+
+    latencies, errors = [], 0
+    for i in range(writes):
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                Label.objects.filter(name__startswith=f"w{worker}-").count()
+                Label.objects.create(name=f"w{worker}-{i}")
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    return latencies, errors
+
+
+def run(profile, workers, writes):
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = (
+            f"sqlite:///{Path(directory) / 'bench.sqlite3'}"
+        )
+        os.environ["SQLITE_TUNED"] = PROFILES[profile]
+        subprocess.run(
+            [sys.executable, "manage.py", "migrate", "-v0"], check=True
+        )
+        context = multiprocessing.get_context("spawn")
+        started = time.perf_counter()
+        with context.Pool(workers) as pool:
+            results = pool.starmap(
+                write, [(worker, writes) for worker in range(workers)]
+            )
+        elapsed = time.perf_counter() - started
+    latencies = [value for result in results for value in result[0]]
+    errors = sum(result[1] for result in results)
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{'profile':<10} {'writes/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'errors':>8}"
+    )
+    for profile in PROFILES:
+        latencies, errors, elapsed = run(profile, args.workers, args.writes)
+        total = args.workers * args.writes
+        p50 = statistics.median(latencies) * 1000 if latencies else 0
+        p99 = percentile(latencies, 0.99) * 1000 if latencies else 0
+        print(
+            f"{profile:<10} {len(latencies) / elapsed:>9.1f} "
+            f"{p50:>8.2f} {p99:>8.2f} {errors / total:>8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
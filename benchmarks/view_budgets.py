@@ -0,0 +1,407 @@
+"""Check the cost of every page against committed budgets.
+
+    python -m benchmarks.view_budgets
+    python -m benchmarks.view_budgets small medium --update-budgets
+
+A throwaway test database is created (in memory for SQLite, a
+``test_...`` database for PostgreSQL) and seeded with ``manage.py
+seed`` up to each dataset in ``DATASETS``, from the smallest to the
+largest. Every URL from ``task_manager/urls.py`` is then requested
+through the test client by the most active author, made staff: once
+to warm the caches and ``--repeat`` more times. The median wall time
+and the queries, rows fetched and response bytes of the last request
+are compared with ``benchmarks/budgets/<dataset>.json``, and all
+results are written to ``--output`` as JSON for trend tracking.
+
+The script exits with status 1 when a page goes over its budget, e.g.
+after a dropped ``select_related`` or a new query per row. Query and row
+budgets are exact, so after an intended change rerun it with
+``--update-budgets`` and commit the budget files. Wall time depends on
+the machine; ``--skip-time`` ignores it.
+"""
+
+import argparse
+import io
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks import setup_django, throwaway_database
+
+BUDGETS_DIR = Path(__file__).resolve().parent / "budgets"
+METRICS = ("queries", "rows", "bytes", "time_ms")
+# Запас при --update-budgets: число запросов и строк должно совпадать,
+# размер ответа и время могут немного плавать.
+BYTES_HEADROOM = 1.1
+TIME_HEADROOM = 3
+TIME_SLACK_MS = 20
+
+DATASETS = {
+    "small": {"users": 20, "statuses": 5, "labels": 10, "tasks": 100},
+    "medium": {"users": 100, "statuses": 10, "labels": 50, "tasks": 1_000},
+    "large": {"users": 500, "statuses": 20, "labels": 200, "tasks": 10_000},
+}
+SEED_OPTIONS = {"seed": 42, "end": "2026-01-01T00:00:00+00:00"}
+
+# (случай, имя URL, kwargs, строка запроса). В строках подставляются id
+# объектов из objects().
+CASES = [
+    ("index", "index", {}, ""),
+    ("login", "login", {}, ""),
+    ("users_index", "users_index", {}, ""),
+    ("user_autocomplete", "user_autocomplete", {}, "q=an"),
+    ("user_create", "user_create", {}, ""),
+    ("user_update", "user_update", {"pk": "{user}"}, ""),
+    ("user_delete", "user_delete", {"pk": "{user}"}, ""),
+    ("statuses_index", "statuses_index", {}, ""),
+    ("status_create", "status_create", {}, ""),
+    ("status_update", "status_update", {"pk": "{status}"}, ""),
+    ("status_delete", "status_delete", {"pk": "{status}"}, ""),
+    ("labels_index", "labels_index", {}, ""),
+    ("label_autocomplete", "label_autocomplete", {}, "q=seed"),
+    ("label_create", "label_create", {}, ""),
+    ("label_update", "label_update", {"pk": "{label}"}, ""),
+    ("label_delete", "label_delete", {"pk": "{label}"}, ""),
+    ("tasks_index", "tasks_index", {}, ""),
+    ("tasks_index:status", "tasks_index", {}, "status={status}"),
+    ("tasks_index:executor", "tasks_index", {}, "executor={executor}"),
+    ("tasks_index:labels", "tasks_index", {}, "labels={label}"),
+    ("tasks_index:self_tasks", "tasks_index", {}, "self_tasks=on"),
+    ("tasks_index:q", "tasks_index", {}, "q=deploy"),
+    ("task_export", "task_export", {}, ""),
+    ("task_create", "task_create", {}, ""),
+    ("task_show", "task_show", {"pk": "{task}"}, ""),
+    ("task_update", "task_update", {"pk": "{task}"}, ""),
+    ("task_delete", "task_delete", {"pk": "{task}"}, ""),
+    ("api_tasks", "api_tasks", {}, ""),
+    ("api_task", "api_task", {"pk": "{task}"}, ""),
+    ("api_statuses", "api_statuses", {}, ""),
+    ("api_status", "api_status", {"pk": "{status}"}, ""),
+    ("api_labels", "api_labels", {}, ""),
+    ("api_label", "api_label", {"pk": "{label}"}, ""),
+    ("api_users", "api_users", {}, ""),
+    ("api_user", "api_user", {"pk": "{user}"}, ""),
+    ("db_pool_stats", "db_pool_stats", {}, ""),
+]
+# URL без случая должен быть здесь, иначе скрипт не запустится.
+SKIPPED = {
+    "logout": "POST only",
+    "task_bulk": "POST only, changes tasks",
+    "metrics": "output depends on the requests made before",
+}
+SKIPPED_NAMESPACES = {"admin"}
+
+
+def url_names(resolver=None):
+    from django.urls import URLResolver, get_resolver
+
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace not in SKIPPED_NAMESPACES:
+                yield from url_names(pattern)
+        elif pattern.name:
+            yield pattern.name
+
+
+class QueryStats:
+    """Counts queries and fetched rows through an execute wrapper."""
+
+    def __init__(self):
+        self.queries = self.rows = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        self.queries += 1
+        # Подменяем fetch* только у этой обёртки курсора Django.
+        cursor = context["cursor"]
+        raw = cursor.cursor
+        cursor.fetchone = self._count_one(raw.fetchone)
+        cursor.fetchmany = self._count_many(raw.fetchmany)
+        cursor.fetchall = self._count_many(raw.fetchall)
+        return result
+
+    def _count_one(self, fetch):
+        def fetchone():
+            row = fetch()
+            self.rows += row is not None
+            return row
+
+        return fetchone
+
+    def _count_many(self, fetch):
+        def fetchmany(*args):
+            rows = fetch(*args)
+            self.rows += len(rows)
+            return rows
+
+        return fetchmany
+
+
+def request(client, url):
+    from django.db import connection
+
+    stats = QueryStats()
+    with connection.execute_wrapper(stats):
+        started = time.perf_counter()
+        response = client.get(url)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        elapsed = time.perf_counter() - started
+    if response.status_code != 200:
+        raise SystemExit(f"GET {url} -> {response.status_code}")
+    return {
+        "queries": stats.queries,
+        "rows": stats.rows,
+        "bytes": size,
+        "time_ms": elapsed * 1000,
+    }
+
+
+def grow(dataset):
+    """Seed the database up to the sizes of ``dataset``."""
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    from task_manager.labels.models import Label
+    from task_manager.statuses.models import Status
+    from task_manager.tasks.models import Task
+
+    current = {
+        "users": get_user_model().objects.count(),
+        "statuses": Status.objects.count(),
+        "labels": Label.objects.count(),
+        "tasks": Task.objects.count(),
+    }
+    call_command(
+        "seed",
+        stdout=io.StringIO(),
+        **{
+            name: max(0, size - current[name])
+            for name, size in DATASETS[dataset].items()
+        },
+        **SEED_OPTIONS,
+    )
+
+
+def log_in(client):
+    """Log in as the most active author, who may edit their own tasks."""
+    from django.contrib.auth import get_user_model
+
+    users = get_user_model().objects
+    user = users.order_by("-authored_task_count", "pk").first()
+    # Статистика пула доступна только сотрудникам.
+    users.filter(pk=user.pk).update(is_staff=True)
+    client.force_login(user)
+    return user
+
+
+def objects(user):
+    from django.contrib.auth import get_user_model
+
+    from task_manager.labels.models import Label
+    from task_manager.statuses.models import Status
+
+    executor = get_user_model().objects.order_by(
+        "-executed_task_count", "pk"
+    ).first()
+    return {
+        "user": user.pk,
+        "executor": executor.pk,
+        "status": Status.objects.order_by("pk").first().pk,
+        "label": Label.objects.order_by("pk").first().pk,
+        "task": user.authored_tasks.order_by("pk").last().pk,
+    }
+
+
+def run_dataset(client, repeat):
+    from django.core.cache import cache
+    from django.urls import reverse
+
+    ids = objects(log_in(client))
+    results = {}
+    for name, url_name, kwargs, query in CASES:
+        url = reverse(url_name, kwargs={
+            key: value.format(**ids) for key, value in kwargs.items()
+        })
+        if query:
+            url += "?" + query.format(**ids)
+        cache.clear()
+        request(client, url)
+        runs = [request(client, url) for _ in range(repeat)]
+        results[name] = {
+            **runs[-1],
+            "time_ms": round(
+                statistics.median(run["time_ms"] for run in runs), 2
+            ),
+            "url": url,
+        }
+    return results
+
+
+def budget_path(dataset):
+    return BUDGETS_DIR / f"{dataset}.json"
+
+
+def new_budgets(results):
+    return {
+        name: {
+            "queries": result["queries"],
+            "rows": result["rows"],
+            "bytes": math.ceil(result["bytes"] * BYTES_HEADROOM),
+            "time_ms": math.ceil(
+                result["time_ms"] * TIME_HEADROOM + TIME_SLACK_MS
+            ),
+        }
+        for name, result in results.items()
+    }
+
+
+def compare(dataset, results, budgets, skip_time):
+    """Return messages about every metric over its budget."""
+    violations = []
+    metrics = [metric for metric in METRICS
+               if not (skip_time and metric == "time_ms")]
+    for name, result in results.items():
+        budget = budgets.get(name)
+        if budget is None:
+            violations.append(f"{dataset} {name}: no budget")
+            continue
+        for metric in metrics:
+            if result[metric] > budget[metric]:
+                violations.append(
+                    f"{dataset} {name}: {metric} {result[metric]} > "
+                    f"{budget[metric]}"
+                )
+    return violations
+
+
+def git_commit():
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "datasets", nargs="*", metavar="dataset", help=", ".join(DATASETS)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="results file; bench-results/views-<time>.json by default",
+    )
+    parser.add_argument("--update-budgets", action="store_true")
+    parser.add_argument("--skip-time", action="store_true")
+    args = parser.parse_args()
+    unknown = set(args.datasets) - set(DATASETS)
+    if unknown:
+        parser.error(f"unknown datasets: {', '.join(sorted(unknown))}")
+    if args.repeat < 1:
+        parser.error("--repeat must be positive")
+    datasets = [name for name in DATASETS if name in args.datasets] or list(
+        DATASETS
+    )
+    setup_django()
+    import django
+    from django.conf import settings
+    from django.test import Client, override_settings
+
+    missing = (
+        set(url_names())
+        - {url_name for _, url_name, _, _ in CASES}
+        - set(SKIPPED)
+    )
+    if missing:
+        raise SystemExit(
+            f"No benchmark case for URLs: {', '.join(sorted(missing))}"
+        )
+
+    started_at = datetime.now(timezone.utc)
+    overrides = {
+        "ALLOWED_HOSTS": ["testserver"],
+        "DATABASE_REPLICAS": [],
+        "STORAGES": {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": (
+                    "django.contrib.staticfiles.storage.StaticFilesStorage"
+                ),
+            },
+        },
+    }
+    report = {
+        "created_at": started_at.isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "repeat": args.repeat,
+        "datasets": {},
+    }
+    violations = []
+    with override_settings(**overrides), throwaway_database() as connection:
+        report["database"] = connection.vendor
+        client = Client()
+        print(
+            f"{'dataset':<8} {'case':<24} {'queries':>8} {'rows':>7} "
+            f"{'bytes':>9} {'ms':>8}"
+        )
+        for dataset in datasets:
+            grow(dataset)
+            results = run_dataset(client, args.repeat)
+            report["datasets"][dataset] = {
+                "sizes": DATASETS[dataset],
+                "cases": results,
+            }
+            for name, result in results.items():
+                print(
+                    f"{dataset:<8} {name:<24} {result['queries']:>8} "
+                    f"{result['rows']:>7} {result['bytes']:>9} "
+                    f"{result['time_ms']:>8.2f}"
+                )
+
+            path = budget_path(dataset)
+            if args.update_budgets:
+                path.parent.mkdir(exist_ok=True)
+                path.write_text(
+                    json.dumps(new_budgets(results), indent=2) + "\n"
+                )
+                continue
+            budgets = json.loads(path.read_text()) if path.exists() else {}
+            violations += compare(dataset, results, budgets, args.skip_time)
+
+    report["violations"] = violations
+    output = args.output or Path("bench-results") / (
+        f"views-{started_at:%Y%m%dT%H%M%SZ}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results written to {output}")
+    if violations:
+        print("Over budget:")
+        for violation in violations:
+            print(f"  {violation}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
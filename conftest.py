@@ -1,4 +1,15 @@
+import pytest
+from django.core.cache import cache
 from whitenoise.storage import CompressedManifestStaticFilesStorage
 
 # Allow missing manifest entries to fall back to the original filename in tests
 CompressedManifestStaticFilesStorage.manifest_strict = False
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # Кэш в памяти общий для всех тестов, а id задач в тестовой базе
+    # повторяются, поэтому каждый тест начинается с пустого кэша.
+    cache.clear()
+    yield
+    cache.clear()
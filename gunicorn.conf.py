@@ -0,0 +1,34 @@
+"""Gunicorn settings, loaded automatically from the project root.
+
+Command line flags and ``GUNICORN_CMD_ARGS`` still override them.
+"""
+
+import glob
+import os
+import shutil
+import tempfile
+
+# Снимки метрик воркеров (task_manager/metrics.py) складываются в общий
+# каталог. Если он не задан, у каждого мастера свой, удаляемый на выходе.
+_METRICS_DIR = os.path.join(
+    tempfile.gettempdir(), f"task-manager-metrics-{os.getpid()}"
+)
+os.environ.setdefault("METRICS_DIR", _METRICS_DIR)
+
+
+def on_starting(server):
+    # В заданном каталоге могли остаться снимки прошлого запуска.
+    for path in glob.glob(os.path.join(os.environ["METRICS_DIR"], "*.json")):
+        os.remove(path)
+
+
+def on_exit(server):
+    if os.environ["METRICS_DIR"] == _METRICS_DIR:
+        shutil.rmtree(_METRICS_DIR, ignore_errors=True)
+
+
+def post_worker_init(worker):
+    # Соединения с базой открываются до первого запроса воркера.
+    from task_manager import db_pool
+
+    db_pool.warm_up()
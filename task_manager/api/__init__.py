@@ -0,0 +1 @@
+"""Read-only JSON API for tasks, statuses, labels and users."""
@@ -0,0 +1,191 @@
+"""How API objects are loaded and serialized.
+
+A resource maps every public field to the model columns it needs, so a
+request with ``fields=`` only SELECTs those columns. Related objects are
+embedded with one query per relation and page, never per item.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task, TaskLabel
+
+User = get_user_model()
+
+
+class ApiError(ValueError):
+    """A client error reported as ``400 Bad Request``."""
+
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class Field:
+    """A field read from one or more model columns."""
+
+    def __init__(self, *columns, getter=None):
+        self.columns = columns
+        self.getter = getter or (lambda obj: getattr(obj, columns[0]))
+
+    def load(self, objects):
+        """Return a function serializing the field of one object."""
+        return lambda obj: _json_value(self.getter(obj))
+
+
+class Related(Field):
+    """A foreign key embedded as a small object of another resource."""
+
+    def __init__(self, name, resource):
+        super().__init__(name)
+        self.attname = f"{name}_id"
+        self.resource = resource
+
+    def load(self, objects):
+        ids = {getattr(obj, self.attname) for obj in objects} - {None}
+        embedded = self.resource.embed(ids)
+        return lambda obj: embedded.get(getattr(obj, self.attname))
+
+
+class TaskLabels(Field):
+    """Task labels loaded through the through table for the whole page."""
+
+    def load(self, objects):
+        labels = defaultdict(list)
+        links = (
+            TaskLabel.objects.filter(task_id__in=[obj.pk for obj in objects])
+            .order_by("label__name", "label_id")
+            .values_list("task_id", "label_id", "label__name")
+        )
+        for task_id, label_id, name in links:
+            labels[task_id].append({"id": label_id, "name": name})
+        return lambda obj: labels[obj.pk]
+
+
+class Resource:
+    model = None
+    fields = {}
+    default_fields = ()
+    # Поля объекта, встроенного в другой ресурс.
+    embed_fields = ("id", "name")
+    ordering = ("pk",)
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def parse_fields(self, value):
+        if not value:
+            return list(self.default_fields)
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+        return names
+
+    def columns(self, names):
+        """Model columns to pass to ``QuerySet.only()``."""
+        columns = {"pk"}
+        for name in names:
+            columns.update(self.fields[name].columns)
+        return sorted(columns)
+
+    def serialize(self, objects, names):
+        objects = list(objects)
+        loaders = {
+            name: self.fields[name].load(objects) for name in names
+        }
+        return [
+            {name: loader(obj) for name, loader in loaders.items()}
+            for obj in objects
+        ]
+
+    def embed(self, ids):
+        """Serialize objects by id with ``embed_fields``, in one query."""
+        if not ids:
+            return {}
+        objects = self.get_queryset().filter(pk__in=ids).only(
+            *self.columns(self.embed_fields)
+        )
+        return {
+            data["id"]: data
+            for data in self.serialize(objects, self.embed_fields)
+        }
+
+
+class StatusResource(Resource):
+    model = Status
+    fields = {
+        "id": Field("pk"),
+        "name": Field("name"),
+        "created_at": Field("created_at"),
+        "task_count": Field("task_count"),
+    }
+    default_fields = ("id", "name", "created_at", "task_count")
+
+
+class LabelResource(Resource):
+    model = Label
+    fields = {
+        "id": Field("pk"),
+        "name": Field("name"),
+        "created_at": Field("created_at"),
+        "task_count": Field("task_count"),
+    }
+    default_fields = ("id", "name", "created_at", "task_count")
+
+
+class UserResource(Resource):
+    model = User
+    fields = {
+        "id": Field("pk"),
+        "username": Field("username"),
+        "first_name": Field("first_name"),
+        "last_name": Field("last_name"),
+        "full_name": Field(
+            "first_name",
+            "last_name",
+            getter=lambda user: user.get_full_name(),
+        ),
+        "date_joined": Field("date_joined"),
+        "authored_task_count": Field("authored_task_count"),
+        "executed_task_count": Field("executed_task_count"),
+    }
+    default_fields = (
+        "id",
+        "username",
+        "full_name",
+        "date_joined",
+        "authored_task_count",
+        "executed_task_count",
+    )
+    embed_fields = ("id", "username", "full_name")
+
+
+class TaskResource(Resource):
+    model = Task
+    fields = {
+        "id": Field("pk"),
+        "name": Field("name"),
+        "description": Field("description"),
+        "created_at": Field("created_at"),
+        "status": Related("status", StatusResource()),
+        "author": Related("author", UserResource()),
+        "executor": Related("executor", UserResource()),
+        "labels": TaskLabels(),
+    }
+    default_fields = (
+        "id",
+        "name",
+        "created_at",
+        "status",
+        "author",
+        "executor",
+        "labels",
+    )
+    ordering = ("created_at", "pk")
@@ -0,0 +1,30 @@
+from django.urls import path
+
+from task_manager.api import views
+
+urlpatterns = [
+    path('tasks/', views.TaskListApiView.as_view(), name='api_tasks'),
+    path(
+        'tasks/<int:pk>/',
+        views.TaskDetailApiView.as_view(),
+        name='api_task'
+        ),
+    path('statuses/', views.StatusListApiView.as_view(), name='api_statuses'),
+    path(
+        'statuses/<int:pk>/',
+        views.StatusDetailApiView.as_view(),
+        name='api_status'
+        ),
+    path('labels/', views.LabelListApiView.as_view(), name='api_labels'),
+    path(
+        'labels/<int:pk>/',
+        views.LabelDetailApiView.as_view(),
+        name='api_label'
+        ),
+    path('users/', views.UserListApiView.as_view(), name='api_users'),
+    path(
+        'users/<int:pk>/',
+        views.UserDetailApiView.as_view(),
+        name='api_user'
+        ),
+]
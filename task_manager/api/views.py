@@ -0,0 +1,150 @@
+from django.http import Http404, JsonResponse
+from django.views import View
+
+from task_manager.tasks.pagination import InvalidCursor, KeysetPaginator
+from task_manager.tasks.views import TaskFilterMixin
+
+from .resources import (
+    ApiError,
+    LabelResource,
+    StatusResource,
+    TaskResource,
+    UserResource,
+)
+
+
+class ApiView(View):
+    """Base JSON view: session authentication and error responses."""
+
+    http_method_names = ['get']
+    resource_class = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse(
+                {'error': 'Authentication required'}, status=401
+            )
+        self.resource = self.resource_class()
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+        except Http404:
+            return JsonResponse({'error': 'Not found'}, status=404)
+
+    def get_queryset(self):
+        return self.resource.get_queryset()
+
+    def get_ordering(self):
+        return self.resource.ordering
+
+    def get_fields(self):
+        return self.resource.parse_fields(self.request.GET.get('fields'))
+
+
+class ApiListView(ApiView):
+    paginate_by = 50
+    max_page_size = 500
+
+    def get_page_size(self):
+        try:
+            size = int(self.request.GET.get('limit', self.paginate_by))
+        except ValueError:
+            raise ApiError('limit must be an integer') from None
+        return min(max(size, 1), self.max_page_size)
+
+    def page_url(self, **cursor):
+        query = self.request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        query.update(cursor)
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{query.urlencode()}'
+        )
+
+    def get(self, request, *args, **kwargs):
+        names = self.get_fields()
+        queryset = self.get_queryset()
+        ordering = self.get_ordering()
+        # Поля сортировки нужны курсору, остальные колонки не читаются.
+        columns = set(self.resource.columns(names))
+        columns.update(
+            field for field in ordering
+            if field not in queryset.query.annotations
+        )
+        queryset = queryset.only(*sorted(columns))
+
+        paginator = KeysetPaginator(queryset, self.get_page_size(), ordering)
+        try:
+            page = paginator.page(
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+            )
+        except InvalidCursor:
+            raise ApiError('Invalid cursor') from None
+
+        return JsonResponse({
+            'results': self.resource.serialize(page.object_list, names),
+            'next': (
+                self.page_url(after=page.next_cursor)
+                if page.has_next() else None
+            ),
+            'previous': (
+                self.page_url(before=page.previous_cursor)
+                if page.has_previous() else None
+            ),
+        })
+
+
+class ApiDetailView(ApiView):
+    def get(self, request, pk, *args, **kwargs):
+        names = self.get_fields()
+        obj = (
+            self.get_queryset()
+            .only(*self.resource.columns(names))
+            .filter(pk=pk)
+            .first()
+        )
+        if obj is None:
+            raise Http404
+        return JsonResponse(self.resource.serialize([obj], names)[0])
+
+
+class TaskListApiView(TaskFilterMixin, ApiListView):
+    resource_class = TaskResource
+
+    def get_queryset(self):
+        queryset = self.filter_tasks(super().get_queryset())
+        if not self.filterset.is_valid():
+            raise ApiError(
+                f"Invalid filters: {', '.join(self.filterset.errors)}"
+            )
+        return queryset
+
+
+class TaskDetailApiView(ApiDetailView):
+    resource_class = TaskResource
+
+
+class StatusListApiView(ApiListView):
+    resource_class = StatusResource
+
+
+class StatusDetailApiView(ApiDetailView):
+    resource_class = StatusResource
+
+
+class LabelListApiView(ApiListView):
+    resource_class = LabelResource
+
+
+class LabelDetailApiView(ApiDetailView):
+    resource_class = LabelResource
+
+
+class UserListApiView(ApiListView):
+    resource_class = UserResource
+
+
+class UserDetailApiView(ApiDetailView):
+    resource_class = UserResource
@@ -9,8 +9,16 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
 
 application = get_asgi_application()
+
+# У uvicorn нет хука запуска воркера, а модуль импортируется в каждом.
+# Без пула прогревать нечего: view работают в других потоках.
+if settings.DATABASES["default"].get("OPTIONS", {}).get("pool"):
+    from task_manager import db_pool
+
+    db_pool.warm_up()
@@ -0,0 +1,41 @@
+"""URL configuration of the ASGI deployment (``ASYNC_VIEWS=1``).
+
+The read-only pages and the login form are served by their async views,
+every other URL by the regular ``task_manager.urls``. The live task
+list stream is only available here: under WSGI each open stream would
+hold a worker.
+"""
+from django.urls import path
+
+from task_manager import async_views
+from task_manager.tasks.async_views import (
+    TaskDetailAsyncView,
+    TaskEventsView,
+    TaskListAsyncView,
+)
+from task_manager.urls import urlpatterns as sync_urlpatterns
+from task_manager.users.async_views import UserLoginAsyncView
+
+urlpatterns = [
+    path('', async_views.IndexAsyncView.as_view(), name='index'),
+    path(
+        'users/',
+        async_views.UsersIndexAsyncView.as_view(),
+        name='users_index',
+    ),
+    path('login/', UserLoginAsyncView.as_view(), name='login'),
+    path(
+        'statuses/',
+        async_views.StatusListAsyncView.as_view(),
+        name='statuses_index',
+    ),
+    path(
+        'labels/',
+        async_views.LabelListAsyncView.as_view(),
+        name='labels_index',
+    ),
+    path('tasks/', TaskListAsyncView.as_view(), name='tasks_index'),
+    path('tasks/events/', TaskEventsView.as_view(), name='task_events'),
+    path('tasks/<int:pk>/', TaskDetailAsyncView.as_view(), name='task_show'),
+    *sync_urlpatterns,
+]
@@ -0,0 +1,85 @@
+"""Async versions of the read-only pages, served under ASGI.
+
+They are routed by ``task_manager/asgi_urls.py`` when ``ASYNC_VIEWS`` is
+on. A page loads everything with the async ORM and the async cache API
+first and then renders its template, which no longer touches the
+database, so the view itself never hands the request to a thread.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.mixins import AccessMixin
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.views import View
+
+from task_manager.conditional import AsyncConditionalGetMixin
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+
+User = get_user_model()
+
+
+class AsyncPageView(AccessMixin, View):
+    """Async GET page: load the context, then render the template."""
+
+    http_method_names = ['get', 'head', 'options']
+    template_name = None
+    login_required = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Ленивый request.user загружается синхронно, подменяем его.
+        request.user = await request.auser()
+        if self.login_required and not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        context = await self.aget_context_data(**kwargs)
+        return self.render(context)
+
+    async def aget_context_data(self, **kwargs):
+        kwargs.setdefault('view', self)
+        return kwargs
+
+    def render(self, context):
+        return HttpResponse(
+            render_to_string(self.template_name, context, self.request)
+        )
+
+
+class AsyncListView(AsyncPageView):
+    model = None
+    context_object_name = None
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    async def aget_context_data(self, **kwargs):
+        objects = [obj async for obj in self.get_queryset()]
+        kwargs['object_list'] = objects
+        kwargs[self.context_object_name] = objects
+        return await super().aget_context_data(**kwargs)
+
+
+class IndexAsyncView(AsyncPageView):
+    template_name = 'index.html'
+    login_required = False
+
+
+class UsersIndexAsyncView(AsyncConditionalGetMixin, AsyncListView):
+    model = User
+    template_name = 'users/index.html'
+    context_object_name = 'users'
+    login_required = False
+
+
+class StatusListAsyncView(AsyncConditionalGetMixin, AsyncListView):
+    model = Status
+    template_name = 'statuses/index.html'
+    context_object_name = 'statuses'
+
+
+class LabelListAsyncView(AsyncConditionalGetMixin, AsyncListView):
+    model = Label
+    template_name = 'labels/index.html'
+    context_object_name = 'labels'
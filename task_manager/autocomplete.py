@@ -0,0 +1,240 @@
+"""Prefix-search autocomplete for selects with too many options.
+
+The executor and label selects used to render every user and label.
+Now they render only the selected options, and
+``static/js/autocomplete.js`` loads matches from an ``AutocompleteView``
+while the user types. A search is a prefix scan of the
+``lower(column)`` indexes (see ``prefix_lookups()``), returns at most
+``limit`` matches and is cached until the model
+changes (see ``tasks/signals.py``).
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.functions import Lower
+from django.forms import Select, SelectMultiple
+from django.http import JsonResponse
+from django.views import View
+
+from task_manager import cache_utils
+from task_manager.labels.models import Label
+
+# Увеличить при изменении формата записи в кэше.
+VERSION = 1
+MAX_QUERY_LENGTH = 100
+
+User = get_user_model()
+
+
+def prefix_lookups(alias, prefix, vendor):
+    """Return the filter of values of ``alias`` that start with ``prefix``.
+
+    SQLite compares strings by code point, so the matches lie in
+    ``[prefix, next string)`` and the plain ``lower(column)`` index is
+    read as a range. PostgreSQL with a language collation orders strings
+    otherwise ('я' + 1 is 'ѐ', which sorts next to 'е'), so there the
+    index uses ``text_pattern_ops`` (see ``pattern_indexes()``) and
+    serves ``LIKE 'prefix%'`` alone.
+    """
+    lookups = {f"{alias}__startswith": prefix}
+    if vendor != "postgresql":
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        lookups.update({f"{alias}__gte": prefix, f"{alias}__lt": upper})
+    return lookups
+
+
+def pattern_indexes(*indexes):
+    """RunPython functions that switch ``lower()`` indexes to
+    ``text_pattern_ops`` on PostgreSQL and back.
+
+    ``indexes`` are ``(table, index name, column)`` triples; other
+    databases are left alone.
+    """
+
+    def rebuild(schema_editor, opclass):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        quote = schema_editor.quote_name
+        for table, name, column in indexes:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {quote(name)}")
+            schema_editor.execute(
+                f"CREATE INDEX {quote(name)} ON {quote(table)} "
+                f"(lower({quote(column)}) {opclass})"
+            )
+
+    def forwards(apps, schema_editor):
+        rebuild(schema_editor, "text_pattern_ops")
+
+    def backwards(apps, schema_editor):
+        rebuild(schema_editor, "")
+
+    return forwards, backwards
+
+
+class Autocomplete:
+    """Search ``fields`` of a model by a case-insensitive prefix."""
+
+    limit = 20
+
+    def __init__(self, name, get_queryset, fields):
+        self.name = name
+        self.get_queryset = get_queryset
+        self.fields = fields
+
+    def search(self, query):
+        """Return ``[{"id": ..., "text": ...}, ...]`` matching ``query``."""
+        prefix = query.strip().lower()[:MAX_QUERY_LENGTH]
+        if not prefix:
+            return []
+        generation = cache_utils.generation(f"autocomplete:{self.name}")
+        digest = hashlib.md5(prefix.encode()).hexdigest()
+        key = f"autocomplete:{self.name}:{generation}:{digest}"
+        results = cache.get(key, version=VERSION)
+        if results is None:
+            results = self._search(prefix)
+            cache.set(
+                key,
+                results,
+                settings.AUTOCOMPLETE_CACHE_TIMEOUT,
+                version=VERSION,
+            )
+        return results
+
+    def _search(self, prefix):
+        # Результат кэшируется, поэтому читаем основную базу, а не реплику.
+        vendor = connections[DEFAULT_DB_ALIAS].vendor
+        matches = {}
+        for field in self.fields:
+            alias = f"{field}_lower"
+            queryset = (
+                self.get_queryset()
+                .using(DEFAULT_DB_ALIAS)
+                .annotate(**{alias: Lower(field)})
+                .filter(**prefix_lookups(alias, prefix, vendor))
+                .order_by(alias, "pk")[:self.limit]
+            )
+            for obj in queryset:
+                matches.setdefault(obj.pk, str(obj))
+        return [
+            {"id": pk, "text": text}
+            for pk, text in list(matches.items())[:self.limit]
+        ]
+
+    def invalidate(self):
+        cache_utils.bump_generation(f"autocomplete:{self.name}")
+
+
+USERS = Autocomplete(
+    "users",
+    lambda: User.objects.only("first_name", "last_name"),
+    ("username", "first_name", "last_name"),
+)
+LABELS = Autocomplete(
+    "labels",
+    lambda: Label.objects.only("name"),
+    ("name",),
+)
+
+
+class AutocompleteView(LoginRequiredMixin, View):
+    http_method_names = ["get"]
+    source = None
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(
+            {"results": self.source.search(request.GET.get("q", ""))}
+        )
+
+
+class AutocompleteSelectMixin:
+    """Render only the selected options; the rest come from ``url``."""
+
+    def __init__(self, url, queryset, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+        self.queryset = queryset
+        # Подписи выбранных значений, загруженные заранее (aload_selected).
+        self.selected_labels = None
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = str(self.url)
+        return attrs
+
+    def _selected_ids(self, value):
+        return [str(v) for v in value if str(v).isdigit()]
+
+    def selected_choices(self, value):
+        ids = self._selected_ids(value)
+        if not ids:
+            return []
+        labels = self.selected_labels
+        if labels is None:
+            labels = {
+                str(obj.pk): str(obj)
+                for obj in self.queryset.filter(pk__in=ids)
+            }
+        return [(pk, labels[pk]) for pk in ids if pk in labels]
+
+    async def aload_selected(self, value):
+        """Load the selected labels with the async ORM before rendering."""
+        ids = self._selected_ids(value)
+        self.selected_labels = {}
+        if ids:
+            self.selected_labels = {
+                str(obj.pk): str(obj)
+                async for obj in self.queryset.filter(pk__in=ids)
+            }
+
+    def optgroups(self, name, value, attrs=None):
+        choices = [
+            (pk, label, True) for pk, label in self.selected_choices(value)
+        ]
+        if not self.allow_multiple_selected:
+            choices.insert(0, ("", "---------", not choices))
+        return [
+            (
+                None,
+                [self.create_option(
+                    name, pk, label, selected, index, attrs=attrs
+                )],
+                index,
+            )
+            for index, (pk, label, selected) in enumerate(choices)
+        ]
+
+
+class AutocompleteSelect(AutocompleteSelectMixin, Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteSelectMixin, SelectMultiple):
+    pass
+
+
+def use_autocomplete(field, url):
+    """Switch a ModelChoiceField (or a filter's one) to autocomplete."""
+    widget_class = (
+        AutocompleteSelectMultiple
+        if field.widget.allow_multiple_selected
+        else AutocompleteSelect
+    )
+    widget = widget_class(url, field.queryset, attrs=field.widget.attrs)
+    widget.is_required = field.widget.is_required
+    field.widget = widget
+
+
+async def aload_selected(form):
+    """Prepare the autocomplete widgets of ``form`` for async rendering."""
+    for bound_field in form:
+        widget = bound_field.field.widget
+        if isinstance(widget, AutocompleteSelectMixin):
+            value = bound_field.value()
+            if not isinstance(value, (list, tuple)):
+                value = [value] if value not in (None, "") else []
+            await widget.aload_selected(value)
@@ -0,0 +1,54 @@
+"""Cache invalidation shared by the cached rows, lists and users.
+
+``delete_after_commit()`` drops keys right away and once more after the
+transaction commits: a concurrent request may read the old rows before
+the commit and cache them again after the first delete.
+
+Entries that cannot be listed key by key, e.g. autocomplete results
+for every prefix, live under a generation: ``generation()`` is part of
+their keys and ``bump_generation()`` drops it, so the next request
+starts a new one and the old entries expire unused.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Увеличить при изменении формата ключа поколения.
+VERSION = 1
+
+
+def delete_after_commit(keys, version=None):
+    """Delete ``keys`` now and again after the transaction commits."""
+    keys = list(keys)
+    if not keys:
+        return
+    cache.delete_many(keys, version=version)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(
+            lambda: cache.delete_many(keys, version=version)
+        )
+
+
+def generation_key(name):
+    return f"{name}:generation"
+
+
+def generation(name):
+    """Return the current generation of ``name``, starting one if needed."""
+    return cache.get_or_set(
+        generation_key(name), time.time_ns, None, version=VERSION
+    )
+
+
+async def ageneration(name):
+    """Async version of ``generation()``."""
+    return await cache.aget_or_set(
+        generation_key(name), time.time_ns, None, version=VERSION
+    )
+
+
+def bump_generation(name):
+    """Make every entry of ``name`` stale."""
+    delete_after_commit([generation_key(name)], version=VERSION)
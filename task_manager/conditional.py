@@ -0,0 +1,127 @@
+"""Conditional GET support for the list and detail pages."""
+
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.translation import get_language
+
+
+def queryset_state(queryset):
+    """Return ``(max(updated_at), count)`` of ``queryset`` in one query."""
+    state = queryset.order_by().aggregate(
+        last_modified=Max("updated_at"), count=Count("pk")
+    )
+    return state["last_modified"], state["count"]
+
+
+async def aqueryset_state(queryset):
+    """Async version of ``queryset_state()``."""
+    state = await queryset.order_by().aaggregate(
+        last_modified=Max("updated_at"), count=Count("pk")
+    )
+    return state["last_modified"], state["count"]
+
+
+def make_validators(request, states):
+    """Return ``(etag, last_modified)`` for the states of a page."""
+    user = request.user
+    session = getattr(request, "session", None)
+    # Формы страницы содержат CSRF-токен, а вход и выход меняют его
+    # вместе с сессией: иначе 304 вернул бы страницу со старым токеном.
+    # get_token() создаёт секрет, если cookie ещё нет, и такой ETag
+    # не совпадёт ни с одним прежним.
+    get_token(request)
+    parts = [
+        str(user.pk if user.is_authenticated else ""),
+        request.META["CSRF_COOKIE"],
+        (session.session_key if session is not None else None) or "",
+        get_language() or "",
+        request.get_full_path(),
+    ]
+    parts.extend(
+        f"{last.isoformat() if last else ''}:{count}"
+        for last, count in states
+    )
+    etag = '"{}"'.format(hashlib.md5("|".join(parts).encode()).hexdigest())
+    last_modified = max(
+        (last for last, _ in states if last is not None), default=None
+    )
+    return etag, last_modified
+
+
+def patch_validators(response, etag, last_modified):
+    response.headers.setdefault("ETag", etag)
+    if last_modified is not None:
+        response.headers.setdefault(
+            "Last-Modified", http_date(int(last_modified.timestamp()))
+        )
+    # Страница зависит от пользователя (сессия) и языка.
+    patch_vary_headers(response, ("Cookie", "Accept-Language"))
+    response.headers.setdefault("Cache-Control", "private, no-cache")
+    return response
+
+
+class ConditionalGetMixin:
+    """Answer ``304 Not Modified`` before the page is rendered.
+
+    ``get_validator_querysets()`` returns the querysets a page is built
+    from. Their ``max(updated_at)`` and row counts, together with the
+    user, the session, the CSRF token, the language and the full path
+    with its query string, make up the ETag. A deletion lowers a count
+    and any insert or update raises a ``max(updated_at)``, so every
+    change gives a new ETag.
+    """
+
+    def get_validator_querysets(self):
+        return [self.get_queryset()]
+
+    def get_validators(self):
+        states = [
+            queryset_state(queryset)
+            for queryset in self.get_validator_querysets()
+        ]
+        return make_validators(self.request, states)
+
+    def get(self, request, *args, **kwargs):
+        # Сообщения показываются при рендеринге, 304 их бы потерял.
+        if get_messages(request):
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators()
+        # Удаление не сдвигает max(updated_at), поэтому 304 отдаётся
+        # только по ETag, а Last-Modified остаётся справочным.
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return patch_validators(response, etag, last_modified)
+
+
+class AsyncConditionalGetMixin:
+    """ConditionalGetMixin for async views, with async aggregate queries."""
+
+    def get_validator_querysets(self):
+        return [self.get_queryset()]
+
+    async def aget_validator_querysets(self):
+        return self.get_validator_querysets()
+
+    async def aget_validators(self):
+        states = [
+            await aqueryset_state(queryset)
+            for queryset in await self.aget_validator_querysets()
+        ]
+        return make_validators(self.request, states)
+
+    async def get(self, request, *args, **kwargs):
+        if get_messages(request):
+            return await super().get(request, *args, **kwargs)
+
+        etag, last_modified = await self.aget_validators()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = await super().get(request, *args, **kwargs)
+        return patch_validators(response, etag, last_modified)
@@ -0,0 +1,55 @@
+"""Warm database connections and report the connection pool.
+
+With ``DATABASE_POOL`` on, every worker process holds a psycopg pool
+(see ``settings.py``). Django opens it lazily on the first query, so
+the first requests of a fresh worker would pay for the TLS handshakes.
+``warm_up()`` is called when a worker boots (``gunicorn.conf.py`` and
+``asgi.py``) and waits until ``min_size`` connections are ready.
+``DatabasePoolStatsView`` shows the pool counters of the worker that
+served the request.
+"""
+
+from django.conf import settings
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import JsonResponse
+from django.views import View
+
+
+def get_pool(alias):
+    # Пул есть только у бэкенда PostgreSQL с OPTIONS["pool"].
+    return getattr(connections[alias], "pool", None)
+
+
+def _aliases():
+    return [DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS]
+
+
+def warm_up():
+    """Open the pools, or a persistent connection without a pool."""
+    for alias in _aliases():
+        pool = get_pool(alias)
+        if pool is not None:
+            pool.open(wait=True, timeout=pool.timeout)
+        elif connections[alias].settings_dict["CONN_MAX_AGE"]:
+            connections[alias].ensure_connection()
+
+
+def stats():
+    """Return ``{alias: psycopg_pool stats}`` for the pooled databases."""
+    result = {}
+    for alias in _aliases():
+        pool = get_pool(alias)
+        if pool is not None:
+            result[alias] = pool.get_stats()
+    return result
+
+
+class DatabasePoolStatsView(UserPassesTestMixin, View):
+    http_method_names = ["get"]
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({"pools": stats()})
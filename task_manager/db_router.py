@@ -0,0 +1,137 @@
+"""Send the reads of safe requests to read replicas.
+
+``DATABASE_REPLICA_URLS`` adds the replicas to ``DATABASES`` (see
+``settings.py``). ``replica_middleware`` marks GET/HEAD/OPTIONS requests
+as replica reads, and ``ReplicaRouter`` then picks a random replica
+whose replication lag is at most ``DATABASE_REPLICA_MAX_LAG`` seconds,
+or the primary when there is none. Writes and reads inside a
+transaction always go to the primary.
+
+After an unsafe request the response sets a cookie that keeps the
+browser on the primary for ``DATABASE_REPLICA_STICKY_SECONDS``, so the
+user sees their own change even if a replica has not replayed it yet.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.decorators import sync_and_async_middleware
+
+STICKY_COOKIE = "db_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Запрос задержки репликации в секундах. Для других СУБД она считается
+# нулевой.
+LAG_QUERIES = {
+    "postgresql": (
+        "SELECT CASE"
+        " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+        " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+        " END"
+    ),
+}
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+# alias -> (время проверки по time.monotonic(), реплика пригодна).
+_health = {}
+
+
+def replication_lag(alias):
+    connection = connections[alias]
+    query = LAG_QUERIES.get(connection.vendor)
+    if query is None:
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(query)
+        lag = cursor.fetchone()[0]
+    return float(lag or 0)
+
+
+def is_healthy(alias):
+    """Whether the lag of ``alias`` is acceptable, checked every few seconds."""
+    now = time.monotonic()
+    checked = _health.get(alias)
+    if checked and now - checked[0] < settings.DATABASE_REPLICA_CHECK_INTERVAL:
+        return checked[1]
+    try:
+        healthy = replication_lag(alias) <= settings.DATABASE_REPLICA_MAX_LAG
+    except DatabaseError:
+        healthy = False
+    _health[alias] = (now, healthy)
+    return healthy
+
+
+def reset_health():
+    _health.clear()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not (settings.DATABASE_REPLICAS and _read_from_replica.get()):
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        healthy = [
+            alias for alias in settings.DATABASE_REPLICAS if is_healthy(alias)
+        ]
+        return random.choice(healthy) if healthy else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Иначе Django сохранил бы объект, прочитанный с реплики, туда же.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= aliases:
+            return True
+        return None
+
+
+def _enter(request):
+    use_replica = (
+        bool(settings.DATABASE_REPLICAS)
+        and request.method in SAFE_METHODS
+        and STICKY_COOKIE not in request.COOKIES
+    )
+    return _read_from_replica.set(use_replica)
+
+
+def _finish(request, response):
+    if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS:
+        response.set_cookie(
+            STICKY_COOKIE,
+            "1",
+            max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+@sync_and_async_middleware
+def replica_middleware(get_response):
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            token = _enter(request)
+            try:
+                response = await get_response(request)
+            finally:
+                _read_from_replica.reset(token)
+            return _finish(request, response)
+
+    else:
+
+        def middleware(request):
+            token = _enter(request)
+            try:
+                response = get_response(request)
+            finally:
+                _read_from_replica.reset(token)
+            return _finish(request, response)
+
+    return middleware
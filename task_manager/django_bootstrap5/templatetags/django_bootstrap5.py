@@ -56,7 +56,8 @@ def bootstrap_field(field, show_label=False):
         attrs={
             "class": (
                 "form-select"
-                if getattr(field.field, "queryset", None)
+                # is not None: bool(queryset) выполнил бы запрос.
+                if getattr(field.field, "queryset", None) is not None
                 else "form-control"
             )
         },
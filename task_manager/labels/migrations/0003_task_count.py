@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0002_alter_label_options_alter_label_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='label',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Tasks'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:10
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='label',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='label_name_lower_idx'),
+        ),
+    ]
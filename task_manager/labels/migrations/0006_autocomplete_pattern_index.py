@@ -0,0 +1,16 @@
+from django.db import migrations
+
+from task_manager.autocomplete import pattern_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0005_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(*pattern_indexes(
+            ('labels_label', 'label_name_lower_idx', 'name'),
+        )),
+    ]
@@ -1,8 +1,11 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.tasks.counters import CountedModelMixin
 
-class Label(models.Model):
+
+class Label(CountedModelMixin, models.Model):
     name = models.CharField(
         max_length=100,
         unique=True,
@@ -12,6 +15,17 @@ class Label(models.Model):
         auto_now_add=True,
         verbose_name=_("Creation date"),
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Updated at"),
+    )
+    task_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Tasks"),
+    )
+
+    COUNTER_FIELDS = ("task_count",)
 
     def __str__(self) -> str:
         return self.name
@@ -19,3 +33,7 @@ class Label(models.Model):
     class Meta:
         verbose_name = _("Label")
         verbose_name_plural = _("Labels")
+        # Поиск по префиксу в автодополнении (task_manager/autocomplete.py).
+        indexes = [
+            models.Index(Lower("name"), name="label_name_lower_idx"),
+        ]
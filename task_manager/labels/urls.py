@@ -1,9 +1,15 @@
 from django.urls import path
 
+from task_manager.autocomplete import LABELS, AutocompleteView
 from task_manager.labels import views
 
 urlpatterns = [
     path('', views.LabelListView.as_view(), name='labels_index'),
+    path(
+        'autocomplete/',
+        AutocompleteView.as_view(source=LABELS),
+        name='label_autocomplete',
+    ),
     path('create/', views.LabelCreateView.as_view(), name='label_create'),
     path(
         '<int:pk>/update/',
@@ -6,11 +6,13 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.conditional import ConditionalGetMixin
+
 from .forms import LabelForm
 from .models import Label
 
 
-class LabelListView(LoginRequiredMixin, ListView):
+class LabelListView(LoginRequiredMixin, ConditionalGetMixin, ListView):
     model = Label
     template_name = 'labels/index.html'
     context_object_name = 'labels'
@@ -41,14 +43,18 @@ class LabelDeleteView(LoginRequiredMixin, DeleteView):
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
         
-        if self.object.tasks.exists():
+        if self.object.task_count:
             messages.error(
                 request,
                 _("It is impossible to delete the label \
                     because it is being used")
             )
             return redirect(self.success_url)
-            
-        response = super().post(request, *args, **kwargs)
+
+        # BaseDeleteView.post() загрузил бы метку ещё раз.
+        form = self.get_form()
+        if not form.is_valid():
+            return self.form_invalid(form)
+        response = self.form_valid(form)
         messages.success(self.request, self.success_message)
         return response
@@ -0,0 +1,358 @@
+"""Request timings: Server-Timing header and Prometheus metrics.
+
+``timing_middleware`` measures every request: the total time, the time
+spent in database queries (through ``execute_wrapper`` on the default
+database and the replicas), the number of queries and the time spent
+rendering templates (through ``DjangoTemplates`` below, the template
+backend of the project). The numbers are added to per-view histograms
+and sent back in the ``Server-Timing`` header to staff, in DEBUG or to
+everyone with ``SERVER_TIMING``.
+
+``MetricsView`` serves the histograms in the Prometheus text format.
+Each gunicorn worker has its own histograms, so with ``METRICS_DIR``
+set every process writes a snapshot to ``<METRICS_DIR>/<pid>.json`` at
+most every ``METRICS_FLUSH_INTERVAL`` seconds and ``/metrics`` adds up
+the snapshots of all workers. ``gunicorn.conf.py`` gives every master
+process a fresh directory and empties a configured one at start.
+Snapshots of workers that have exited are removed on collection, so
+their requests drop out of the totals, which Prometheus reads as a
+counter reset.
+"""
+
+import copy
+import hmac
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template.backends import django as django_backend
+from django.utils.decorators import sync_and_async_middleware
+from django.views import View
+
+PREFIX = "task_manager"
+# Границы корзин гистограмм в секундах, как у клиентов Prometheus.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+HISTOGRAMS = {
+    "request_duration_seconds": "Request time by view.",
+    "db_duration_seconds": "Time in database queries per request by view.",
+    "template_duration_seconds": "Template render time per request by view.",
+}
+COUNTERS = {
+    "db_queries_total": "Database queries by view.",
+}
+UNMATCHED_VIEW = "unmatched"
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.template = 0.0
+
+    def server_timing(self, total):
+        return ", ".join([
+            f"total;dur={total * 1000:.1f}",
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f"template;dur={self.template * 1000:.1f}",
+        ])
+
+
+def _time_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db += time.perf_counter() - started
+        timings.queries += 1
+
+
+class Template(django_backend.Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            if timings is not None:
+                timings.template += time.perf_counter() - started
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """DjangoTemplates whose top-level renders are timed.
+
+    Templates included from a template are rendered by the engine
+    itself, so every page is counted once.
+    """
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
+
+
+class Registry:
+    """Histograms and counters of this process, by metric and view."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {name: {} for name in HISTOGRAMS}
+        self.counters = {name: {} for name in COUNTERS}
+        self.flushed = 0.0
+
+    def observe(self, name, view, value):
+        with self.lock:
+            histogram = self.histograms[name].setdefault(
+                view, {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+            )
+            for index, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+                    break
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def increment(self, name, view, value=1):
+        with self.lock:
+            counter = self.counters[name]
+            counter[view] = counter.get(view, 0) + value
+
+    def snapshot(self):
+        with self.lock:
+            return copy.deepcopy({
+                "histograms": self.histograms,
+                "counters": self.counters,
+            })
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {name: {} for name in HISTOGRAMS}
+            self.counters = {name: {} for name in COUNTERS}
+            self.flushed = 0.0
+
+
+registry = Registry()
+
+
+def _snapshot_path():
+    return Path(settings.METRICS_DIR) / f"{os.getpid()}.json"
+
+
+def flush(force=False):
+    """Write the snapshot of this process when METRICS_DIR is set."""
+    if not settings.METRICS_DIR:
+        return
+    now = time.monotonic()
+    if not force and now - registry.flushed < settings.METRICS_FLUSH_INTERVAL:
+        return
+    registry.flushed = now
+    path = _snapshot_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Читатель не должен увидеть файл наполовину записанным.
+    temporary = path.with_suffix(f".{threading.get_ident()}.tmp")
+    temporary.write_text(json.dumps(registry.snapshot()))
+    os.replace(temporary, path)
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Процесс есть, но принадлежит другому пользователю.
+        return True
+    return True
+
+
+def _merge(total, snapshot):
+    for name, views in snapshot["histograms"].items():
+        for view, histogram in views.items():
+            merged = total["histograms"].setdefault(name, {}).setdefault(
+                view, {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+            )
+            merged["buckets"] = [
+                a + b for a, b in zip(merged["buckets"], histogram["buckets"])
+            ]
+            merged["sum"] += histogram["sum"]
+            merged["count"] += histogram["count"]
+    for name, views in snapshot["counters"].items():
+        counter = total["counters"].setdefault(name, {})
+        for view, value in views.items():
+            counter[view] = counter.get(view, 0) + value
+
+
+def collect():
+    """Return the metrics of all worker processes added up."""
+    total = {"histograms": {}, "counters": {}}
+    if settings.METRICS_DIR:
+        flush(force=True)
+        for path in Path(settings.METRICS_DIR).glob("*.json"):
+            # Воркеры перезапускаются (max_requests), и без этого снимки
+            # завершившихся процессов копились бы в каталоге.
+            if path.stem.isdigit() and not _is_alive(int(path.stem)):
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                _merge(total, json.loads(path.read_text()))
+            except (OSError, ValueError):
+                # Файл мог исчезнуть или принадлежать чужой версии.
+                continue
+    else:
+        _merge(total, registry.snapshot())
+    return total
+
+
+def _label(value):
+    value = value.replace("\\", "\\\\").replace('"', '\\"')
+    return value.replace("\n", "\\n")
+
+
+def render(metrics):
+    """Format ``collect()`` output in the Prometheus text format."""
+    lines = []
+    for name, help_text in HISTOGRAMS.items():
+        full_name = f"{PREFIX}_{name}"
+        lines += [
+            f"# HELP {full_name} {help_text}",
+            f"# TYPE {full_name} histogram",
+        ]
+        for view, histogram in sorted(
+            metrics["histograms"].get(name, {}).items()
+        ):
+            label = f'view="{_label(view)}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram["buckets"]):
+                cumulative += count
+                lines.append(
+                    f'{full_name}_bucket{{{label},le="{bound}"}} {cumulative}'
+                )
+            lines += [
+                f'{full_name}_bucket{{{label},le="+Inf"}} '
+                f'{histogram["count"]}',
+                f"{full_name}_sum{{{label}}} {histogram['sum']}",
+                f"{full_name}_count{{{label}}} {histogram['count']}",
+            ]
+    for name, help_text in COUNTERS.items():
+        full_name = f"{PREFIX}_{name}"
+        lines += [
+            f"# HELP {full_name} {help_text}",
+            f"# TYPE {full_name} counter",
+        ]
+        for view, value in sorted(metrics["counters"].get(name, {}).items()):
+            lines.append(f'{full_name}{{view="{_label(view)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def _aliases():
+    return [DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS]
+
+
+def _start():
+    timings = RequestTimings()
+    stack = ExitStack()
+    for alias in _aliases():
+        stack.enter_context(connections[alias].execute_wrapper(_time_query))
+    return timings, _current.set(timings), stack
+
+
+def _shows_server_timing(request):
+    if settings.SERVER_TIMING or settings.DEBUG:
+        return True
+    user = getattr(request, "user", None)
+    return user is not None and user.is_staff
+
+
+async def _ashows_server_timing(request):
+    if settings.SERVER_TIMING or settings.DEBUG:
+        return True
+    # request.user загрузил бы сессию синхронно внутри цикла событий.
+    if not hasattr(request, "auser"):
+        return False
+    return (await request.auser()).is_staff
+
+
+def _finish(request, response, timings, show_server_timing):
+    total = time.perf_counter() - timings.started
+    match = request.resolver_match
+    view = match.view_name if match else UNMATCHED_VIEW
+    registry.observe("request_duration_seconds", view, total)
+    registry.observe("db_duration_seconds", view, timings.db)
+    registry.observe("template_duration_seconds", view, timings.template)
+    registry.increment("db_queries_total", view, timings.queries)
+    if show_server_timing:
+        response["Server-Timing"] = timings.server_timing(total)
+    flush()
+    return response
+
+
+@sync_and_async_middleware
+def timing_middleware(get_response):
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            timings, token, stack = _start()
+            try:
+                with stack:
+                    response = await get_response(request)
+            finally:
+                _current.reset(token)
+            return _finish(
+                request,
+                response,
+                timings,
+                await _ashows_server_timing(request),
+            )
+
+    else:
+
+        def middleware(request):
+            timings, token, stack = _start()
+            try:
+                with stack:
+                    response = get_response(request)
+            finally:
+                _current.reset(token)
+            return _finish(
+                request, response, timings, _shows_server_timing(request)
+            )
+
+    return middleware
+
+
+class MetricsView(View):
+    """Prometheus metrics for staff or a scraper with ``METRICS_TOKEN``."""
+
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        token = settings.METRICS_TOKEN
+        authorization = request.headers.get("Authorization", "")
+        allowed = request.user.is_staff or (
+            token
+            and hmac.compare_digest(authorization, f"Bearer {token}")
+        )
+        if not allowed:
+            return HttpResponse(status=403)
+        return HttpResponse(
+            render(collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
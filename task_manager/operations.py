@@ -0,0 +1,51 @@
+"""Migration operations shared by the project apps."""
+
+from django.db import NotSupportedError, migrations
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """Create an index without blocking writes on PostgreSQL.
+
+    On PostgreSQL the index is built with ``CREATE INDEX CONCURRENTLY``,
+    which cannot run inside a transaction, so the migration must set
+    ``atomic = False``. Other backends fall back to a plain
+    ``CREATE INDEX``.
+    """
+
+    def _check_not_in_transaction(self, schema_editor):
+        if schema_editor.connection.in_atomic_block:
+            raise NotSupportedError(
+                "AddIndexConcurrently cannot be executed inside a "
+                "transaction. Set atomic = False on the migration."
+            )
+
+    def _concurrently(self, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return {}
+        self._check_not_in_transaction(schema_editor)
+        return {"concurrently": True}
+
+    def database_forwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(
+                model, self.index, **self._concurrently(schema_editor)
+            )
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(
+                model, self.index, **self._concurrently(schema_editor)
+            )
+
+    def describe(self):
+        return "Concurrently create index %s on field(s) %s of model %s" % (
+            self.index.name,
+            ", ".join(self.index.fields),
+            self.model_name,
+        )
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 
+import importlib.util
 import os
 import sys
 import rollbar
@@ -39,7 +40,23 @@ def _to_bool(value: str, default: bool = False) -> bool:
     return value.lower() in ("true", "1", "yes")
 
 
-def _sqlite_db_config(url: str, conn_max_age: int = 600) -> dict:
+# Профиль SQLite для нескольких воркеров: WAL позволяет читать во время
+# записи, а BEGIN IMMEDIATE берёт блокировку записи в начале транзакции,
+# поэтому конфликт ждёт busy timeout вместо мгновенного
+# "database is locked" при повышении блокировки чтения до записи.
+_SQLITE_TUNED_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=134217728",
+    # Отрицательное значение — в КиБ, т. е. 64 МиБ на соединение.
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _sqlite_db_config(
+    url: str, conn_max_age: int = 600, tuned: bool = False
+) -> dict:
     """Формирует конфигурацию для sqlite, не требуя dj-database-url."""
     split_result = urlsplit(url)
     # urlsplit оставляет путь пустым для вида sqlite://db.sqlite3, поэтому учитываем netloc.
@@ -49,11 +66,19 @@ def _sqlite_db_config(url: str, conn_max_age: int = 600) -> dict:
     # На Windows absolute path выглядит как /C:/..., поэтому удаляем ведущий слэш.
     if os.name == 'nt' and path.startswith('/') and len(path) > 2 and path[2] == ':':
         path = path[1:]
-    return {
+    config = {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": path,
         "CONN_MAX_AGE": conn_max_age,
     }
+    if tuned:
+        config["OPTIONS"] = {
+            "init_command": "; ".join(_SQLITE_TUNED_PRAGMAS),
+            "transaction_mode": "IMMEDIATE",
+            # busy_timeout, в секундах.
+            "timeout": float(os.getenv("SQLITE_BUSY_TIMEOUT", 5)),
+        }
+    return config
 
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -143,8 +168,11 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'users.User'
 
 MIDDLEWARE = [
+    # Первым, чтобы время запроса включало остальные middleware.
+    'task_manager.metrics.timing_middleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'task_manager.db_router.replica_middleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -154,11 +182,32 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'task_manager.urls'
+# Хранилище сессий: db (по умолчанию), cached_db или signed_cookies.
+# В двух последних режимах обычный запрос не обращается к django_session,
+# а сообщения хранятся только в cookie, чтобы не попадать в сессию.
+_SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_STORAGE = os.getenv("SESSION_STORAGE", "db").strip().lower()
+if SESSION_STORAGE not in _SESSION_ENGINES:
+    raise ImproperlyConfigured(
+        f"SESSION_STORAGE must be one of {', '.join(_SESSION_ENGINES)}."
+    )
+SESSION_ENGINE = _SESSION_ENGINES[SESSION_STORAGE]
+if SESSION_STORAGE != "db":
+    MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
+# Под ASGI страницы только для чтения отдаются асинхронными view.
+ASYNC_VIEWS = _to_bool(os.getenv("ASYNC_VIEWS"))
+
+ROOT_URLCONF = 'task_manager.asgi_urls' if ASYNC_VIEWS else 'task_manager.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates, замеряющий время рендеринга (metrics.py).
+        'BACKEND': 'task_manager.metrics.DjangoTemplates',
         'DIRS': [BASE_DIR / "task_manager" / "templates"],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -177,34 +226,150 @@ WSGI_APPLICATION = 'task_manager.wsgi.application'
 
 # Database
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
+# Настроенный профиль SQLite (см. _sqlite_db_config).
+SQLITE_TUNED = _to_bool(os.getenv("SQLITE_TUNED"))
 
-if IS_TESTING:
-    test_db_url = os.getenv(
-        "TEST_DATABASE_URL",
-        f"sqlite:///{BASE_DIR / 'test_db.sqlite3'}",
-    )
-    DATABASES = {"default": _sqlite_db_config(test_db_url)}
-elif DATABASE_URL.startswith("sqlite"):
-    DATABASES = {"default": _sqlite_db_config(DATABASE_URL)}
-else:
+
+
+def _database_config(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return _sqlite_db_config(url, tuned=SQLITE_TUNED)
     try:
         import dj_database_url  # type: ignore
     except ModuleNotFoundError as exc:  # pragma: no cover - требуется только вне dev-окружения
         raise ImproperlyConfigured(
             "Install dj-database-url to work with non-sqlite databases."
         ) from exc
+    return dj_database_url.parse(
+        url,
+        conn_max_age=int(os.getenv("DATABASE_CONN_MAX_AGE", 600)),
+        ssl_require=not DEBUG,
+    )
+
+
+if IS_TESTING:
+    test_db_url = os.getenv(
+        "TEST_DATABASE_URL",
+        f"sqlite:///{BASE_DIR / 'test_db.sqlite3'}",
+    )
     DATABASES = {
-        "default": dj_database_url.parse(
-            DATABASE_URL,
-            conn_max_age=600,
-            ssl_require=not DEBUG,
-        )
+        "default": _sqlite_db_config(test_db_url, tuned=SQLITE_TUNED)
+    }
+elif DATABASE_URL.startswith("sqlite"):
+    DATABASES = {
+        "default": _sqlite_db_config(DATABASE_URL, tuned=SQLITE_TUNED)
     }
+else:
+    DATABASES = {"default": _database_config(DATABASE_URL)}
+    # Пул соединений psycopg 3 (task_manager/db_pool.py). Размер и таймауты
+    # относятся к одному процессу: у каждого воркера свой пул.
+    if _to_bool(os.getenv("DATABASE_POOL")):
+        if not all(
+            importlib.util.find_spec(name)
+            for name in ("psycopg", "psycopg_pool")
+        ):
+            raise ImproperlyConfigured(
+                'DATABASE_POOL needs psycopg 3 with its pool: install the '
+                '"pool" extra (uv sync --extra pool) or "psycopg[pool]".'
+            )
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", 10)),
+            # Сколько секунд запрос ждёт свободное соединение.
+            "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", 10)),
+            "max_idle": float(os.getenv("DATABASE_POOL_MAX_IDLE", 600)),
+            "max_lifetime": float(
+                os.getenv("DATABASE_POOL_MAX_LIFETIME", 3600)
+            ),
+        }
+
+# Реплики только для чтения (task_manager/db_router.py), URL через запятую.
+DATABASE_REPLICAS = []
+if IS_TESTING:
+    # В тестах реплику заменяет отдельная база; роутер включается, только
+    # если тест укажет её в DATABASE_REPLICAS.
+    DATABASES["replica"] = _database_config(
+        os.getenv(
+            "TEST_REPLICA_DATABASE_URL",
+            f"sqlite:///{BASE_DIR / 'test_replica_db.sqlite3'}",
+        )
+    )
+else:
+    _replica_urls = [
+        url.strip()
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    for _number, _url in enumerate(_replica_urls, start=1):
+        DATABASES[f"replica_{_number}"] = _database_config(_url)
+        DATABASE_REPLICAS.append(f"replica_{_number}")
+
+DATABASE_ROUTERS = ["task_manager.db_router.ReplicaRouter"]
+# Реплика с большей задержкой не используется, в секундах.
+DATABASE_REPLICA_MAX_LAG = float(os.getenv("DATABASE_REPLICA_MAX_LAG", 5))
+# Как часто проверять задержку каждой реплики, в секундах.
+DATABASE_REPLICA_CHECK_INTERVAL = float(
+    os.getenv("DATABASE_REPLICA_CHECK_INTERVAL", 5)
+)
+# Сколько секунд после изменения браузер читает с основной базы.
+# Должно быть больше DATABASE_REPLICA_MAX_LAG.
+DATABASE_REPLICA_STICKY_SECONDS = int(
+    os.getenv("DATABASE_REPLICA_STICKY_SECONDS", 10)
+)
 
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = []
 
+AUTHENTICATION_BACKENDS = ["task_manager.users.backends.UserBackend"]
+
+# Хэширование паролей (task_manager/users/hashers.py). PASSWORD_HASHER
+# выбирает алгоритм новых хэшей, остальные нужны, чтобы проверить старые
+# хэши: при входе они пересчитываются выбранным алгоритмом и стоимостью.
+_PASSWORD_HASHER_CLASSES = {
+    "scrypt": "task_manager.users.hashers.ScryptPasswordHasher",
+    "argon2": "task_manager.users.hashers.Argon2PasswordHasher",
+    "pbkdf2": "task_manager.users.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "scrypt").strip().lower()
+if PASSWORD_HASHER not in _PASSWORD_HASHER_CLASSES:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER must be one of {', '.join(_PASSWORD_HASHER_CLASSES)}."
+    )
+if PASSWORD_HASHER == "argon2" and importlib.util.find_spec("argon2") is None:
+    raise ImproperlyConfigured(
+        "Install argon2-cffi to use PASSWORD_HASHER=argon2."
+    )
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHER_CLASSES[PASSWORD_HASHER],
+    *(
+        path
+        for name, path in _PASSWORD_HASHER_CLASSES.items()
+        if name != PASSWORD_HASHER
+    ),
+]
+
+# Стоимость хэшей. Для scrypt и PBKDF2 — значения Django, для Argon2id —
+# минимальные параметры из рекомендаций OWASP (19 МиБ, 2 прохода).
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv("PASSWORD_SCRYPT_WORK_FACTOR", 2**14))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.getenv("PASSWORD_SCRYPT_BLOCK_SIZE", 8))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv("PASSWORD_SCRYPT_PARALLELISM", 5))
+PASSWORD_ARGON2_TIME_COST = int(os.getenv("PASSWORD_ARGON2_TIME_COST", 2))
+# В КиБ.
+PASSWORD_ARGON2_MEMORY_COST = int(
+    os.getenv("PASSWORD_ARGON2_MEMORY_COST", 19456)
+)
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv("PASSWORD_ARGON2_PARALLELISM", 1))
+PASSWORD_PBKDF2_ITERATIONS = int(
+    os.getenv("PASSWORD_PBKDF2_ITERATIONS", 1_000_000)
+)
+
+# Сколько хэшей паролей одновременно считает процесс под ASGI.
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)
+)
+
 
 # Internationalization
 USE_I18N = True
@@ -242,6 +407,92 @@ STORAGES = {
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# Redis, если CACHE_URL указывает на него, иначе память процесса.
+CACHE_URL = os.getenv("CACHE_URL", "").strip()
+
+SHARED_CACHE = CACHE_URL.startswith(("redis://", "rediss://", "unix://"))
+
+if SHARED_CACHE:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "task-manager",
+        }
+    }
+
+# Память процесса сбрасывается только в своём воркере, остальные держат
+# запись до истечения срока. Поэтому без общего кэша записи, которые
+# должны исчезать сразу после изменения, живут не дольше
+# LOCAL_CACHE_MAX_TIMEOUT секунд, а больший срок — ошибка настройки.
+LOCAL_CACHE_MAX_TIMEOUT = int(os.getenv("LOCAL_CACHE_MAX_TIMEOUT", 5))
+
+
+def _invalidated_cache_timeout(name: str, shared_default: int) -> int:
+    if SHARED_CACHE:
+        return int(os.getenv(name, shared_default))
+    timeout = int(os.getenv(name, LOCAL_CACHE_MAX_TIMEOUT))
+    if timeout > LOCAL_CACHE_MAX_TIMEOUT:
+        raise ImproperlyConfigured(
+            f"{name} above {LOCAL_CACHE_MAX_TIMEOUT} seconds needs a shared "
+            "cache: set CACHE_URL to Redis."
+        )
+    return timeout
+
+
+# Срок жизни закэшированных строк таблицы задач, в секундах. Строка
+# хранится вместе с показанными значениями и сверяется с ними, поэтому
+# долгий срок безопасен и с кэшем в памяти процесса.
+TASK_ROW_CACHE_TIMEOUT = int(os.getenv("TASK_ROW_CACHE_TIMEOUT", 24 * 60 * 60))
+
+# Срок жизни закэшированных списков статусов форм задач (tasks/choices.py),
+# в секундах: час с общим кэшем, иначе LOCAL_CACHE_MAX_TIMEOUT.
+TASK_CHOICES_CACHE_TIMEOUT = _invalidated_cache_timeout(
+    "TASK_CHOICES_CACHE_TIMEOUT", 60 * 60
+)
+
+# Брокер событий живого списка задач: Redis для нескольких процессов,
+# а по умолчанию события доставляются только внутри процесса.
+TASK_EVENTS_BROKER_URL = os.getenv("TASK_EVENTS_BROKER_URL", "").strip()
+
+# Как часто поток событий шлёт комментарий, чтобы заметить обрыв, в секундах.
+TASK_EVENTS_HEARTBEAT = int(os.getenv("TASK_EVENTS_HEARTBEAT", 15))
+
+# Срок жизни закэшированного пользователя сессии (users/backends.py),
+# в секундах: час с общим кэшем, иначе LOCAL_CACHE_MAX_TIMEOUT. Запись
+# удаляется и при сохранении пользователя.
+AUTH_USER_CACHE_TIMEOUT = _invalidated_cache_timeout(
+    "AUTH_USER_CACHE_TIMEOUT", 60 * 60
+)
+
+# Замеры запросов (task_manager/metrics.py). Заголовок Server-Timing
+# показывает время запроса, запросов к базе и рендеринга шаблонов. Он
+# раскрывает устройство сервера, поэтому по умолчанию виден только
+# сотрудникам и в режиме DEBUG; SERVER_TIMING=1 включает его для всех.
+SERVER_TIMING = _to_bool(os.getenv("SERVER_TIMING"))
+# Каталог снимков метрик воркеров; gunicorn.conf.py задаёт его сам. Без
+# него /metrics показывает только обслуживший запрос процесс.
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 5))
+# Токен для Authorization: Bearer; без него /metrics видят только сотрудники.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Срок жизни закэшированных ответов автодополнения, в секундах: пять минут
+# с общим кэшем, иначе LOCAL_CACHE_MAX_TIMEOUT.
+AUTOCOMPLETE_CACHE_TIMEOUT = _invalidated_cache_timeout(
+    "AUTOCOMPLETE_CACHE_TIMEOUT", 300
+)
+
+# Список задач читается из денормализованной таблицы TaskListRow.
+TASK_LIST_READ_MODEL = _to_bool(os.getenv("TASK_LIST_READ_MODEL"))
+
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
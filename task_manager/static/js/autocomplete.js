@@ -0,0 +1,63 @@
+// Поиск вариантов для <select data-autocomplete-url>: сервер отдаёт только
+// выбранные значения, остальные подгружаются по мере ввода.
+(() => {
+  const DELAY = 200;
+
+  function enhance(select) {
+    const input = document.createElement("input");
+    input.type = "search";
+    input.className = "form-control mb-1";
+    input.autocomplete = "off";
+    input.setAttribute("aria-controls", select.id);
+    select.before(input);
+
+    let timer = null;
+    let controller = null;
+
+    async function load() {
+      const query = input.value.trim();
+      if (!query) {
+        return;
+      }
+      controller?.abort();
+      controller = new AbortController();
+      const url = new URL(select.dataset.autocompleteUrl, window.location.href);
+      url.searchParams.set("q", query);
+      let results;
+      try {
+        const response = await fetch(url, {
+          signal: controller.signal,
+          headers: { Accept: "application/json" },
+        });
+        if (!response.ok) {
+          return;
+        }
+        ({ results } = await response.json());
+      } catch {
+        // Запрос отменён более новым вводом или ответ не JSON.
+        return;
+      }
+      // Выбранные варианты и пустой вариант остаются на месте.
+      for (const option of [...select.options]) {
+        if (!option.selected && option.value !== "") {
+          option.remove();
+        }
+      }
+      const present = new Set([...select.options].map((option) => option.value));
+      for (const { id, text } of results) {
+        if (!present.has(String(id))) {
+          select.add(new Option(text, id));
+        }
+      }
+    }
+
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(load, DELAY);
+    });
+  }
+
+  document.addEventListener("DOMContentLoaded", () => {
+    document.querySelectorAll("select[data-autocomplete-url]").forEach(enhance);
+  });
+})();
@@ -1,8 +1,10 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.tasks.counters import CountedModelMixin
 
-class Status(models.Model):
+
+class Status(CountedModelMixin, models.Model):
     name = models.CharField(
         max_length=100, 
         unique=True, 
@@ -10,6 +12,14 @@ class Status(models.Model):
         verbose_name=_('Name'),
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    task_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Tasks'),
+    )
+
+    COUNTER_FIELDS = ('task_count',)
 
     def __str__(self):
         return self.name
@@ -7,11 +7,13 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.conditional import ConditionalGetMixin
+
 from .forms import StatusForm
 from .models import Status
 
 
-class StatusListView(LoginRequiredMixin, ListView):
+class StatusListView(LoginRequiredMixin, ConditionalGetMixin, ListView):
     model = Status
     template_name = 'statuses/index.html'
     context_object_name = 'statuses'
@@ -40,14 +42,24 @@ class StatusDeleteView(LoginRequiredMixin, DeleteView):
     success_message = _("Status successfully deleted")
 
     def post(self, request, *args, **kwargs):
+        # BaseDeleteView.post() загрузил бы статус ещё раз.
+        self.object = self.get_object()
+        if self.object.task_count:
+            return self._deny_delete()
+        form = self.get_form()
+        if not form.is_valid():
+            return self.form_invalid(form)
         try:
-            response = super().post(request, *args, **kwargs)
-            messages.success(self.request, self.success_message)
-            return response
+            response = self.form_valid(form)
         except ProtectedError:
-            messages.error(
-                self.request,
-                _("It is impossible to delete the status \
+            return self._deny_delete()
+        messages.success(self.request, self.success_message)
+        return response
+
+    def _deny_delete(self):
+        messages.error(
+            self.request,
+            _("It is impossible to delete the status \
                     because it is being used")
-            )
-            return redirect(self.success_url)
\ No newline at end of file
+        )
+        return redirect(self.success_url)
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""Async versions of the task list and task pages (see ``asgi_urls.py``)."""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404
+from django.urls import reverse
+from django.utils import translation
+from django.utils.translation import gettext_lazy as _
+
+from task_manager.async_views import AsyncPageView
+from task_manager.autocomplete import aload_selected
+from task_manager.conditional import AsyncConditionalGetMixin
+
+from . import choices, events, row_cache
+from .forms import TaskBulkActionForm
+from .models import Task
+from .pagination import InvalidCursor, KeysetPaginator
+from .views import TaskDetailMixin, TaskListMixin
+
+# Фильтры, значения которых форма проверяет запросом к базе.
+LOOKUP_FILTERS = ('status', 'executor', 'labels')
+# Через сколько миллисекунд браузер переподключает оборванный поток.
+EVENTS_RETRY = 5000
+# При большем числе изменённых задач странице проще перезагрузиться.
+EVENTS_MAX_ROWS = 200
+
+
+class AsyncTaskListMixin(TaskListMixin):
+    async def build(self, func):
+        """Call ``func`` that builds filtered querysets.
+
+        django-filter validates a chosen status, executor or label with
+        a synchronous query, so only such requests run it in a thread.
+        """
+        if any(self.request.GET.get(name) for name in LOOKUP_FILTERS):
+            return await sync_to_async(func)()
+        return func()
+
+
+class TaskListAsyncView(AsyncTaskListMixin, AsyncConditionalGetMixin,
+                        AsyncPageView):
+    template_name = 'tasks/index.html'
+
+    async def aget_validator_querysets(self):
+        return await self.build(self.get_validator_querysets)
+
+    async def aget_context_data(self, **kwargs):
+        queryset = await self.build(self.get_queryset)
+        paginator = KeysetPaginator(
+            queryset, self.paginate_by, self.get_ordering()
+        )
+        try:
+            page = await paginator.apage(**self.get_page_kwargs())
+        except InvalidCursor as exc:
+            raise Http404(_("Invalid cursor")) from exc
+
+        self.choices = {
+            kind: await choices.aget_choices(kind)
+            for kind in choices.SOURCES
+        }
+        bulk_form = TaskBulkActionForm()
+        for form in (self.filterset.form, bulk_form):
+            await aload_selected(form)
+        kwargs.update(
+            paginator=paginator,
+            page_obj=page,
+            is_paginated=page.has_other_pages(),
+            object_list=page.object_list,
+            tasks=page.object_list,
+            rendered_task_rows=await row_cache.arender_rows(
+                page.object_list
+            ),
+            filter=self.filterset,
+            bulk_form=bulk_form,
+            events_url=self.get_events_url(),
+        )
+        return await super().aget_context_data(**kwargs)
+
+    def get_events_url(self):
+        query = self.request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        url = reverse('task_events')
+        return f'{url}?{query.urlencode()}' if query else url
+
+    def render(self, context):
+        with choices.preloaded(self.choices):
+            return super().render(context)
+
+
+class TaskDetailAsyncView(TaskDetailMixin, AsyncConditionalGetMixin,
+                          AsyncPageView):
+    template_name = 'tasks/show.html'
+
+    async def aget_context_data(self, **kwargs):
+        task = await aget_object_or_404(self.get_queryset(), pk=kwargs['pk'])
+        kwargs.update(object=task, task=task)
+        return await super().aget_context_data(**kwargs)
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class TaskEventsView(AsyncTaskListMixin, AsyncPageView):
+    """Stream changes of the filtered task list as Server-Sent Events.
+
+    ``upsert`` carries the rendered row of a created or changed task that
+    matches the filters, ``remove`` the ids of deleted tasks and of tasks
+    that no longer match, ``reload`` asks the page to reload itself.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        queryset = await self.build(
+            lambda: self.filter_tasks(Task.objects.for_list())
+        )
+        response = StreamingHttpResponse(
+            self.stream(queryset, translation.get_language()),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Иначе nginx буферизует поток.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, queryset, language):
+        async with events.get_broker().subscribe() as subscription:
+            yield f"retry: {EVENTS_RETRY}\n\n"
+            while True:
+                try:
+                    batch = await asyncio.wait_for(
+                        subscription.get(), settings.TASK_EVENTS_HEARTBEAT
+                    )
+                except asyncio.TimeoutError:
+                    # Комментарий не виден странице, но обнаруживает обрыв.
+                    yield ": ping\n\n"
+                    continue
+                with translation.override(language):
+                    for message in await self.messages(queryset, batch):
+                        yield message
+
+    async def messages(self, queryset, batch):
+        """Turn a batch of broker events into SSE messages."""
+        deleted = set()
+        # id задачи -> создана ли она в этой пачке событий.
+        changed = {}
+        for event in batch:
+            if event['type'] == events.RELOAD:
+                return [_sse('reload', {})]
+            ids = set(event['ids'])
+            if event['type'] == events.DELETED:
+                deleted |= ids
+                for task_id in ids:
+                    changed.pop(task_id, None)
+            else:
+                deleted -= ids
+                for task_id in ids:
+                    changed[task_id] = (
+                        changed.get(task_id, False)
+                        or event['type'] == events.CREATED
+                    )
+        if len(changed) > EVENTS_MAX_ROWS:
+            return [_sse('reload', {})]
+
+        tasks = []
+        if changed:
+            tasks = [
+                task async for task in queryset.filter(pk__in=changed)
+                .order_by('created_at', 'pk')
+            ]
+        rows = await row_cache.arender_each(tasks)
+        messages = [
+            _sse('upsert', {
+                'id': task.pk,
+                'created': changed[task.pk],
+                'html': html,
+            })
+            for task, html in zip(tasks, rows)
+        ]
+        removed = deleted | (set(changed) - {task.pk for task in tasks})
+        if removed:
+            messages.append(_sse('remove', {'ids': sorted(removed)}))
+        return messages
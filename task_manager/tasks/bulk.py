@@ -0,0 +1,120 @@
+"""Actions applied to many tasks at once.
+
+Every action runs in one transaction with one ``UPDATE ... WHERE id IN``
+or one bulk insert/delete on the label through table per chunk of ids.
+These statements bypass model signals, so each action updates the task
+counters, the list rows, the row cache and the live list events itself.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from . import counters, events, read_model, row_cache
+from .models import Task, TaskLabel, TaskListRow
+
+# Держим число параметров запроса ниже лимита SQLite.
+CHUNK_SIZE = 2000
+
+
+def _chunks(task_ids):
+    task_ids = sorted(set(task_ids))
+    for start in range(0, len(task_ids), CHUNK_SIZE):
+        yield task_ids[start:start + CHUNK_SIZE]
+
+
+def _reassign(task_ids, kind, value):
+    attname = f"{kind}_id"
+    pk = value.pk if value is not None else None
+    updated = 0
+    with transaction.atomic(), counters.collect() as delta:
+        for chunk in _chunks(task_ids):
+            tasks = Task.objects.filter(pk__in=chunk).exclude(**{attname: pk})
+            for old, count in (
+                tasks.order_by().values_list(attname)
+                .annotate(count=Count("pk"))
+            ):
+                delta.add(kind, old, -count)
+                delta.add(kind, pk, count)
+            changed = list(tasks.values_list("pk", flat=True))
+            updated += Task.objects.filter(pk__in=changed).update(
+                **{attname: pk, "updated_at": timezone.now()}
+            )
+            read_model.refresh_rows(changed)
+            row_cache.invalidate(changed)
+            events.publish(events.UPDATED, changed)
+    return updated
+
+
+def set_status(task_ids, status):
+    return _reassign(task_ids, "status", status)
+
+
+def set_executor(task_ids, executor):
+    return _reassign(task_ids, "executor", executor)
+
+
+def add_label(task_ids, label):
+    added = 0
+    with transaction.atomic(), counters.collect() as delta:
+        for chunk in _chunks(task_ids):
+            linked = set(
+                TaskLabel.objects.filter(label=label, task_id__in=chunk)
+                .values_list("task_id", flat=True)
+            )
+            new = [pk for pk in chunk if pk not in linked]
+            TaskLabel.objects.bulk_create(
+                TaskLabel(task_id=pk, label=label) for pk in new
+            )
+            Task.objects.filter(pk__in=new).touch()
+            delta.add("label", label.pk, len(new))
+            read_model.refresh_rows(new)
+            row_cache.invalidate(new)
+            events.publish(events.UPDATED, new)
+            added += len(new)
+    return added
+
+
+def remove_label(task_ids, label):
+    removed = 0
+    with transaction.atomic(), counters.collect() as delta:
+        for chunk in _chunks(task_ids):
+            links = TaskLabel.objects.filter(label=label, task_id__in=chunk)
+            unlinked = list(links.values_list("task_id", flat=True))
+            count, _ = links.delete()
+            Task.objects.filter(pk__in=unlinked).touch()
+            delta.add("label", label.pk, -count)
+            read_model.refresh_rows(unlinked)
+            row_cache.invalidate(unlinked)
+            events.publish(events.UPDATED, unlinked)
+            removed += count
+    return removed
+
+
+def delete(task_ids):
+    deleted = 0
+    with transaction.atomic(), counters.collect() as delta:
+        for chunk in _chunks(task_ids):
+            rows = list(Task.objects.filter(pk__in=chunk).values_list(
+                "pk", "status_id", "author_id", "executor_id"
+            ))
+            found = [pk for pk, *_ in rows]
+            links = TaskLabel.objects.filter(task_id__in=found)
+            label_ids = defaultdict(list)
+            for task_id, label_id in links.values_list("task_id", "label_id"):
+                label_ids[task_id].append(label_id)
+            for pk, status_id, author_id, executor_id in rows:
+                delta.add_task(
+                    status_id, author_id, executor_id, label_ids[pk], sign=-1
+                )
+            # QuerySet.delete() отправил бы сигналы на каждую задачу, и
+            # каждый читал бы её метки. Связи и строки списка удаляем сами.
+            links._raw_delete(links.db)
+            TaskListRow.objects.filter(task_id__in=found).delete()
+            tasks = Task.objects.filter(pk__in=found)
+            deleted += tasks._raw_delete(tasks.db)
+            row_cache.invalidate(found)
+            events.publish(events.DELETED, found)
+    return deleted
@@ -0,0 +1,185 @@
+"""Cached choice lists for the short selects of the task forms.
+
+TaskFilter, TaskForm and TaskBulkActionForm show the full status list on
+every request. The ``(id, label)`` pairs and the ``<option>`` HTML of a
+list are cached per language for ``TASK_CHOICES_CACHE_TIMEOUT`` seconds
+under a generation (see ``task_manager.cache_utils``) that
+``invalidate()`` bumps after a Status changes (see ``signals.py``).
+Validation of a submitted value still goes through
+the field queryset, so a stale entry can never be saved. The executor
+and label selects are too long to list and use
+``task_manager.autocomplete`` instead.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.forms.models import ModelChoiceIterator, ModelChoiceIteratorValue
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from task_manager import cache_utils
+from task_manager.statuses.models import Status
+
+# Увеличить при изменении формата записи в кэше.
+VERSION = 2
+
+# Кэш наполняется из основной базы: список с отстающей реплики прожил
+# бы в кэше и после сброса.
+SOURCES = {
+    "status": lambda: Status.objects.using(DEFAULT_DB_ALIAS).order_by("pk"),
+}
+
+
+# Списки, загруженные асинхронным view до рендеринга формы.
+_preloaded = ContextVar("preloaded_choices", default=None)
+
+
+def _name(kind):
+    return f"tasks:choices:{kind}"
+
+
+def _key(kind, generation):
+    language = get_language() or settings.LANGUAGE_CODE
+    return f"tasks:choices:{kind}:{generation}:{language}"
+
+
+def _entry(obj):
+    return (
+        obj.pk,
+        str(obj),
+        format_html('<option value="{}">{}</option>', obj.pk, obj),
+    )
+
+
+def get_choices(kind):
+    """Return ``[(pk, label, option_html), ...]`` for ``kind``."""
+    preloaded = _preloaded.get()
+    if preloaded and kind in preloaded:
+        return preloaded[kind]
+    key = _key(kind, cache_utils.generation(_name(kind)))
+    entries = cache.get(key, version=VERSION)
+    if entries is None:
+        entries = [_entry(obj) for obj in SOURCES[kind]()]
+        cache.set(
+            key,
+            entries,
+            settings.TASK_CHOICES_CACHE_TIMEOUT,
+            version=VERSION,
+        )
+    return entries
+
+
+async def aget_choices(kind):
+    """Async version of ``get_choices()``."""
+    key = _key(kind, await cache_utils.ageneration(_name(kind)))
+    entries = await cache.aget(key, version=VERSION)
+    if entries is None:
+        entries = [_entry(obj) async for obj in SOURCES[kind]()]
+        await cache.aset(
+            key,
+            entries,
+            settings.TASK_CHOICES_CACHE_TIMEOUT,
+            version=VERSION,
+        )
+    return entries
+
+
+@contextmanager
+def preloaded(choices):
+    """Serve ``{kind: entries}`` to the fields rendered inside the block.
+
+    An async view loads the lists with ``aget_choices()`` and renders
+    the form inside this block, so a concurrent invalidation cannot
+    send the widgets to the database from the event loop.
+    """
+    token = _preloaded.set(choices)
+    try:
+        yield
+    finally:
+        _preloaded.reset(token)
+
+
+def invalidate(kind):
+    """Start a new generation of ``kind`` lists in every language."""
+    cache_utils.bump_generation(_name(kind))
+
+
+class CachedChoiceIterator(ModelChoiceIterator):
+    """ModelChoiceIterator that reads the cached list instead of a query."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for pk, label, _ in get_choices(self.field.choice_kind):
+            yield ModelChoiceIteratorValue(pk, None), label
+
+    def __len__(self):
+        return len(get_choices(self.field.choice_kind)) + (
+            1 if self.field.empty_label is not None else 0
+        )
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(
+            get_choices(self.field.choice_kind)
+        )
+
+
+class CachedSelectMixin:
+    """Render the options from cached HTML instead of option templates."""
+
+    def render(self, name, value, attrs=None, renderer=None):
+        if not isinstance(self.choices, CachedChoiceIterator):
+            return super().render(name, value, attrs, renderer)
+        field = self.choices.field
+        selected = set(self.format_value(value))
+        final_attrs = self.build_attrs(self.attrs, attrs)
+        final_attrs["name"] = name
+        if self.allow_multiple_selected:
+            final_attrs["multiple"] = True
+
+        parts = [format_html("<select{}>", flatatt(final_attrs))]
+        if field.empty_label is not None and not self.allow_multiple_selected:
+            parts.append(format_html(
+                '<option value=""{}>{}</option>',
+                mark_safe(" selected") if "" in selected else "",
+                field.empty_label,
+            ))
+        for pk, label, option in get_choices(field.choice_kind):
+            if str(pk) in selected:
+                option = format_html(
+                    '<option value="{}" selected>{}</option>', pk, label
+                )
+            parts.append(option)
+        parts.append(mark_safe("</select>"))
+        return mark_safe("".join(parts))
+
+
+class CachedSelect(CachedSelectMixin, forms.Select):
+    pass
+
+
+class CachedSelectMultiple(CachedSelectMixin, forms.SelectMultiple):
+    pass
+
+
+def use_cached_choices(field, kind):
+    """Switch a ModelChoiceField (or a filter's one) to the cached list."""
+    field.choice_kind = kind
+    field.iterator = CachedChoiceIterator
+    if not isinstance(field.widget, CachedSelectMixin):
+        widget_class = (
+            CachedSelectMultiple
+            if field.widget.allow_multiple_selected
+            else CachedSelect
+        )
+        widget = widget_class(attrs=field.widget.attrs)
+        widget.is_required = field.widget.is_required
+        field.widget = widget
+    field.widget.choices = field.choices
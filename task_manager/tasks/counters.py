@@ -0,0 +1,156 @@
+"""Denormalized task counters on Status, Label and User.
+
+``Status.task_count``, ``Label.task_count``, ``User.authored_task_count``
+and ``User.executed_task_count`` are changed incrementally from the task
+signals (see ``signals.py``) and by bulk operations through
+``CounterDelta``. ``rebuild()`` recomputes them from scratch.
+"""
+
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps as global_apps
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+_active_delta = ContextVar("task_counter_delta", default=None)
+
+# (модель, поле счётчика) для каждого вида ссылки задачи.
+TARGETS = {
+    "status": ("statuses.Status", "task_count"),
+    "label": ("labels.Label", "task_count"),
+    "author": ("users.User", "authored_task_count"),
+    "executor": ("users.User", "executed_task_count"),
+}
+
+
+class CounterDelta:
+    """Collects counter changes and applies them in a few UPDATEs.
+
+    Rows that change by the same amount are updated with one
+    ``UPDATE ... SET field = field + delta WHERE id IN (...)``.
+    """
+
+    def __init__(self):
+        self.changes = {kind: Counter() for kind in TARGETS}
+
+    def __bool__(self):
+        return any(
+            delta for counter in self.changes.values()
+            for delta in counter.values()
+        )
+
+    def add(self, kind, pk, delta=1):
+        if pk is not None and delta:
+            self.changes[kind][pk] += delta
+
+    def add_task(
+        self,
+        status_id,
+        author_id,
+        executor_id,
+        label_ids=(),
+        sign=1,
+    ):
+        self.add("status", status_id, sign)
+        self.add("author", author_id, sign)
+        self.add("executor", executor_id, sign)
+        for label_id in label_ids:
+            self.add("label", label_id, sign)
+
+    def apply(self, apps=global_apps):
+        for kind, counter in self.changes.items():
+            model_name, field = TARGETS[kind]
+            model = apps.get_model(model_name)
+            by_delta = defaultdict(list)
+            for pk, delta in counter.items():
+                if delta:
+                    by_delta[delta].append(pk)
+            for delta, pks in by_delta.items():
+                # Счётчик виден на страницах, поэтому меняет и updated_at.
+                model._default_manager.filter(pk__in=pks).update(
+                    **{field: F(field) + delta, "updated_at": timezone.now()}
+                )
+        self.changes = {kind: Counter() for kind in TARGETS}
+
+
+class CountedModelMixin:
+    """Keeps the counter fields out of regular saves of a model.
+
+    Counters change only through ``F()`` updates, so a full ``save()`` of
+    an instance loaded earlier would otherwise write back stale values.
+    """
+
+    COUNTER_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            skipped = set(self.COUNTER_FIELDS) | self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+        super().save(*args, **kwargs)
+
+
+@contextmanager
+def collect():
+    """Yield a CounterDelta that is applied when the block succeeds.
+
+    Nested blocks share the outermost delta, so a bulk operation that
+    fires many task signals ends up with one UPDATE per distinct change
+    instead of several UPDATEs per task.
+    """
+    outer = _active_delta.get()
+    if outer is not None:
+        yield outer
+        return
+    delta = CounterDelta()
+    token = _active_delta.set(delta)
+    try:
+        yield delta
+    finally:
+        _active_delta.reset(token)
+    delta.apply()
+
+
+def _count_subquery(model, group_by):
+    return Coalesce(
+        Subquery(
+            model._default_manager.filter(**{group_by: OuterRef("pk")})
+            .order_by()
+            .values(group_by)
+            .annotate(total=Count("pk"))
+            .values("total")
+        ),
+        Value(0),
+    )
+
+
+def _touched(model):
+    # В ранних миграциях (исторические модели) поля updated_at ещё нет.
+    fields = {field.name for field in model._meta.get_fields()}
+    return {"updated_at": timezone.now()} if "updated_at" in fields else {}
+
+
+def rebuild(apps=global_apps):
+    """Recompute every counter with one UPDATE per counter table."""
+    task = apps.get_model("tasks.Task")
+    task_label = apps.get_model("tasks.TaskLabel")
+    status = apps.get_model("statuses.Status")
+    label = apps.get_model("labels.Label")
+    user = apps.get_model("users.User")
+    status._default_manager.update(
+        task_count=_count_subquery(task, "status"), **_touched(status)
+    )
+    label._default_manager.update(
+        task_count=_count_subquery(task_label, "label"), **_touched(label)
+    )
+    user._default_manager.update(
+        authored_task_count=_count_subquery(task, "author"),
+        executed_task_count=_count_subquery(task, "executor"),
+        **_touched(user),
+    )
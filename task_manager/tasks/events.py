@@ -0,0 +1,188 @@
+"""Task change events for the live task list.
+
+Signals and bulk operations call ``publish()``. After the transaction
+commits the event goes to the broker, which hands it to every open
+``TaskEventsView`` stream. ``LocalBroker`` delivers inside one process;
+``RedisBroker`` relays events between processes through Redis pub/sub
+when ``TASK_EVENTS_BROKER_URL`` is set (needs the ``redis`` package).
+A failing broker is logged and never fails the committed request.
+
+An event is ``{"type": ..., "ids": [...]}``. ``reload`` tells the page
+to reload itself, e.g. after a status rename or when a subscriber fell
+too far behind.
+"""
+
+import asyncio
+import functools
+import json
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import transaction
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+RELOAD = "reload"
+
+# Столько событий может ждать медленный подписчик, дальше — reload.
+QUEUE_SIZE = 1000
+
+_pending_events = ContextVar("task_pending_events", default=None)
+
+
+def _send(kind, task_ids):
+    event = {"type": kind, "ids": sorted(task_ids)}
+    # Изменение уже записано: сбой брокера только логируется, иначе
+    # пользователь получил бы 500 за сохранённую задачу.
+    transaction.on_commit(
+        lambda: get_broker().publish(event), robust=True
+    )
+
+
+def publish(kind, task_ids=()):
+    """Send an event about ``task_ids`` once the transaction commits."""
+    task_ids = set(task_ids)
+    if kind != RELOAD and not task_ids:
+        return
+    pending = _pending_events.get()
+    if pending is None:
+        _send(kind, task_ids)
+    else:
+        pending.setdefault(kind, set()).update(task_ids)
+
+
+@contextmanager
+def batched():
+    """Merge the events published inside the block, one per type."""
+    if _pending_events.get() is not None:
+        yield
+        return
+    pending = {}
+    token = _pending_events.set(pending)
+    try:
+        yield
+    finally:
+        _pending_events.reset(token)
+    for kind, task_ids in pending.items():
+        _send(kind, task_ids)
+
+
+class Subscription:
+    """Events queued for one stream, owned by its event loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self):
+        """Wait for events and return every one queued so far."""
+        events = [await self.queue.get()]
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        if self.overflowed:
+            self.overflowed = False
+            return [{"type": RELOAD, "ids": []}]
+        return events
+
+
+class LocalBroker:
+    """Deliver events to the subscribers of the current process."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        self.deliver(event)
+
+    def deliver(self, event):
+        # Публикуют из потоков синхронных view, поэтому в цикл событий
+        # подписчика передаём через call_soon_threadsafe.
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.deliver, event
+                )
+            except RuntimeError:
+                # Цикл событий уже закрыт.
+                self._discard(subscription)
+
+    def _discard(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @asynccontextmanager
+    async def subscribe(self):
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._discard(subscription)
+
+
+class RedisBroker(LocalBroker):
+    """Relay events between processes through a Redis channel.
+
+    Each process keeps one listener connection and fans the received
+    events out to its own subscribers.
+    """
+
+    channel = "task_manager:tasks:events"
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self._client = None
+        self._listener = None
+
+    def publish(self, event):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(self.channel, json.dumps(event))
+
+    @asynccontextmanager
+    async def subscribe(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        async with super().subscribe() as subscription:
+            yield subscription
+
+    async def _listen(self):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.deliver(json.loads(message["data"]))
+        finally:
+            # Пропущенные события не восстановить, страницы перезагрузятся
+            # и следующий подписчик запустит слушателя заново.
+            self.deliver({"type": RELOAD, "ids": []})
+            await client.aclose()
+
+
+@functools.cache
+def get_broker():
+    url = settings.TASK_EVENTS_BROKER_URL
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBroker(url)
+    return LocalBroker()
@@ -0,0 +1,124 @@
+"""Streaming export of task lists as CSV or JSON Lines.
+
+Tasks are read with ``QuerySet.iterator()``, so memory use does not
+depend on the number of exported tasks. Labels are loaded with one
+query per chunk of tasks.
+"""
+
+import csv
+import io
+import json
+from collections import defaultdict
+
+from .models import TaskLabel
+from .read_model import full_name
+
+CHUNK_SIZE = 2000
+
+COLUMNS = [
+    "id",
+    "name",
+    "description",
+    "status",
+    "author",
+    "executor",
+    "labels",
+    "created_at",
+]
+
+TASK_VALUES = [
+    "pk",
+    "name",
+    "description",
+    "status__name",
+    "author__first_name",
+    "author__last_name",
+    "executor_id",
+    "executor__first_name",
+    "executor__last_name",
+    "created_at",
+]
+
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson; charset=utf-8", "jsonl"),
+}
+
+
+def _chunks(queryset, chunk_size):
+    chunk = []
+    for values in queryset.values(*TASK_VALUES).iterator(
+        chunk_size=chunk_size
+    ):
+        chunk.append(values)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _labels(task_ids):
+    labels = defaultdict(list)
+    links = (
+        TaskLabel.objects.filter(task_id__in=task_ids)
+        .order_by("label__name", "label_id")
+        .values_list("task_id", "label__name")
+    )
+    for task_id, name in links:
+        labels[task_id].append(name)
+    return labels
+
+
+def iter_chunks(queryset, chunk_size=None):
+    """Yield lists of export records in the order of ``queryset``."""
+    for chunk in _chunks(queryset, chunk_size or CHUNK_SIZE):
+        labels = _labels([values["pk"] for values in chunk])
+        yield [
+            {
+                "id": values["pk"],
+                "name": values["name"],
+                "description": values["description"],
+                "status": values["status__name"],
+                "author": full_name(
+                    values["author__first_name"], values["author__last_name"]
+                ),
+                "executor": (
+                    full_name(
+                        values["executor__first_name"],
+                        values["executor__last_name"],
+                    )
+                    if values["executor_id"] else ""
+                ),
+                "labels": labels[values["pk"]],
+                "created_at": values["created_at"].isoformat(),
+            }
+            for values in chunk
+        ]
+
+
+def stream_csv(queryset, chunk_size=None):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS)
+    writer.writeheader()
+    yield buffer.getvalue()
+    for records in iter_chunks(queryset, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        for record in records:
+            writer.writerow({**record, "labels": ", ".join(record["labels"])})
+        yield buffer.getvalue()
+
+
+def stream_jsonl(queryset, chunk_size=None):
+    for records in iter_chunks(queryset, chunk_size):
+        yield "".join(
+            json.dumps(record, ensure_ascii=False) + "\n"
+            for record in records
+        )
+
+
+STREAMS = {
+    "csv": stream_csv,
+    "jsonl": stream_jsonl,
+}
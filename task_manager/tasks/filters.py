@@ -1,11 +1,15 @@
 import django_filters
 from django.contrib.auth import get_user_model
+from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.autocomplete import use_autocomplete
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 
-from .models import Task
+from .choices import use_cached_choices
+from .models import Task, TaskLabel, TaskListRow
+from .search import search_tasks
 
 User = get_user_model()
 
@@ -20,15 +24,59 @@ class TaskFilter(django_filters.FilterSet):
     labels = django_filters.ModelChoiceFilter(
         queryset=Label.objects.all(), label=_("Label")
     )
+    q = django_filters.CharFilter(method="filter_search", label=_("Search"))
 
     class Meta:
         model = Task
-        fields = ["status", "executor", "labels"]
+        fields = ["status", "executor", "labels", "q"]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.form.label_suffix = ""
-        for name in ("status", "executor", "labels"):
+        for name, url in (
+            ("status", None),
+            ("executor", reverse_lazy("user_autocomplete")),
+            ("labels", reverse_lazy("label_autocomplete")),
+        ):
             field = self.form.fields.get(name)
             if field:
                 field.widget.attrs.setdefault("class", "form-select")
+                if url is None:
+                    use_cached_choices(field, name)
+                else:
+                    use_autocomplete(field, url)
+        self.form.fields["q"].widget.attrs.setdefault("class", "form-control")
+
+    def filter_search(self, queryset, name, value):
+        return search_tasks(queryset, value)
+
+    @property
+    def search_query(self):
+        if not self.is_bound or not self.form.is_valid():
+            return ""
+        return (self.form.cleaned_data.get("q") or "").strip()
+
+
+class TaskListRowFilter(TaskFilter):
+    """TaskFilter over the denormalized TaskListRow table.
+
+    Status, executor and author are plain columns there, and a label is
+    matched through the ``(label, task)`` index of TaskLabel. There is
+    no search here: TaskListView reads from Task when a search query is
+    given.
+    """
+
+    labels = django_filters.ModelChoiceFilter(
+        queryset=Label.objects.all(),
+        label=_("Label"),
+        method="filter_label",
+    )
+
+    class Meta:
+        model = TaskListRow
+        fields = ["status", "executor", "labels"]
+
+    def filter_label(self, queryset, name, value):
+        return queryset.filter(task__in=TaskLabel.objects.filter(
+            label_id=value.pk
+        ).values("task_id"))
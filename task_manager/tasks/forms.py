@@ -1,14 +1,39 @@
 from django import forms
+from django.contrib.auth import get_user_model
+from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.autocomplete import use_autocomplete
 from task_manager.forms import NoLabelSuffixMixin
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
 
+from .choices import use_cached_choices
 from .models import Task
 
+User = get_user_model()
+
 
 class TaskForm(NoLabelSuffixMixin, forms.ModelForm):
     label_suffix = ""
 
+    # Поле формы -> список в choices.py.
+    cached_choices = {
+        "status": "status",
+    }
+    # Поле формы -> адрес автодополнения.
+    autocomplete_urls = {
+        "executor": reverse_lazy("user_autocomplete"),
+        "labels": reverse_lazy("label_autocomplete"),
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, kind in self.cached_choices.items():
+            use_cached_choices(self.fields[name], kind)
+        for name, url in self.autocomplete_urls.items():
+            use_autocomplete(self.fields[name], url)
+
     class Meta:
         model = Task
         fields = ["name", "description", "status", "executor", "labels"]
@@ -37,3 +62,86 @@ class TaskForm(NoLabelSuffixMixin, forms.ModelForm):
             "executor": forms.Select(attrs={"class": "form-select"}),
             "labels": forms.SelectMultiple(attrs={"class": "form-select"}),
         }
+
+
+class TaskIdsField(forms.Field):
+    """A list of task ids sent as repeated ``task_ids`` values."""
+
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        try:
+            return sorted({int(pk) for pk in value or []})
+        except (TypeError, ValueError) as exc:
+            raise forms.ValidationError(_("Invalid task ids")) from exc
+
+
+class TaskBulkActionForm(NoLabelSuffixMixin, forms.Form):
+    SET_STATUS = "set_status"
+    SET_EXECUTOR = "set_executor"
+    ADD_LABEL = "add_label"
+    REMOVE_LABEL = "remove_label"
+    DELETE = "delete"
+
+    action = forms.ChoiceField(
+        label=_("Action"),
+        choices=[
+            (SET_STATUS, _("Change status")),
+            (SET_EXECUTOR, _("Change executor")),
+            (ADD_LABEL, _("Add label")),
+            (REMOVE_LABEL, _("Remove label")),
+            (DELETE, _("Delete")),
+        ],
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    status = forms.ModelChoiceField(
+        label=_("Status"),
+        queryset=Status.objects.all(),
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    executor = forms.ModelChoiceField(
+        label=_("Executor"),
+        queryset=User.objects.all(),
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    label = forms.ModelChoiceField(
+        label=_("Label"),
+        queryset=Label.objects.all(),
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    task_ids = TaskIdsField(required=False)
+    select_all = forms.BooleanField(
+        label=_("All filtered tasks"),
+        required=False,
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+
+    autocomplete_urls = {
+        "executor": reverse_lazy("user_autocomplete"),
+        "label": reverse_lazy("label_autocomplete"),
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        use_cached_choices(self.fields["status"], "status")
+        for name, url in self.autocomplete_urls.items():
+            use_autocomplete(self.fields[name], url)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        if action == self.SET_STATUS and not cleaned_data.get("status"):
+            self.add_error("status", _("This field is required."))
+        if (
+            action in (self.ADD_LABEL, self.REMOVE_LABEL)
+            and not cleaned_data.get("label")
+        ):
+            self.add_error("label", _("This field is required."))
+        if not cleaned_data.get("select_all") and not cleaned_data.get(
+            "task_ids"
+        ):
+            raise forms.ValidationError(_("No tasks selected"))
+        return cleaned_data
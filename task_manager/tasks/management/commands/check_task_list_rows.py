@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.tasks import read_model
+
+
+class Command(BaseCommand):
+    help = "Compare TaskListRow with the task tables and report drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Refresh the rows that are missing, stale or orphaned.",
+        )
+
+    def handle(self, *args, **options):
+        broken = read_model.find_inconsistencies()
+        if not broken:
+            self.stdout.write(
+                self.style.SUCCESS("Task list rows are consistent.")
+            )
+            return
+        preview = ", ".join(str(pk) for pk in broken[:20])
+        if options["fix"]:
+            for start in range(0, len(broken), read_model.CHUNK_SIZE):
+                read_model.refresh_rows(
+                    broken[start:start + read_model.CHUNK_SIZE]
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f"Refreshed {len(broken)} task rows: {preview}"
+            ))
+            return
+        raise CommandError(
+            f"{len(broken)} task rows are inconsistent: {preview}. "
+            "Run with --fix to refresh them."
+        )
@@ -0,0 +1,226 @@
+import csv
+import json
+import sys
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, read_model
+from task_manager.tasks.models import Task, TaskLabel
+from task_manager.tasks.read_model import full_name
+
+User = get_user_model()
+
+
+class RowError(ValueError):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks from CSV or JSON Lines. Columns: name, description, "
+        "status, author, executor, labels. Users are matched by username "
+        "or full name, statuses and labels by name."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", help="File to import, or '-' to read from stdin."
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Input format. Guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--author",
+            help="Username of the author for rows without an author column.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Run every batch and roll it back.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        self.verbosity = options["verbosity"]
+        self.load_lookups(options["author"])
+
+        path = options["path"]
+        input_format = options["format"] or (
+            "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+        )
+        if path == "-":
+            stream = nullcontext(sys.stdin)
+        else:
+            try:
+                stream = open(path, encoding="utf-8", newline="")
+            except OSError as exc:
+                raise CommandError(
+                    f"Cannot open '{path}': {exc.strerror}."
+                ) from exc
+        with stream as lines:
+            imported, skipped, elapsed = self.import_rows(
+                input_format, lines, options
+            )
+
+        rate = imported / elapsed if elapsed else 0
+        action = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {imported} tasks in {elapsed:.2f}s "
+            f"({rate:.0f} rows/sec), skipped {skipped}."
+        ))
+
+    def load_lookups(self, author):
+        self.statuses = dict(Status.objects.values_list("name", "pk"))
+        self.labels = dict(Label.objects.values_list("name", "pk"))
+
+        self.users = {}
+        names = Counter()
+        users = list(User.objects.values_list(
+            "pk", "username", "first_name", "last_name"
+        ))
+        for _, _, first_name, last_name in users:
+            names[full_name(first_name, last_name)] += 1
+        for pk, _, first_name, last_name in users:
+            # Полное имя подходит, только если оно однозначно.
+            name = full_name(first_name, last_name)
+            if name and names[name] == 1:
+                self.users[name] = pk
+        for pk, username, _, _ in users:
+            self.users[username] = pk
+
+        self.default_author = None
+        if author:
+            try:
+                self.default_author = User.objects.get(username=author).pk
+            except User.DoesNotExist as exc:
+                raise CommandError(f"Unknown author '{author}'.") from exc
+
+    def read_records(self, input_format, stream):
+        if input_format == "csv":
+            for record in csv.DictReader(stream):
+                labels = record.get("labels") or ""
+                record["labels"] = [
+                    name.strip() for name in labels.split(",") if name.strip()
+                ]
+                yield record
+            return
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield None
+                continue
+            yield record if isinstance(record, dict) else None
+
+    def string(self, record, field):
+        """Return ``record[field]`` or ``""``; JSON may hold any type."""
+        value = record.get(field)
+        if value is None:
+            return ""
+        if not isinstance(value, str):
+            raise RowError(f"{field} is not a string")
+        return value
+
+    def resolve_user(self, value):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            return self.users[value]
+        except KeyError:
+            raise RowError(f"unknown user '{value}'") from None
+
+    def resolve(self, record):
+        if record is None:
+            raise RowError("malformed record")
+        name = self.string(record, "name").strip()
+        max_length = Task._meta.get_field("name").max_length
+        if not name or len(name) > max_length:
+            raise RowError("name is empty or too long")
+
+        status = self.string(record, "status").strip()
+        if status not in self.statuses:
+            raise RowError(f"unknown status '{status}'")
+
+        author_id = self.resolve_user(self.string(record, "author"))
+        author_id = author_id or self.default_author
+        if author_id is None:
+            raise RowError("no author; pass --author")
+
+        labels = record.get("labels") or []
+        # Строка вместо списка разобралась бы по символам.
+        if not isinstance(labels, list) or not all(
+            isinstance(label, str) for label in labels
+        ):
+            raise RowError("labels is not a list of names")
+        label_ids = []
+        for label in labels:
+            if label not in self.labels:
+                raise RowError(f"unknown label '{label}'")
+            label_ids.append(self.labels[label])
+
+        task = Task(
+            name=name,
+            description=self.string(record, "description"),
+            status_id=self.statuses[status],
+            author_id=author_id,
+            executor_id=self.resolve_user(self.string(record, "executor")),
+        )
+        return task, sorted(set(label_ids))
+
+    def import_rows(self, input_format, stream, options):
+        batch = []
+        imported = skipped = 0
+        started = time.perf_counter()
+        records = self.read_records(input_format, stream)
+        for number, record in enumerate(records, start=1):
+            try:
+                batch.append(self.resolve(record))
+            except RowError as exc:
+                skipped += 1
+                self.stderr.write(f"Row {number} skipped: {exc}.")
+                continue
+            if len(batch) == options["batch_size"]:
+                imported += self.write_batch(batch, options["dry_run"])
+                batch = []
+        if batch:
+            imported += self.write_batch(batch, options["dry_run"])
+        return imported, skipped, time.perf_counter() - started
+
+    def write_batch(self, batch, dry_run):
+        with transaction.atomic():
+            # bulk_create не вызывает сигналы, поэтому счётчики и строки
+            # списка обновляются здесь, одним проходом на пачку.
+            with counters.collect() as delta:
+                tasks = Task.objects.bulk_create(task for task, _ in batch)
+                TaskLabel.objects.bulk_create(
+                    TaskLabel(task_id=task.pk, label_id=label_id)
+                    for task, (_, label_ids) in zip(tasks, batch)
+                    for label_id in label_ids
+                )
+                for task, (_, label_ids) in zip(tasks, batch):
+                    delta.add_task(
+                        task.status_id,
+                        task.author_id,
+                        task.executor_id,
+                        label_ids,
+                    )
+            read_model.refresh_rows(task.pk for task in tasks)
+            if dry_run:
+                transaction.set_rollback(True)
+        if self.verbosity > 1:
+            self.stdout.write(f"Batch of {len(tasks)} tasks written.")
+        return len(tasks)
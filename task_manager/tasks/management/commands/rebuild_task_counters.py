@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_manager.tasks import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute task counters on statuses, labels and users."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counters.rebuild()
+        self.stdout.write(self.style.SUCCESS("Task counters rebuilt."))
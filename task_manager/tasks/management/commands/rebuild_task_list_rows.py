@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_manager.tasks import read_model
+
+
+class Command(BaseCommand):
+    help = "Recreate the denormalized task list rows (TaskListRow)."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = read_model.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} task rows."))
@@ -0,0 +1,323 @@
+import random
+import time
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from task_manager import autocomplete
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import (
+    choices,
+    counters,
+    events,
+    read_model,
+    search,
+)
+from task_manager.tasks.models import Task, TaskLabel, TaskListRow
+
+User = get_user_model()
+
+TASK_COLUMNS = [
+    "id", "name", "description", "status_id", "author_id", "executor_id",
+    "created_at", "updated_at",
+]
+ROW_COLUMNS = [
+    "task_id", "name", "status_id", "status_name", "author_id",
+    "author_name", "executor_id", "executor_name", "labels", "created_at",
+]
+
+FIRST_NAMES = [
+    "Anna", "Boris", "Daria", "Egor", "Irina", "Kirill", "Maria", "Nikita",
+    "Olga", "Pavel", "Sofia", "Timur", "Vera", "Yuri", "Zoya", "Lev",
+]
+LAST_NAMES = [
+    "Ivanov", "Smirnov", "Kuznetsov", "Popov", "Sokolov", "Lebedev",
+    "Kozlov", "Novikov", "Morozov", "Petrov", "Volkov", "Solovyov",
+]
+WORDS = [
+    "fix", "review", "deploy", "update", "migrate", "test", "document",
+    "refactor", "release", "check", "login", "report", "cache", "search",
+    "export", "import", "billing", "profile", "backup", "api",
+]
+
+
+def zipf_weights(size, skew):
+    """Cumulative weights of ranks 1..size for ``random.choices``.
+
+    ``skew=0`` is uniform; the default 1.0 gives the first of 100 users
+    about a fifth of all tasks.
+    """
+    return list(accumulate(1 / rank ** skew for rank in range(1, size + 1)))
+
+
+def next_suffix(model, field, stem):
+    """Return the number after the largest ``<stem><number>`` in ``field``.
+
+    Counting rows instead would reuse a suffix after deletions or when
+    other names are in the table.
+    """
+    names = model.objects.filter(
+        **{f"{field}__startswith": stem}
+    ).values_list(field, flat=True)
+    suffixes = [
+        int(name[len(stem):]) for name in names if name[len(stem):].isdigit()
+    ]
+    return max(suffixes, default=-1) + 1
+
+
+def insert(cursor, model, columns, rows):
+    """Insert value tuples with one executemany, bypassing the ORM."""
+    quote = connection.ops.quote_name
+    cursor.executemany(
+        f"INSERT INTO {quote(model._meta.db_table)} "
+        f"({', '.join(quote(column) for column in columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})",
+        rows,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, statuses, labels and tasks for load "
+        "tests. The same --seed on the same database gives the same data. "
+        "Tasks get explicit ids, so run it while nothing else writes tasks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--statuses", type=int, default=10)
+        parser.add_argument("--labels", type=int, default=50)
+        parser.add_argument("--tasks", type=int, default=10_000)
+        parser.add_argument(
+            "--executor-skew",
+            type=float,
+            default=1.0,
+            help="Zipf exponent of executors; 0 spreads tasks evenly.",
+        )
+        parser.add_argument(
+            "--unassigned",
+            type=float,
+            default=0.2,
+            help="Share of tasks without an executor.",
+        )
+        parser.add_argument(
+            "--max-labels",
+            type=int,
+            default=3,
+            help="Each task gets 0..N labels.",
+        )
+        parser.add_argument(
+            "--label-skew",
+            type=float,
+            default=1.0,
+            help="Zipf exponent of labels; 0 picks them evenly.",
+        )
+        parser.add_argument(
+            "--days",
+            type=float,
+            default=365,
+            help="created_at is spread over this many days before --end.",
+        )
+        parser.add_argument(
+            "--end",
+            help="Newest created_at (ISO 8601); now by default.",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--password",
+            help="Password of the new users; they cannot log in without it.",
+        )
+        parser.add_argument("--prefix", default="seed")
+
+    def handle(self, *args, **options):
+        self.check_options(options)
+        self.rng = random.Random(options["seed"])
+        self.prefix = options["prefix"]
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            self.create_users(options["users"], options["password"])
+            self.create_named(Status, options["statuses"], "status")
+            self.create_named(Label, options["labels"], "label")
+            if options["tasks"]:
+                self.create_tasks(options)
+        elapsed = time.perf_counter() - started
+
+        # bulk_create не вызывает сигналы, поэтому кэши сбрасываются здесь.
+        choices.invalidate("status")
+        autocomplete.USERS.invalidate()
+        autocomplete.LABELS.invalidate()
+        events.publish(events.RELOAD)
+
+        rate = options["tasks"] / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {options['users']} users, {options['statuses']} "
+            f"statuses, {options['labels']} labels and {options['tasks']} "
+            f"tasks in {elapsed:.2f}s ({rate:.0f} tasks/sec)."
+        ))
+
+    def check_options(self, options):
+        for name in ("users", "statuses", "labels", "tasks", "max_labels"):
+            if options[name] < 0:
+                raise CommandError(f"--{name.replace('_', '-')} is negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        if not 0 <= options["unassigned"] <= 1:
+            raise CommandError("--unassigned must be between 0 and 1.")
+        if options["days"] < 0:
+            raise CommandError("--days is negative.")
+        if options["end"] is None:
+            options["end"] = timezone.now()
+        else:
+            end = parse_datetime(options["end"])
+            if end is None:
+                raise CommandError(f"Invalid --end '{options['end']}'.")
+            if timezone.is_naive(end):
+                end = timezone.make_aware(end)
+            options["end"] = end
+
+    def create_users(self, count, password):
+        if not count:
+            return
+        # Один хэш на всех: хэширование дороже самой вставки.
+        encoded = make_password(password) if password else "!"
+        stem = f"{self.prefix}_user_"
+        first = next_suffix(User, "username", stem)
+        User.objects.bulk_create(
+            User(
+                username=f"{stem}{first + i}",
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                password=encoded,
+            )
+            for i in range(count)
+        )
+
+    def create_named(self, model, count, kind):
+        if not count:
+            return
+        stem = f"{self.prefix} {kind} "
+        first = next_suffix(model, "name", stem)
+        model.objects.bulk_create(
+            model(name=f"{stem}{first + i}")
+            for i in range(count)
+        )
+
+    def create_tasks(self, options):
+        statuses = list(
+            Status.objects.order_by("pk").values_list("pk", "name")
+        )
+        users = list(User.objects.order_by("pk").values_list(
+            "pk", "first_name", "last_name"
+        ))
+        labels = list(Label.objects.order_by("pk").values_list("pk", "name"))
+        if not statuses or not users:
+            raise CommandError("Tasks need at least one status and one user.")
+
+        rng = self.rng
+        user_names = {
+            pk: read_model.full_name(first_name, last_name)
+            for pk, first_name, last_name in users
+        }
+        status_names = dict(statuses)
+        label_names = dict(labels)
+        status_ids = list(status_names)
+        user_ids = list(user_names)
+        # Порядок популярности случаен, иначе самыми загруженными всегда
+        # были бы первые по id исполнители и метки.
+        executors = rng.sample(user_ids, len(user_ids))
+        executor_weights = zipf_weights(
+            len(executors), options["executor_skew"]
+        )
+        label_ids = rng.sample(list(label_names), len(label_names))
+        label_weights = zipf_weights(len(label_ids), options["label_skew"])
+        max_labels = min(options["max_labels"], len(label_ids))
+
+        # Метки задачи в строке списка идут по имени, как в build_rows().
+        label_order = {
+            pk: position
+            for position, (pk, _) in enumerate(
+                sorted(labels, key=lambda label: (label[1], label[0]))
+            )
+        }
+
+        total = options["tasks"]
+        end = options["end"]
+        step = timedelta(days=options["days"]) / total
+        first_id = (Task.objects.aggregate(Max("pk"))["pk__max"] or 0) + 1
+        ops = connection.ops
+
+        with (
+            counters.collect() as delta,
+            search.deferred_sqlite_index(connection, first_id),
+            connection.cursor() as cursor,
+        ):
+            for offset in range(0, total, options["batch_size"]):
+                size = min(options["batch_size"], total - offset)
+                tasks, links, rows = [], [], []
+                for number in range(offset, offset + size):
+                    task_id = first_id + number
+                    # Задачи идут по времени, как при обычной работе.
+                    created_at = ops.adapt_datetimefield_value(
+                        end - step * (total - number - rng.random())
+                    )
+                    name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} #{task_id}"
+                    status_id = rng.choice(status_ids)
+                    author_id = rng.choice(user_ids)
+                    executor_id = None
+                    if rng.random() >= options["unassigned"]:
+                        executor_id = rng.choices(
+                            executors, cum_weights=executor_weights
+                        )[0]
+                    picked = rng.choices(
+                        label_ids,
+                        cum_weights=label_weights,
+                        k=rng.randint(0, max_labels),
+                    ) if max_labels else []
+                    task_labels = sorted(set(picked), key=label_order.get)
+
+                    tasks.append((
+                        task_id, name, "", status_id, author_id, executor_id,
+                        created_at, created_at,
+                    ))
+                    links.extend(
+                        (task_id, label_id) for label_id in task_labels
+                    )
+                    rows.append((
+                        task_id,
+                        name,
+                        status_id,
+                        status_names[status_id],
+                        author_id,
+                        user_names[author_id],
+                        executor_id,
+                        user_names.get(executor_id, ""),
+                        ops.adapt_json_value(
+                            [[pk, label_names[pk]] for pk in task_labels],
+                            None,
+                        ),
+                        created_at,
+                    ))
+                    delta.add_task(
+                        status_id, author_id, executor_id, task_labels
+                    )
+
+                insert(cursor, Task, TASK_COLUMNS, tasks)
+                insert(cursor, TaskLabel, ["task_id", "label_id"], links)
+                insert(cursor, TaskListRow, ROW_COLUMNS, rows)
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"{offset + size} of {total} tasks.")
+
+            # id задач заданы явно; в PostgreSQL сдвигаем последовательность.
+            for sql in ops.sequence_reset_sql(no_style(), [Task]):
+                cursor.execute(sql)
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from task_manager.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ('labels', '0002_alter_label_options_alter_label_created_at_and_more'),
+        ('statuses', '0001_initial'),
+        ('tasks', '0003_alter_task_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Автоматическая промежуточная таблица tasks_task_labels становится
+        # явной моделью TaskLabel. Схема не меняется, только состояние.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='TaskLabel',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('label', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='labels.label')),
+                        ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tasks.task')),
+                    ],
+                    options={
+                        'db_table': 'tasks_task_labels',
+                        'unique_together': {('task', 'label')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='task',
+                    name='labels',
+                    field=models.ManyToManyField(blank=True, related_name='tasks', through='tasks.TaskLabel', to='labels.label', verbose_name='Labels'),
+                ),
+            ],
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['created_at', 'id'], name='task_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='task_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['executor', 'created_at', 'id'], name='task_executor_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['author', 'created_at', 'id'], name='task_author_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='tasklabel',
+            index=models.Index(fields=['label', 'task'], name='tasklabel_label_task_idx'),
+        ),
+    ]
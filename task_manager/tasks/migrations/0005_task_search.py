@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:40
+
+from django.db import migrations
+
+from task_manager.tasks import search
+
+
+class Migration(migrations.Migration):
+    # GIN-индекс в PostgreSQL строится CONCURRENTLY, вне транзакции.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0004_tasklabel_task_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(search.install, search.uninstall),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:10
+
+from django.db import migrations
+
+from task_manager.tasks import counters
+
+
+def populate_counters(apps, schema_editor):
+    counters.rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0003_task_count'),
+        ('statuses', '0002_task_count'),
+        ('tasks', '0005_task_search'),
+        ('users', '0003_task_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
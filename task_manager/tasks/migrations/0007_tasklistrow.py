@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from task_manager.tasks import read_model
+
+
+def populate_rows(apps, schema_editor):
+    read_model.rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0002_task_count'),
+        ('tasks', '0006_populate_task_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskListRow',
+            fields=[
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='list_row', serialize=False, to='tasks.task')),
+                ('name', models.CharField(max_length=100)),
+                ('status_name', models.CharField(max_length=100)),
+                ('author_name', models.CharField(max_length=301)),
+                ('executor_name', models.CharField(blank=True, max_length=301)),
+                ('labels', models.JSONField(default=list)),
+                ('label_keys', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('author', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('executor', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('status', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='statuses.status')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at', 'task'], name='tasklistrow_created_idx'), models.Index(fields=['status', 'created_at', 'task'], name='tasklistrow_status_idx'), models.Index(fields=['executor', 'created_at', 'task'], name='tasklistrow_executor_idx'), models.Index(fields=['author', 'created_at', 'task'], name='tasklistrow_author_idx')],
+            },
+        ),
+        migrations.RunPython(populate_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+from task_manager.tasks import search
+
+
+class Migration(migrations.Migration):
+    # SQLite пересоздаёт tasks_task и теряет триггеры поиска, а в
+    # PostgreSQL search.install строит индекс CONCURRENTLY.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0007_tasklistrow'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Updated at'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(search.install, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:15
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='tasklistrow',
+            name='label_keys',
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.labels.models import Label
@@ -8,6 +9,36 @@ from task_manager.statuses.models import Status
 User = get_user_model()
 
 
+class TaskQuerySet(models.QuerySet):
+    """Query shapes for the task pages.
+
+    Each method loads exactly what the matching template reads, so the
+    number of queries does not grow with the number of rendered tasks.
+    """
+
+    def for_list(self):
+        return self.select_related("status", "author", "executor").only(
+            "name",
+            "created_at",
+            "status__name",
+            "author__first_name",
+            "author__last_name",
+            "executor__first_name",
+            "executor__last_name",
+        )
+
+    def for_detail(self):
+        return self.select_related(
+            "status", "author", "executor"
+        ).prefetch_related(
+            models.Prefetch("labels", queryset=Label.objects.only("name"))
+        )
+
+    def touch(self):
+        """Bump ``updated_at`` after changes made without ``save()``."""
+        return self.update(updated_at=timezone.now())
+
+
 class Task(models.Model):
     name = models.CharField(
         max_length=100,
@@ -25,6 +56,7 @@ class Task(models.Model):
     )
     labels = models.ManyToManyField(
         Label,
+        through="TaskLabel",
         related_name="tasks",
         blank=True,
         verbose_name=_("Labels"),
@@ -47,10 +79,151 @@ class Task(models.Model):
         auto_now_add=True,
         verbose_name=_("Creation date"),
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Updated at"),
+    )
+
+    objects = TaskQuerySet.as_manager()
+
+    # Поля, от которых зависят счётчики в counters.py.
+    COUNTED_FIELDS = ("status_id", "author_id", "executor_id")
 
     def __str__(self) -> str:
         return self.name
 
+    # Отображаемые поля совпадают с TaskListRow, чтобы строку списка
+    # можно было рендерить из любой из двух моделей.
+    @property
+    def status_name(self):
+        return self.status.name
+
+    @property
+    def author_name(self):
+        return self.author.get_full_name()
+
+    @property
+    def executor_name(self):
+        return self.executor.get_full_name() if self.executor else ""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запоминаем загруженные значения, чтобы при сохранении понять,
+        # какие счётчики менять, без лишнего запроса.
+        instance._loaded_counted = {
+            name: instance.__dict__[name]
+            for name in cls.COUNTED_FIELDS
+            if name in instance.__dict__
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(
+            type(self), instance=self
+        )
+        # Счётчики обновляются в post_save, в той же транзакции.
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _("Task")
         verbose_name_plural = _("Tasks")
+        # Список задач всегда сортируется по (created_at, id), а TaskFilter
+        # и self_tasks фильтруют по одному внешнему ключу. Индекс с этим
+        # ключом в начале отдаёт уже отсортированную страницу.
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="task_created_idx",
+            ),
+            models.Index(
+                fields=["status", "created_at", "id"],
+                name="task_status_created_idx",
+            ),
+            models.Index(
+                fields=["executor", "created_at", "id"],
+                name="task_executor_created_idx",
+            ),
+            models.Index(
+                fields=["author", "created_at", "id"],
+                name="task_author_created_idx",
+            ),
+        ]
+
+
+class TaskLabel(models.Model):
+    task = models.ForeignKey(Task, on_delete=models.CASCADE)
+    label = models.ForeignKey(Label, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = "tasks_task_labels"
+        unique_together = [("task", "label")]
+        # Фильтр по метке идёт от label_id к task_id; уникальный индекс
+        # (task, label) для этого не подходит.
+        indexes = [
+            models.Index(
+                fields=["label", "task"],
+                name="tasklabel_label_task_idx",
+            ),
+        ]
+
+
+class TaskListRow(models.Model):
+    """Flat, join-free copy of a task for the task list.
+
+    Kept in sync by ``read_model.py``; see that module for details.
+    """
+
+    task = models.OneToOneField(
+        Task,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="list_row",
+    )
+    name = models.CharField(max_length=100)
+    status = models.ForeignKey(
+        Status,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    status_name = models.CharField(max_length=100)
+    author = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    author_name = models.CharField(max_length=301)
+    executor = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+        null=True,
+    )
+    executor_name = models.CharField(max_length=301, blank=True)
+    # [[id, name], ...] для отображения; фильтр по метке идёт по TaskLabel.
+    labels = models.JSONField(default=list)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at", "task"],
+                name="tasklistrow_created_idx",
+            ),
+            models.Index(
+                fields=["status", "created_at", "task"],
+                name="tasklistrow_status_idx",
+            ),
+            models.Index(
+                fields=["executor", "created_at", "task"],
+                name="tasklistrow_executor_idx",
+            ),
+            models.Index(
+                fields=["author", "created_at", "task"],
+                name="tasklistrow_author_idx",
+            ),
+        ]
@@ -0,0 +1,167 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def _encode_value(value):
+    # DjangoJSONEncoder обрезает микросекунды, а для keyset-сравнения
+    # нужно точное значение, поэтому сериализуем даты сами.
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset."""
+
+    def __init__(
+        self,
+        object_list,
+        paginator,
+        next_cursor=None,
+        previous_cursor=None,
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Cursor pagination over an ascending, unique ordering.
+
+    Instead of ``OFFSET`` every page seeks past the last seen row with
+    a ``WHERE (f1, f2, ...) > (v1, v2, ...)`` condition, so a deep page
+    costs the same as the first one. The last ordering field must be
+    unique (usually ``pk``) to keep the ordering total.
+    """
+
+    def __init__(self, queryset, per_page, ordering=("created_at", "pk")):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+
+    def encode_cursor(self, obj) -> str:
+        values = [_encode_value(getattr(obj, f)) for f in self.ordering]
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def decode_cursor(self, token: str) -> list:
+        padded = token + "=" * (-len(token) % 4)
+        try:
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeError, ValueError) as exc:
+            raise InvalidCursor(token) from exc
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise InvalidCursor(token)
+        try:
+            return [
+                self._to_python(name, value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except (ValidationError, TypeError, ValueError) as exc:
+            raise InvalidCursor(token) from exc
+
+    def _field(self, name):
+        query = self.queryset.query
+        if name in query.annotations:
+            return query.annotations[name].output_field
+        opts = self.queryset.model._meta
+        return opts.pk if name == "pk" else opts.get_field(name)
+
+    def _to_python(self, name, value):
+        # Курсор приходит от клиента: значение должно подходить полю,
+        # иначе ORM упадёт уже при выполнении запроса.
+        field = self._field(name)
+        if value is None:
+            if not field.null:
+                raise ValueError(f"{name} cannot be null")
+            return None
+        if isinstance(value, (list, dict)):
+            raise TypeError(f"{name} must be a scalar")
+        value = field.to_python(value)
+        if (
+            isinstance(value, datetime)
+            and settings.USE_TZ
+            and timezone.is_naive(value)
+        ):
+            raise ValueError(f"{name} has no time zone")
+        return value
+
+    def _seek(self, values, lookup):
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def _query(self, after, before):
+        """Return the page query, fetching one extra row to detect more."""
+        limit = self.per_page + 1
+        if before:
+            values = self.decode_cursor(before)
+            descending = [f"-{field}" for field in self.ordering]
+            return (
+                self.queryset.filter(self._seek(values, "lt"))
+                .order_by(*descending)[:limit]
+            )
+        queryset = self.queryset
+        if after:
+            values = self.decode_cursor(after)
+            queryset = queryset.filter(self._seek(values, "gt"))
+        return queryset.order_by(*self.ordering)[:limit]
+
+    def _build_page(self, rows, after, before):
+        if before:
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next = True
+        else:
+            has_next = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_previous = bool(after)
+
+        return KeysetPage(
+            rows,
+            self,
+            next_cursor=(
+                self.encode_cursor(rows[-1]) if has_next and rows else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(rows[0]) if has_previous and rows else None
+            ),
+        )
+
+    def page(self, after=None, before=None) -> KeysetPage:
+        rows = list(self._query(after, before))
+        return self._build_page(rows, after, before)
+
+    async def apage(self, after=None, before=None) -> KeysetPage:
+        rows = [obj async for obj in self._query(after, before)]
+        return self._build_page(rows, after, before)
@@ -0,0 +1,193 @@
+"""Materialized task-list rows (``TaskListRow``).
+
+Every task has one flat row with the status name, author and executor
+display names and its labels, so the task list can be filtered, sorted
+and rendered from a single table without joins.
+
+Rows are refreshed synchronously from the signals in ``signals.py``
+whenever a Task, Status, Label or User changes. ``deferred()`` batches
+the refreshes of bulk operations, ``rebuild()`` recreates the table and
+``find_inconsistencies()`` compares it with the source tables.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps as global_apps
+
+CHUNK_SIZE = 2000
+
+ROW_FIELDS = [
+    "name",
+    "status_id",
+    "status_name",
+    "author_id",
+    "author_name",
+    "executor_id",
+    "executor_name",
+    "labels",
+    "created_at",
+]
+
+_dirty_tasks = ContextVar("task_list_dirty_tasks", default=None)
+
+
+def full_name(first_name, last_name):
+    # Так же, как AbstractUser.get_full_name().
+    return f"{first_name} {last_name}".strip()
+
+
+def _task_values(apps, task_ids=None):
+    task = apps.get_model("tasks.Task")
+    queryset = task._default_manager.order_by("pk")
+    if task_ids is not None:
+        queryset = queryset.filter(pk__in=task_ids)
+    return queryset.values(
+        "pk",
+        "name",
+        "created_at",
+        "status_id",
+        "status__name",
+        "author_id",
+        "author__first_name",
+        "author__last_name",
+        "executor_id",
+        "executor__first_name",
+        "executor__last_name",
+    )
+
+
+def build_rows(task_values, apps=global_apps):
+    """Build unsaved TaskListRow objects for the given task value dicts."""
+    row_model = apps.get_model("tasks.TaskListRow")
+    task_label = apps.get_model("tasks.TaskLabel")
+    task_values = list(task_values)
+
+    labels = defaultdict(list)
+    links = (
+        task_label._default_manager
+        .filter(task_id__in=[values["pk"] for values in task_values])
+        .order_by("label__name", "label_id")
+        .values_list("task_id", "label_id", "label__name")
+    )
+    for task_id, label_id, label_name in links:
+        labels[task_id].append([label_id, label_name])
+
+    rows = []
+    for values in task_values:
+        task_labels = labels[values["pk"]]
+        rows.append(row_model(
+            task_id=values["pk"],
+            name=values["name"],
+            status_id=values["status_id"],
+            status_name=values["status__name"],
+            author_id=values["author_id"],
+            author_name=full_name(
+                values["author__first_name"], values["author__last_name"]
+            ),
+            executor_id=values["executor_id"],
+            executor_name=(
+                full_name(
+                    values["executor__first_name"],
+                    values["executor__last_name"],
+                )
+                if values["executor_id"] else ""
+            ),
+            labels=task_labels,
+            created_at=values["created_at"],
+        ))
+    return rows
+
+
+def refresh_rows(task_ids, apps=global_apps):
+    """Upsert the rows of ``task_ids`` and drop rows of deleted tasks."""
+    task_ids = set(task_ids)
+    if not task_ids:
+        return
+    row_model = apps.get_model("tasks.TaskListRow")
+    rows = build_rows(_task_values(apps, task_ids), apps)
+    row_model._default_manager.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["task"],
+        update_fields=ROW_FIELDS,
+    )
+    missing = task_ids - {row.task_id for row in rows}
+    if missing:
+        row_model._default_manager.filter(task_id__in=missing).delete()
+
+
+def mark_dirty(task_ids):
+    """Refresh rows now, or at the end of the active ``deferred()`` block."""
+    pending = _dirty_tasks.get()
+    if pending is None:
+        refresh_rows(task_ids)
+    else:
+        pending.update(task_ids)
+
+
+@contextmanager
+def deferred():
+    """Collect row refreshes made inside the block into one pass."""
+    if _dirty_tasks.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _dirty_tasks.set(pending)
+    try:
+        yield
+    finally:
+        _dirty_tasks.reset(token)
+    for start in range(0, len(pending), CHUNK_SIZE):
+        refresh_rows(sorted(pending)[start:start + CHUNK_SIZE])
+
+
+def _chunks(apps):
+    chunk = []
+    for values in _task_values(apps).iterator(chunk_size=CHUNK_SIZE):
+        chunk.append(values)
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def rebuild(apps=global_apps):
+    """Recreate every row from the source tables. Returns the row count."""
+    row_model = apps.get_model("tasks.TaskListRow")
+    row_model._default_manager.all().delete()
+    total = 0
+    for chunk in _chunks(apps):
+        total += len(row_model._default_manager.bulk_create(
+            build_rows(chunk, apps)
+        ))
+    return total
+
+
+def find_inconsistencies(apps=global_apps):
+    """Return ids of tasks whose row is missing, stale or orphaned."""
+    row_model = apps.get_model("tasks.TaskListRow")
+    broken = set()
+    for chunk in _chunks(apps):
+        expected = build_rows(chunk, apps)
+        ids = [row.task_id for row in expected]
+        stored = {
+            values["task_id"]: values
+            for values in row_model._default_manager
+            .filter(task_id__in=ids)
+            .values("task_id", *ROW_FIELDS)
+        }
+        for row in expected:
+            current = stored.get(row.task_id)
+            if current is None or any(
+                current[field] != getattr(row, field) for field in ROW_FIELDS
+            ):
+                broken.add(row.task_id)
+    task = apps.get_model("tasks.Task")
+    orphans = row_model._default_manager.exclude(
+        task_id__in=task._default_manager.values("pk")
+    )
+    broken.update(orphans.values_list("task_id", flat=True))
+    return sorted(broken)
@@ -0,0 +1,109 @@
+"""Cache of rendered task table rows.
+
+Each row of ``tasks/_task_row.html`` is cached per task and language, and
+a page of rows is read with one ``cache.get_many()``. An entry keeps the
+values the row shows next to its HTML and is used only while they still
+match the task, so a worker whose cache missed a drop, or a request that
+cached a row from a lagging replica, never serves an outdated row. The
+signals in ``signals.py`` and the bulk operations still drop the entries
+of changed tasks, but only to free the cache.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.translation import get_language
+
+from task_manager import cache_utils
+
+ROW_TEMPLATE = "tasks/_task_row.html"
+# Увеличить при изменении шаблона строки, чтобы не отдавать старую разметку.
+VERSION = 3
+CHUNK_SIZE = 2000
+# Поля Task и TaskListRow, которые выводит шаблон строки.
+ROW_FIELDS = (
+    "name", "status_name", "author_name", "executor_name", "created_at",
+)
+
+
+def _key(task_id, language):
+    return f"tasks:row:{task_id}:{language}"
+
+
+def _page_keys(tasks):
+    language = get_language() or settings.LANGUAGE_CODE
+    return [_key(task.pk, language) for task in tasks]
+
+
+def _stamp(task):
+    return tuple(getattr(task, field) for field in ROW_FIELDS)
+
+
+def _render(tasks, keys, cached):
+    """Return the rows and the rendered ones missing from the cache."""
+    rows = []
+    missing = {}
+    for task, key in zip(tasks, keys):
+        stamp = _stamp(task)
+        entry = cached.get(key)
+        if entry is not None and entry[0] == stamp:
+            row = entry[1]
+        else:
+            row = render_to_string(ROW_TEMPLATE, {"task": task})
+            missing[key] = (stamp, row)
+        rows.append(row)
+    return rows, missing
+
+
+def render_rows(tasks):
+    """Render the rows of ``tasks``, reusing cached ones."""
+    keys = _page_keys(tasks)
+    rows, missing = _render(
+        tasks, keys, cache.get_many(keys, version=VERSION)
+    )
+    if missing:
+        cache.set_many(
+            missing, settings.TASK_ROW_CACHE_TIMEOUT, version=VERSION
+        )
+    return "".join(rows)
+
+
+async def arender_each(tasks):
+    """Return the HTML of every row of ``tasks``, reusing cached ones."""
+    keys = _page_keys(tasks)
+    rows, missing = _render(
+        tasks, keys, await cache.aget_many(keys, version=VERSION)
+    )
+    if missing:
+        await cache.aset_many(
+            missing, settings.TASK_ROW_CACHE_TIMEOUT, version=VERSION
+        )
+    return rows
+
+
+async def arender_rows(tasks):
+    """Async version of ``render_rows()``."""
+    return "".join(await arender_each(tasks))
+
+
+def invalidate(task_ids):
+    """Drop the cached rows of ``task_ids`` in every language."""
+    keys = [
+        _key(task_id, language)
+        for task_id in task_ids
+        for language, _ in settings.LANGUAGES
+    ]
+    cache_utils.delete_after_commit(keys, version=VERSION)
+
+
+def invalidate_tasks(queryset):
+    """Drop the cached rows of every task in ``queryset``."""
+    chunk = []
+    for task_id in queryset.values_list("pk", flat=True).iterator(
+        chunk_size=CHUNK_SIZE
+    ):
+        chunk.append(task_id)
+        if len(chunk) == CHUNK_SIZE:
+            invalidate(chunk)
+            chunk = []
+    invalidate(chunk)
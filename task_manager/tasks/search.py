@@ -0,0 +1,191 @@
+"""Full-text search over task name and description.
+
+PostgreSQL keeps a generated ``tsvector`` column with a GIN index on
+``tasks_task``. SQLite keeps an external-content FTS5 table filled by
+triggers. In both cases the database updates the index itself on every
+insert, update and delete, including bulk operations that bypass model
+signals. Other backends fall back to ``icontains``.
+
+Matches are annotated with ``search_rank``, where a lower value means a
+better match, so the list can be keyset-paginated by
+``("search_rank", "pk")``.
+"""
+
+import re
+from contextlib import contextmanager
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+TASK_TABLE = "tasks_task"
+FTS_TABLE = "tasks_task_fts"
+# 'simple' не делает стемминг: задачи пишут и на русском, и на английском.
+TS_CONFIG = "simple"
+SEARCH_INDEX = "task_search_vector_idx"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+POSTGRESQL_INSTALL = [
+    f"""
+    ALTER TABLE {TASK_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    f"""
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS {SEARCH_INDEX}
+    ON {TASK_TABLE} USING gin (search_vector)
+    """,
+]
+
+POSTGRESQL_UNINSTALL = [
+    f"DROP INDEX CONCURRENTLY IF EXISTS {SEARCH_INDEX}",
+    f"ALTER TABLE {TASK_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        content='{TASK_TABLE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TASK_TABLE}
+    BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TASK_TABLE}
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF name, description ON {TASK_TABLE}
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def install(apps, schema_editor):
+    """Create the search column/table and its triggers.
+
+    Safe to run again: SQLite drops the triggers whenever a migration
+    rebuilds ``tasks_task``, so such migrations call this afterwards.
+    """
+    statements = {
+        "postgresql": POSTGRESQL_INSTALL,
+        "sqlite": SQLITE_INSTALL,
+    }.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def uninstall(apps, schema_editor):
+    statements = {
+        "postgresql": POSTGRESQL_UNINSTALL,
+        "sqlite": SQLITE_UNINSTALL,
+    }.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+@contextmanager
+def deferred_sqlite_index(connection, first_id):
+    """Index tasks inserted inside the block with one statement at the end.
+
+    The SQLite insert trigger costs several times the insert itself, so
+    bulk loads of new tasks with ``id >= first_id`` switch it off for the
+    block. Must run inside a transaction; other backends are unaffected.
+    """
+    if connection.vendor != "sqlite":
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai")
+        yield
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+            f"SELECT id, name, description FROM {TASK_TABLE} WHERE id >= %s",
+            [first_id],
+        )
+        cursor.execute(SQLITE_INSTALL[1])
+
+
+def _sqlite_match_query(query):
+    # Каждое слово ищется как префикс; кавычки защищают от синтаксиса FTS5.
+    words = _WORD_RE.findall(query)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_tasks(queryset, query):
+    """Filter ``queryset`` by ``query`` and annotate ``search_rank``."""
+    query = (query or "").strip()
+    if not query:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    table = f'"{TASK_TABLE}"'
+
+    if vendor == "postgresql":
+        tsquery = f"websearch_to_tsquery('{TS_CONFIG}', %s)"
+        return queryset.filter(
+            RawSQL(
+                f"{table}.search_vector @@ {tsquery}",
+                [query],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"-ts_rank_cd({table}.search_vector, {tsquery})",
+                [query],
+                output_field=FloatField(),
+            )
+        )
+
+    if vendor == "sqlite":
+        match = _sqlite_match_query(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(
+            RawSQL(
+                f"{table}.id IN (SELECT rowid FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s)",
+                [match],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            # bm25 отрицателен и меньше для лучших совпадений;
+            # совпадение в названии весит больше, чем в описании.
+            search_rank=RawSQL(
+                f"(SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id)",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+    return queryset.filter(
+        Q(name__icontains=query) | Q(description__icontains=query)
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,230 @@
+"""Signal handlers that keep denormalized task data in sync."""
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from task_manager import autocomplete
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+
+from . import choices, counters, events, read_model, row_cache
+from .models import Task, TaskLabel, TaskListRow
+
+User = get_user_model()
+
+# attname поля задачи -> вид счётчика в counters.TARGETS.
+COUNTED_KINDS = {
+    "status_id": "status",
+    "author_id": "author",
+    "executor_id": "executor",
+}
+
+
+def _label_links(instance, reverse, pk_set=None):
+    """Return existing (task_id, label_id) pairs touched by an m2m call."""
+    if reverse:
+        links = TaskLabel.objects.filter(label_id=instance.pk)
+        if pk_set is not None:
+            links = links.filter(task_id__in=pk_set)
+    else:
+        links = TaskLabel.objects.filter(task_id=instance.pk)
+        if pk_set is not None:
+            links = links.filter(label_id__in=pk_set)
+    return list(links.values_list("task_id", "label_id"))
+
+
+@receiver(pre_save, sender=Task)
+def remember_counted_fields(sender, instance, **kwargs):
+    if instance._state.adding:
+        instance._counted_before = {}
+        return
+    loaded = getattr(instance, "_loaded_counted", {})
+    if len(loaded) < len(Task.COUNTED_FIELDS):
+        loaded = (
+            Task.objects.filter(pk=instance.pk)
+            .values(*Task.COUNTED_FIELDS)
+            .first()
+        ) or {}
+    instance._counted_before = loaded
+
+
+@receiver(post_save, sender=Task)
+def update_counters_on_save(sender, instance, created, update_fields,
+                            **kwargs):
+    before = {} if created else getattr(instance, "_counted_before", {})
+    with counters.collect() as delta:
+        for attname, kind in COUNTED_KINDS.items():
+            if (
+                update_fields is not None
+                and kind not in update_fields
+                and attname not in update_fields
+            ):
+                continue
+            old, new = before.get(attname), getattr(instance, attname)
+            if old != new:
+                delta.add(kind, old, -1)
+                delta.add(kind, new, 1)
+    instance._loaded_counted = {
+        attname: getattr(instance, attname) for attname in COUNTED_KINDS
+    }
+
+
+@receiver(pre_delete, sender=Task)
+def remember_deleted_labels(sender, instance, **kwargs):
+    instance._deleted_label_links = _label_links(instance, reverse=False)
+
+
+@receiver(post_delete, sender=Task)
+def update_counters_on_delete(sender, instance, **kwargs):
+    links = getattr(instance, "_deleted_label_links", [])
+    with counters.collect() as delta:
+        delta.add_task(
+            instance.status_id,
+            instance.author_id,
+            instance.executor_id,
+            label_ids=[label_id for _, label_id in links],
+            sign=-1,
+        )
+
+
+@receiver(m2m_changed, sender=TaskLabel)
+def update_counters_on_label_change(sender, instance, action, reverse,
+                                    pk_set, **kwargs):
+    if action in ("pre_remove", "pre_clear"):
+        instance._removed_label_links = _label_links(
+            instance, reverse, pk_set if action == "pre_remove" else None
+        )
+        return
+    if action == "post_add":
+        links = [
+            (pk, instance.pk) if reverse else (instance.pk, pk)
+            for pk in pk_set
+        ]
+        sign = 1
+    elif action in ("post_remove", "post_clear"):
+        links = getattr(instance, "_removed_label_links", [])
+        sign = -1
+    else:
+        return
+    with counters.collect() as delta:
+        for _, label_id in links:
+            delta.add("label", label_id, sign)
+    task_ids = {task_id for task_id, _ in links}
+    if task_ids:
+        Task.objects.filter(pk__in=task_ids).touch()
+    read_model.mark_dirty(task_ids)
+    row_cache.invalidate(task_ids)
+    events.publish(events.UPDATED, task_ids)
+
+
+@receiver(post_save, sender=Task)
+def refresh_task_list_row(sender, instance, **kwargs):
+    read_model.mark_dirty([instance.pk])
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def drop_cached_task_row(sender, instance, **kwargs):
+    row_cache.invalidate([instance.pk])
+
+
+@receiver(post_save, sender=Task)
+def publish_task_saved(sender, instance, created, **kwargs):
+    kind = events.CREATED if created else events.UPDATED
+    events.publish(kind, [instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def publish_task_deleted(sender, instance, **kwargs):
+    events.publish(events.DELETED, [instance.pk])
+
+
+@receiver(post_save, sender=Status)
+def rename_status_in_task_list(sender, instance, created, **kwargs):
+    if not created:
+        TaskListRow.objects.filter(status_id=instance.pk).update(
+            status_name=instance.name
+        )
+        row_cache.invalidate_tasks(Task.objects.filter(status_id=instance.pk))
+        # Переименование задевает много строк, страницы перезагрузятся.
+        events.publish(events.RELOAD)
+
+
+@receiver(post_save, sender=User)
+def rename_user_in_task_list(sender, instance, created, update_fields,
+                             **kwargs):
+    if created or (
+        update_fields is not None
+        and not {"first_name", "last_name"} & set(update_fields)
+    ):
+        return
+    name = instance.get_full_name()
+    TaskListRow.objects.filter(author_id=instance.pk).update(author_name=name)
+    TaskListRow.objects.filter(executor_id=instance.pk).update(
+        executor_name=name
+    )
+    row_cache.invalidate_tasks(Task.objects.filter(
+        Q(author_id=instance.pk) | Q(executor_id=instance.pk)
+    ))
+    events.publish(events.RELOAD)
+
+
+def _label_task_ids(label):
+    return set(
+        TaskLabel.objects.filter(label_id=label.pk)
+        .values_list("task_id", flat=True)
+    )
+
+
+@receiver(post_save, sender=Label)
+def rename_label_in_task_list(sender, instance, created, **kwargs):
+    if not created:
+        task_ids = _label_task_ids(instance)
+        read_model.mark_dirty(task_ids)
+        row_cache.invalidate(task_ids)
+
+
+@receiver(pre_delete, sender=Label)
+def remember_label_tasks(sender, instance, **kwargs):
+    instance._task_ids = _label_task_ids(instance)
+
+
+@receiver(post_delete, sender=Label)
+def drop_label_from_task_list(sender, instance, **kwargs):
+    task_ids = getattr(instance, "_task_ids", ())
+    if task_ids:
+        Task.objects.filter(pk__in=task_ids).touch()
+    read_model.mark_dirty(task_ids)
+    row_cache.invalidate(task_ids)
+    events.publish(events.UPDATED, task_ids)
+
+
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+def drop_cached_status_choices(sender, **kwargs):
+    choices.invalidate("status")
+
+
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+def drop_cached_label_matches(sender, **kwargs):
+    autocomplete.LABELS.invalidate()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user_matches(sender, update_fields=None, **kwargs):
+    # Вход пользователя сохраняет только last_login, поиск не меняется.
+    if update_fields is not None and not {
+        "username", "first_name", "last_name"
+    } & set(update_fields):
+        return
+    autocomplete.USERS.invalidate()
@@ -0,0 +1,16 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from task_manager.tasks import row_cache
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def task_rows(context, tasks):
+    """Render task table rows through the row cache."""
+    # Асинхронный view отдаёт строки, уже прочитанные из кэша.
+    rendered = context.get("rendered_task_rows")
+    if rendered is not None:
+        return mark_safe(rendered)
+    return mark_safe(row_cache.render_rows(list(tasks)))
@@ -4,6 +4,8 @@ from task_manager.tasks import views
 
 urlpatterns = [
     path('', views.TaskListView.as_view(), name='tasks_index'),
+    path('export/', views.TaskExportView.as_view(), name='task_export'),
+    path('bulk/', views.TaskBulkActionView.as_view(), name='task_bulk'),
     path('create/', views.TaskCreateView.as_view(), name='task_create'),
     path(
         '<int:pk>/update/',
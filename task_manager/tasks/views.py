@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.messages.views import SuccessMessageMixin
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import redirect
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import (
     CreateView,
@@ -10,22 +13,29 @@ from django.views.generic import (
     DetailView,
     ListView,
     UpdateView,
+    View,
 )
 
-from .filters import TaskFilter
-from .forms import TaskForm
-from .models import Task
+from task_manager.conditional import ConditionalGetMixin
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
 
+from . import bulk, export
+from .filters import TaskFilter, TaskListRowFilter
+from .forms import TaskBulkActionForm, TaskForm
+from .models import Task, TaskListRow
+from .pagination import InvalidCursor, KeysetPaginator
 
-class TaskListView(LoginRequiredMixin, ListView):
-    model = Task
-    template_name = 'tasks/index.html'
-    context_object_name = 'tasks'
-    
-    def get_queryset(self):
-        queryset = Task.objects.all()
-        self.filterset = TaskFilter(self.request.GET, queryset=queryset)
+User = get_user_model()
 
+
+class TaskFilterMixin:
+    """TaskFilter plus the self_tasks checkbox, shared by list views."""
+
+    ordering = ('created_at', 'pk')
+
+    def filter_tasks(self, queryset, filterset_class=TaskFilter):
+        self.filterset = filterset_class(self.request.GET, queryset=queryset)
         queryset = self.filterset.qs
 
         if self.request.GET.get('self_tasks'):
@@ -33,13 +43,163 @@ class TaskListView(LoginRequiredMixin, ListView):
 
         return queryset
 
+    def get_ordering(self):
+        # При поиске самые релевантные задачи идут первыми.
+        if self.filterset.search_query:
+            return ('search_rank', 'pk')
+        return self.ordering
+
+
+class TaskListMixin(TaskFilterMixin):
+    """Queries of the task list, shared by the sync and async views."""
+
+    paginate_by = 50
+
+    def use_read_model(self):
+        # Ранжированный поиск работает только по таблице задач.
+        return (
+            settings.TASK_LIST_READ_MODEL
+            and not self.request.GET.get('q', '').strip()
+        )
+
+    def get_validator_querysets(self):
+        # Строки списка и поля фильтра зависят от статусов, меток и
+        # пользователей, поэтому их изменения тоже меняют ETag.
+        return [
+            self.filter_tasks(Task.objects.all()),
+            Status.objects.all(),
+            Label.objects.all(),
+            User.objects.all(),
+        ]
+
+    def get_queryset(self):
+        if self.use_read_model():
+            return self.filter_tasks(
+                TaskListRow.objects.all(), TaskListRowFilter
+            )
+        return self.filter_tasks(Task.objects.for_list())
+
+    def get_page_kwargs(self):
+        return {
+            'after': self.request.GET.get('after'),
+            'before': self.request.GET.get('before'),
+        }
+
+
+class TaskListView(LoginRequiredMixin, TaskListMixin, ConditionalGetMixin,
+                   ListView):
+    model = Task
+    template_name = 'tasks/index.html'
+    context_object_name = 'tasks'
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, self.get_ordering())
+        try:
+            page = paginator.page(**self.get_page_kwargs())
+        except InvalidCursor as exc:
+            raise Http404(_("Invalid cursor")) from exc
+        return paginator, page, page.object_list, page.has_other_pages()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['filter'] = self.filterset
+        context['bulk_form'] = TaskBulkActionForm()
         return context
 
 
-class TaskDetailView(LoginRequiredMixin, DetailView):
+class TaskExportView(LoginRequiredMixin, TaskFilterMixin, View):
+    """Stream the filtered task list as CSV or JSON Lines."""
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in export.FORMATS:
+            raise Http404(_("Unknown export format"))
+        content_type, extension = export.FORMATS[export_format]
+
+        queryset = self.filter_tasks(Task.objects.all())
+        queryset = queryset.order_by(*self.get_ordering())
+
+        response = StreamingHttpResponse(
+            export.STREAMS[export_format](queryset),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="tasks.{extension}"'
+        )
+        return response
+
+
+class TaskBulkActionView(LoginRequiredMixin, TaskFilterMixin, View):
+    """Apply one action to the selected or to all filtered tasks."""
+
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        # Фильтры списка приходят в строке запроса, как и на странице.
+        redirect_to = reverse('tasks_index')
+        if request.GET:
+            redirect_to += '?' + request.GET.urlencode()
+
+        form = TaskBulkActionForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return redirect(redirect_to)
+
+        data = form.cleaned_data
+        queryset = self.filter_tasks(Task.objects.all())
+        if not data['select_all']:
+            queryset = queryset.filter(pk__in=data['task_ids'])
+
+        action = data['action']
+        if (
+            action == form.DELETE
+            and queryset.exclude(author=request.user).exists()
+        ):
+            messages.error(request, _("Only the author can delete an issue."))
+            return redirect(redirect_to)
+
+        count = self.apply(
+            action, list(queryset.values_list('pk', flat=True)), data
+        )
+        if action == form.DELETE:
+            message = _("Tasks deleted: %(count)d")
+        else:
+            message = _("Tasks updated: %(count)d")
+        messages.success(request, message % {'count': count})
+        return redirect(redirect_to)
+
+    def apply(self, action, task_ids, data):
+        form = TaskBulkActionForm
+        if action == form.SET_STATUS:
+            return bulk.set_status(task_ids, data['status'])
+        if action == form.SET_EXECUTOR:
+            return bulk.set_executor(task_ids, data['executor'])
+        if action == form.ADD_LABEL:
+            return bulk.add_label(task_ids, data['label'])
+        if action == form.REMOVE_LABEL:
+            return bulk.remove_label(task_ids, data['label'])
+        return bulk.delete(task_ids)
+
+
+class TaskDetailMixin:
+    """Queries of the task page, shared by the sync and async views."""
+
+    def get_validator_querysets(self):
+        return [
+            Task.objects.filter(pk=self.kwargs['pk']),
+            Status.objects.all(),
+            Label.objects.all(),
+            User.objects.all(),
+        ]
+
+    def get_queryset(self):
+        return Task.objects.for_detail()
+
+
+class TaskDetailView(LoginRequiredMixin, TaskDetailMixin, ConditionalGetMixin,
+                     DetailView):
     model = Task
     template_name = 'tasks/show.html'
     context_object_name = 'task'
@@ -64,6 +224,9 @@ class TaskUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     success_url = reverse_lazy('tasks_index')
     success_message = _("Task successfully updated")
 
+    def get_queryset(self):
+        return Task.objects.for_detail()
+
 
 class TaskDeleteView(LoginRequiredMixin, SuccessMessageMixin,
                      UserPassesTestMixin, DeleteView):
@@ -72,6 +235,15 @@ class TaskDeleteView(LoginRequiredMixin, SuccessMessageMixin,
     success_url = reverse_lazy('tasks_index')
     success_message = _("Task successfully deleted")
 
+    def get_queryset(self):
+        return Task.objects.for_list()
+
+    def get_object(self, queryset=None):
+        # test_func и post оба запрашивают объект, загружаем его один раз.
+        if getattr(self, 'object', None) is None:
+            self.object = super().get_object(queryset)
+        return self.object
+
     def test_func(self):
         task = self.get_object()
         return task.author == self.request.user
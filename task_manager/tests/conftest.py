@@ -0,0 +1,43 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+
+@pytest.fixture
+def author(db, client):
+    """The user the tests act as, logged in on ``client``."""
+    user = User.objects.create_user(
+        username="author", password="pwd", first_name="Ann", last_name="Lee"
+    )
+    client.force_login(user)
+    return user
+
+
+@pytest.fixture
+def status(db):
+    return Status.objects.create(name="Open")
+
+
+@pytest.fixture
+def make_tasks(author, status):
+    """Return a factory of tasks "Task 0", "Task 1"... of ``author``.
+
+    Keyword arguments override the task fields; ``labels`` are set on
+    every task.
+    """
+
+    def make_tasks(count, labels=(), **fields):
+        fields = {"status": status, "author": author, **fields}
+        tasks = []
+        for i in range(count):
+            task = Task.objects.create(name=f"Task {i}", **fields)
+            if labels:
+                task.labels.set(labels)
+            tasks.append(task)
+        return tasks
+
+    return make_tasks
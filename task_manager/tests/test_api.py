@@ -0,0 +1,137 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+
+User = get_user_model()
+
+
+@pytest.fixture
+def make_api_tasks(make_tasks):
+    """Tasks with two labels and a description, as the API embeds them."""
+    labels = [Label.objects.create(name=f"Label {i}") for i in range(2)]
+
+    def make_api_tasks(count, **fields):
+        return make_tasks(
+            count, labels=labels, description="Secret text", **fields
+        )
+    return make_api_tasks
+
+
+@pytest.mark.django_db
+def test_api_requires_login(client):
+    response = client.get(reverse("api_tasks"))
+
+    assert response.status_code == 401
+    assert response.json() == {"error": "Authentication required"}
+
+
+@pytest.mark.django_db
+def test_api_tasks_embed_related_in_constant_queries(
+    client, author, make_api_tasks
+):
+    executor = User.objects.create_user(username="executor", password="pwd")
+    make_api_tasks(2, executor=executor)
+    # Первый запрос кэширует пользователя сессии.
+    client.get(reverse("api_statuses"))
+
+    with CaptureQueriesContext(connection) as ctx:
+        few = client.get(reverse("api_tasks")).json()
+    few_queries = len(ctx.captured_queries)
+    make_api_tasks(10)
+    with CaptureQueriesContext(connection) as ctx:
+        many = client.get(reverse("api_tasks")).json()
+
+    assert len(ctx.captured_queries) == few_queries
+    assert len(few["results"]) == 2
+    assert len(many["results"]) == 12
+    first = few["results"][0]
+    assert first["status"]["name"] == "Open"
+    assert first["author"] == {
+        "id": author.pk, "username": "author", "full_name": "Ann Lee",
+    }
+    assert first["executor"]["username"] == "executor"
+    assert [label["name"] for label in first["labels"]] == [
+        "Label 0", "Label 1",
+    ]
+    assert many["results"][-1]["executor"] is None
+
+
+@pytest.mark.django_db
+def test_api_sparse_fields_select_only_needed_columns(client, make_api_tasks):
+    make_api_tasks(2)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse("api_tasks"), {"fields": "id,name"})
+    task_queries = [
+        q["sql"] for q in ctx.captured_queries
+        if 'FROM "tasks_task"' in q["sql"]
+    ]
+
+    assert response.json()["results"][0].keys() == {"id", "name"}
+    assert len(task_queries) == 1
+    assert "description" not in task_queries[0]
+    assert "statuses_status" not in " ".join(
+        q["sql"] for q in ctx.captured_queries
+    )
+
+
+@pytest.mark.django_db
+def test_api_tasks_filter_and_paginate(client, make_api_tasks):
+    other = User.objects.create_user(username="other", password="pwd")
+    make_api_tasks(3)
+    make_api_tasks(2, author=other)
+
+    response = client.get(
+        reverse("api_tasks"),
+        {"self_tasks": "1", "limit": 2, "fields": "name"},
+    )
+    data = response.json()
+    assert [task["name"] for task in data["results"]] == ["Task 0", "Task 1"]
+    assert data["previous"] is None
+
+    data = client.get(data["next"]).json()
+    assert [task["name"] for task in data["results"]] == ["Task 2"]
+    assert data["next"] is None
+    assert data["previous"]
+
+
+@pytest.mark.django_db
+def test_api_errors(client, author):
+    assert client.get(
+        reverse("api_tasks"), {"fields": "password"}
+    ).status_code == 400
+    assert client.get(
+        reverse("api_tasks"), {"status": "999"}
+    ).status_code == 400
+    assert client.get(
+        reverse("api_tasks"), {"after": "broken"}
+    ).status_code == 400
+    # Курсор правильной длины, но с неподходящими значениями.
+    for cursor in ("WyJ4IiwxXQ", "W251bGwsbnVsbF0"):
+        assert client.get(
+            reverse("api_tasks"), {"after": cursor}
+        ).status_code == 400
+    assert client.get(reverse("api_task", args=[999])).status_code == 404
+
+
+@pytest.mark.django_db
+def test_api_statuses_labels_and_users(client, make_api_tasks):
+    make_api_tasks(1)
+
+    status = client.get(reverse("api_statuses")).json()["results"][0]
+    label = client.get(
+        reverse("api_label", args=[Label.objects.first().pk]),
+        {"fields": "name,task_count"},
+    ).json()
+    user = client.get(reverse("api_users")).json()["results"][0]
+
+    assert status["name"] == "Open"
+    assert status["task_count"] == 1
+    assert label == {"name": "Label 0", "task_count": 1}
+    assert user["full_name"] == "Ann Lee"
+    assert user["authored_task_count"] == 1
+    assert "password" not in user
@@ -0,0 +1,123 @@
+import pytest
+from django.urls import resolve, reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.async_views import TaskListAsyncView
+from task_manager.tasks.models import Task
+
+# Синхронный тестовый клиент выполняет async view в цикле событий, так
+# что любой синхронный запрос к базе упал бы с SynchronousOnlyOperation.
+pytestmark = [pytest.mark.django_db, pytest.mark.urls("task_manager.asgi_urls")]
+
+
+@pytest.fixture
+def tasks(author, status):
+    done = Status.objects.create(name="Done")
+    label = Label.objects.create(name="Bug")
+    first = Task.objects.create(name="First", status=status, author=author)
+    first.labels.add(label)
+    second = Task.objects.create(name="Second", status=done, author=author)
+    return first, second
+
+
+def test_read_only_pages_are_async():
+    assert resolve("/tasks/").func.view_class is TaskListAsyncView
+    assert resolve("/tasks/1/").func.view_class.view_is_async
+    assert resolve("/tasks/create/").func.view_class.__name__ == (
+        "TaskCreateView"
+    )
+
+
+def test_task_list(client, tasks):
+    response = client.get(reverse("tasks_index"))
+
+    content = response.content.decode()
+    assert response.status_code == 200
+    assert "First" in content and "Second" in content
+    assert ">Done</option>" in content
+
+
+def test_task_list_filters(client, tasks):
+    first, second = tasks
+
+    response = client.get(
+        reverse("tasks_index"),
+        {"status": first.status_id, "labels": first.labels.get().pk},
+    )
+
+    content = response.content.decode()
+    assert first.name in content
+    assert second.name not in content
+    assert f'<option value="{first.status_id}" selected>' in content
+
+
+def test_task_list_pages(client, tasks, monkeypatch):
+    monkeypatch.setattr(TaskListAsyncView, "paginate_by", 1)
+
+    response = client.get(reverse("tasks_index"))
+    page = response.context["page_obj"]
+    next_page = client.get(
+        reverse("tasks_index"), {"after": page.next_cursor}
+    )
+
+    assert [task.name for task in page] == ["First"]
+    assert [task.name for task in next_page.context["tasks"]] == ["Second"]
+    assert client.get(
+        reverse("tasks_index"), {"after": "broken"}
+    ).status_code == 404
+
+
+def test_task_list_returns_304(client, tasks):
+    url = reverse("tasks_index")
+    etag = client.get(url)["ETag"]
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    Task.objects.filter(pk=tasks[1].pk).delete()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_task_detail(client, tasks):
+    first, _ = tasks
+
+    response = client.get(reverse("task_show", args=[first.pk]))
+
+    content = response.content.decode()
+    assert response.status_code == 200
+    assert "Bug" in content and "Ann Lee" in content
+    assert client.get(reverse("task_show", args=[0])).status_code == 404
+
+
+def test_messages_are_shown(client, tasks):
+    status = tasks[0].status
+
+    response = client.post(
+        reverse("task_create"),
+        {"name": "Third", "status": status.pk},
+        follow=True,
+    )
+
+    assert response.redirect_chain[-1][0] == reverse("tasks_index")
+    assert "alert-success" in response.content.decode()
+
+
+@pytest.mark.parametrize(
+    "name", ["index", "users_index", "statuses_index", "labels_index"]
+)
+def test_index_pages(client, tasks, name):
+    assert client.get(reverse(name)).status_code == 200
+
+
+@pytest.mark.parametrize(
+    "url", ["/tasks/", "/tasks/1/", "/statuses/", "/labels/"]
+)
+def test_pages_require_login(client, url):
+    response = client.get(url)
+
+    assert response.status_code == 302
+    assert response.url.startswith(reverse("login"))
+
+
+def test_anonymous_pages(client):
+    assert client.get(reverse("index")).status_code == 200
+    assert client.get(reverse("users_index")).status_code == 200
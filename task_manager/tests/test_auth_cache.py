@@ -0,0 +1,108 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.users import backends
+
+User = get_user_model()
+
+
+def _user_queries(queries):
+    return [q["sql"] for q in queries if "users_user" in q["sql"]]
+
+
+def test_pages_skip_the_users_table(client, author):
+    client.force_login(author)
+    client.get(reverse("statuses_index"))
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("statuses_index"))
+
+    assert response.status_code == 200
+    assert _user_queries(queries.captured_queries) == []
+    assert response.wsgi_request.user == author
+
+
+def test_saving_the_user_refreshes_the_cache(client, author):
+    client.force_login(author)
+    client.get(reverse("statuses_index"))
+
+    author.first_name = "Anna"
+    author.save()
+
+    response = client.get(reverse("statuses_index"))
+    assert response.wsgi_request.user.first_name == "Anna"
+
+
+def test_cache_keeps_no_password_hash(client, author):
+    client.get(reverse("statuses_index"))
+    data = cache.get(backends._key(author.pk), version=backends.VERSION)
+
+    assert author.password not in str(data)
+    user = backends.UserBackend().get_user(author.pk)
+    assert user.get_session_auth_hash() == author.get_session_auth_hash()
+    # Остальные поля читаются из базы при обращении.
+    assert user.get_deferred_fields() >= {"password", "is_superuser"}
+    assert user.check_password("pwd")
+    user.set_password("new")
+    assert user.get_session_auth_hash() != author.get_session_auth_hash()
+
+
+def test_sessions_survive_secret_key_rotation(client, author, settings):
+    client.get(reverse("statuses_index"))
+    settings.SECRET_KEY_FALLBACKS = [settings.SECRET_KEY]
+    settings.SECRET_KEY = "rotated-" + settings.SECRET_KEY
+    backends.invalidate(author.pk)
+
+    assert client.get(reverse("statuses_index")).status_code == 200
+
+
+def test_password_change_ends_other_sessions(client, author):
+    client.force_login(author)
+    client.get(reverse("statuses_index"))
+
+    author.set_password("new")
+    author.save()
+
+    response = client.get(reverse("statuses_index"))
+    assert response.status_code == 302
+
+
+def test_inactive_and_deleted_users_are_logged_out(client, author):
+    client.force_login(author)
+    client.get(reverse("statuses_index"))
+
+    User.objects.filter(pk=author.pk).update(is_active=False)
+    author.refresh_from_db()
+    author.save()
+    assert client.get(reverse("statuses_index")).status_code == 302
+
+    client.force_login(User.objects.create_user(username="gone"))
+    User.objects.get(username="gone").delete()
+    assert client.get(reverse("statuses_index")).status_code == 302
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.urls("task_manager.asgi_urls")
+def test_async_pages_skip_the_users_table(author):
+    async def visit():
+        client = AsyncClient()
+        await client.aforce_login(author)
+        await client.get(reverse("statuses_index"))
+        return await client.get(reverse("statuses_index"))
+
+    with CaptureQueriesContext(connection) as queries:
+        response = async_to_sync(visit)()
+
+    assert response.status_code == 200
+    selects = [
+        sql for sql in _user_queries(queries.captured_queries)
+        if sql.startswith("SELECT")
+    ]
+    # Пользователя читает только первая страница.
+    assert len(selects) == 1
@@ -0,0 +1,176 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
+from django.urls import reverse
+
+from task_manager.autocomplete import LABELS, USERS, prefix_lookups
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_users_match_by_prefix_of_any_name(author):
+    bob = User.objects.create_user(
+        username="bsmith", first_name="Bob", last_name="Anderson"
+    )
+    User.objects.create_user(username="carl", first_name="Carl", last_name="X")
+
+    assert USERS.search("AN") == [
+        {"id": author.pk, "text": "Ann Lee"},
+        {"id": bob.pk, "text": "Bob Anderson"},
+    ]
+    assert USERS.search("bsm") == [{"id": bob.pk, "text": "Bob Anderson"}]
+    assert USERS.search("  ") == []
+    assert USERS.search("nn") == []
+
+
+@pytest.mark.django_db
+def test_results_are_limited(monkeypatch):
+    Label.objects.bulk_create(Label(name=f"bug {i:02}") for i in range(30))
+    monkeypatch.setattr(LABELS, "limit", 5)
+
+    results = LABELS.search("bug")
+
+    assert [result["text"] for result in results] == [
+        f"bug {i:02}" for i in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_results_are_cached_until_changes(
+    author, django_assert_num_queries
+):
+    bug = Label.objects.create(name="Bug")
+    LABELS.search("b")
+
+    with django_assert_num_queries(0):
+        assert LABELS.search("B") == [{"id": bug.pk, "text": "Bug"}]
+
+    blocker = Label.objects.create(name="Blocker")
+    assert [r["id"] for r in LABELS.search("b")] == [blocker.pk, bug.pk]
+
+    USERS.search("ann")
+    author.last_login = author.date_joined
+    author.save(update_fields=["last_login"])
+    with django_assert_num_queries(0):
+        USERS.search("ann")
+    author.first_name = "Anna"
+    author.save()
+    assert USERS.search("ann")[0]["text"] == "Anna Lee"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "prefix, expected",
+    [("z", ["zeta"]), ("я", ["яблоко"]), ("яб", ["яблоко"])],
+)
+def test_prefixes_ending_in_the_last_letter(prefix, expected):
+    # В SQLite lower() меняет регистр только у ASCII, поэтому имена
+    # здесь уже в нижнем регистре.
+    Label.objects.bulk_create(
+        Label(name=name) for name in ["zeta", "яблоко", "ёж", "ель", "{x}"]
+    )
+
+    texts = [result["text"] for result in LABELS.search(prefix)]
+
+    assert texts == expected
+
+
+def test_postgresql_prefix_search_does_not_use_a_range():
+    # Под локалью PostgreSQL диапазон ['я', 'ѐ') потерял бы совпадения.
+    assert prefix_lookups("name_lower", "я", "postgresql") == {
+        "name_lower__startswith": "я",
+    }
+    assert prefix_lookups("name_lower", "я", "sqlite") == {
+        "name_lower__startswith": "я",
+        "name_lower__gte": "я",
+        "name_lower__lt": "ѐ",
+    }
+
+
+@pytest.mark.django_db
+def test_search_reads_the_lower_index():
+    queryset = (
+        Label.objects.annotate(name_lower=Lower("name"))
+        .filter(name_lower__gte="b", name_lower__lt="c")
+        .order_by("name_lower", "pk")
+    )
+
+    assert "label_name_lower_idx" in queryset.explain()
+
+
+@pytest.mark.django_db
+def test_endpoints(client, author):
+    Label.objects.create(name="Bug")
+
+    users = client.get(reverse("user_autocomplete"), {"q": "ann"}).json()
+    labels = client.get(reverse("label_autocomplete"), {"q": "bu"}).json()
+
+    assert users == {"results": [{"id": author.pk, "text": "Ann Lee"}]}
+    assert [result["text"] for result in labels["results"]] == ["Bug"]
+
+
+@pytest.mark.django_db
+def test_endpoints_require_login(client):
+    response = client.get(reverse("user_autocomplete"), {"q": "a"})
+
+    assert response.status_code == 302
+
+
+@pytest.mark.django_db
+def test_task_form_renders_only_selected_options(client, author):
+    User.objects.create_user(
+        username="other", first_name="Other", last_name="U"
+    )
+    status = Status.objects.create(name="Open")
+    bug = Label.objects.create(name="Bug")
+    Label.objects.create(name="Feature")
+    task = Task.objects.create(
+        name="Task", status=status, author=author, executor=author
+    )
+    task.labels.add(bug)
+
+    content = client.get(
+        reverse("task_update", args=[task.pk])
+    ).content.decode()
+
+    assert f'<option value="{author.pk}" selected>Ann Lee</option>' in content
+    assert f'<option value="{bug.pk}" selected>Bug</option>' in content
+    assert "Feature" not in content and "Other U" not in content
+    assert f'data-autocomplete-url="{reverse("user_autocomplete")}"' in content
+    assert f'data-autocomplete-url="{reverse("label_autocomplete")}"' in content
+
+
+@pytest.mark.django_db
+def test_task_form_accepts_any_existing_executor(client, author):
+    status = Status.objects.create(name="Open")
+    other = User.objects.create_user(
+        username="other", first_name="Other", last_name="U"
+    )
+
+    client.post(
+        reverse("task_create"),
+        {"name": "Task", "status": status.pk, "executor": other.pk},
+    )
+
+    assert Task.objects.get(name="Task").executor == other
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "urls", ["task_manager.urls", "task_manager.asgi_urls"]
+)
+def test_task_filter_shows_selected_executor(client, author, settings, urls):
+    settings.ROOT_URLCONF = urls
+    status = Status.objects.create(name="Open")
+    Task.objects.create(name="Task", status=status, author=author)
+
+    content = client.get(
+        reverse("tasks_index"), {"executor": author.pk, "labels": "999"}
+    ).content.decode()
+
+    assert f'<option value="{author.pk}" selected>Ann Lee</option>' in content
+    assert 'name="labels"' in content
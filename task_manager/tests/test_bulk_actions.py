@@ -0,0 +1,147 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import bulk, read_model
+from task_manager.tasks.models import Task, TaskLabel
+
+User = get_user_model()
+
+
+@pytest.fixture
+def statuses(status):
+    return status, Status.objects.create(name="Done")
+
+
+def _post(client, data, query=""):
+    url = reverse("task_bulk") + query
+    return client.post(url, data, follow=True)
+
+
+def _messages(response):
+    return [str(m) for m in get_messages(response.wsgi_request)]
+
+
+@pytest.mark.django_db
+def test_bulk_status_change_uses_one_update(client, statuses, make_tasks):
+    open_status, done = statuses
+    tasks = make_tasks(5)
+    selected = [task.pk for task in tasks[:3]]
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = _post(client, {
+            "action": "set_status",
+            "status": done.pk,
+            "task_ids": selected,
+        })
+    updates = [
+        q for q in ctx.captured_queries
+        if q["sql"].startswith('UPDATE "tasks_task"')
+    ]
+
+    assert response.status_code == 200
+    assert len(updates) == 1
+    assert set(
+        Task.objects.filter(status=done).values_list("pk", flat=True)
+    ) == set(selected)
+    open_status.refresh_from_db()
+    done.refresh_from_db()
+    assert (open_status.task_count, done.task_count) == (2, 3)
+    assert read_model.find_inconsistencies() == []
+
+
+@pytest.mark.django_db
+def test_bulk_actions_apply_to_filtered_tasks(
+    client, author, statuses, make_tasks
+):
+    open_status, done = statuses
+    executor = User.objects.create_user(username="executor", password="pwd")
+    label = Label.objects.create(name="Bug")
+    make_tasks(3)
+    done_task = Task.objects.create(name="Done", status=done, author=author)
+    query = f"?status={open_status.pk}"
+
+    _post(client, {"action": "add_label", "label": label.pk,
+                   "select_all": "on"}, query)
+    _post(client, {"action": "set_executor", "executor": executor.pk,
+                   "select_all": "on"}, query)
+
+    label.refresh_from_db()
+    executor.refresh_from_db()
+    assert label.task_count == 3
+    assert executor.executed_task_count == 3
+    assert not done_task.labels.exists()
+
+    response = _post(client, {"action": "remove_label", "label": label.pk,
+                              "task_ids": [done_task.pk]}, query)
+
+    # Задача вне фильтра не затрагивается.
+    assert _messages(response) == ["Изменено задач: 0"]
+    response = _post(client, {"action": "remove_label", "label": label.pk,
+                              "select_all": "on"})
+    assert _messages(response) == ["Изменено задач: 3"]
+    label.refresh_from_db()
+    assert label.task_count == 0
+    assert read_model.find_inconsistencies() == []
+
+
+@pytest.mark.django_db
+def test_bulk_delete_only_own_tasks(client, statuses, make_tasks):
+    open_status, _ = statuses
+    other = User.objects.create_user(username="other", password="pwd")
+    own = make_tasks(2)
+    foreign = Task.objects.create(
+        name="Foreign", status=open_status, author=other
+    )
+
+    response = _post(client, {
+        "action": "delete",
+        "task_ids": [own[0].pk, foreign.pk],
+    })
+
+    assert Task.objects.count() == 3
+    assert any("автор" in message.lower() for message in _messages(response))
+
+    response = _post(client, {"action": "delete", "select_all": "on"},
+                     "?self_tasks=1")
+
+    assert _messages(response) == ["Удалено задач: 2"]
+    assert list(Task.objects.all()) == [foreign]
+    open_status.refresh_from_db()
+    assert open_status.task_count == 1
+    assert read_model.find_inconsistencies() == []
+
+
+@pytest.mark.django_db
+def test_bulk_delete_queries_do_not_grow_with_tasks(author, make_tasks):
+    labels = [Label.objects.create(name=name) for name in ("Bug", "UI")]
+    queries = []
+    for count in (2, 10):
+        task_ids = [task.pk for task in make_tasks(count, labels=labels)]
+        with CaptureQueriesContext(connection) as ctx:
+            assert bulk.delete(task_ids) == count
+        queries.append(len(ctx.captured_queries))
+
+    assert queries[0] == queries[1]
+    assert not Task.objects.exists()
+    assert not TaskLabel.objects.exists()
+    assert read_model.find_inconsistencies() == []
+    author.refresh_from_db()
+    assert author.authored_task_count == 0
+    assert all(
+        label.task_count == 0 for label in Label.objects.all()
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_action_requires_selection(client, author, statuses):
+    response = _post(client, {"action": "set_status",
+                              "status": statuses[1].pk})
+
+    assert response.redirect_chain[-1][0] == reverse("tasks_index")
+    assert _messages(response) == ["Задачи не выбраны"]
@@ -0,0 +1,30 @@
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+
+from task_manager import cache_utils
+
+
+@pytest.mark.django_db
+def test_keys_cached_before_commit_are_deleted_after_it(
+    django_capture_on_commit_callbacks,
+):
+    cache.set("key", "old")
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            cache_utils.delete_after_commit(["key"])
+            assert cache.get("key") is None
+            # Параллельный запрос прочитал данные до коммита.
+            cache.set("key", "old")
+
+    assert cache.get("key") is None
+
+
+@pytest.mark.django_db
+def test_bump_generation_starts_a_new_one():
+    first = cache_utils.generation("things")
+    assert cache_utils.generation("things") == first
+
+    cache_utils.bump_generation("things")
+
+    assert cache_utils.generation("things") != first
@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import choices
+from task_manager.tasks.forms import TaskForm
+from task_manager.tasks.models import Task
+
+CHOICE_TABLES = ("statuses_status", "labels_label", "users_user")
+
+
+def _choice_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    # Списки выбора читаются целиком: без WHERE и без агрегатов.
+    queries = [
+        q["sql"] for q in ctx.captured_queries
+        if any(f'FROM "{table}"' in q["sql"] for table in CHOICE_TABLES)
+        and "WHERE" not in q["sql"]
+        and "MAX(" not in q["sql"]
+    ]
+    return response.content.decode(), queries
+
+
+@pytest.mark.django_db
+def test_filter_choices_are_cached_and_invalidated(client, author):
+    Status.objects.create(name="Open")
+    Label.objects.create(name="Bug")
+    url = reverse("tasks_index")
+
+    _, cold = _choice_queries(client, url)
+    content, warm = _choice_queries(client, url)
+
+    assert len(cold) == 1
+    assert warm == []
+    assert ">Open</option>" in content
+    # Пользователи и метки не перечисляются, их ищет автодополнение.
+    assert ">Ann Lee</option>" not in content
+    assert ">Bug</option>" not in content
+
+    Status.objects.create(name="Done")
+    content, queries = _choice_queries(client, url)
+
+    assert len(queries) == 1
+    assert ">Done</option>" in content
+
+
+@pytest.mark.django_db
+def test_task_form_uses_cached_choices(client, author):
+    status = Status.objects.create(name="Open")
+    bug = Label.objects.create(name="Bug")
+    Label.objects.create(name="Feature")
+    task = Task.objects.create(name="Task", status=status, author=author)
+    task.labels.add(bug)
+
+    client.get(reverse("task_create"))
+    content, queries = _choice_queries(
+        client, reverse("task_update", args=[task.pk])
+    )
+
+    assert queries == []
+    assert f'<option value="{status.pk}" selected>Open</option>' in content
+    assert ">Feature</option>" not in content
+    assert 'name="labels"' in content and "multiple" in content
+
+
+@pytest.mark.django_db
+def test_cached_choices_still_validate(author):
+    status = Status.objects.create(name="Open")
+    form = TaskForm(data={"name": "Task", "status": status.pk})
+    assert form.is_valid()
+
+    status_pk = status.pk
+    status.delete()
+    form = TaskForm(data={"name": "Task", "status": status_pk})
+    assert not form.is_valid()
+
+
+@pytest.mark.django_db
+def test_list_cached_before_commit_is_dropped_after_it(
+    author, monkeypatch, django_capture_on_commit_callbacks
+):
+    Status.objects.create(name="Open")
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            Status.objects.create(name="Done")
+            # Параллельный запрос ещё не видит новый статус и кэширует
+            # старый список уже после сброса из сигнала.
+            with monkeypatch.context() as patch:
+                patch.setitem(
+                    choices.SOURCES,
+                    "status",
+                    lambda: Status.objects.exclude(name="Done"),
+                )
+                stale = choices.get_choices("status")
+
+    assert [label for _, label, _ in stale] == ["Open"]
+    labels = [label for _, label, _ in choices.get_choices("status")]
+    assert labels == ["Open", "Done"]
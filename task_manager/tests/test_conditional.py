@@ -0,0 +1,119 @@
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+
+@pytest.fixture
+def task(make_tasks):
+    return make_tasks(1)[0]
+
+
+def _etag(client, url, **params):
+    response = client.get(url, params)
+    assert response.status_code == 200
+    return response["ETag"]
+
+
+@pytest.mark.django_db
+def test_unchanged_task_list_returns_304_without_rendering(client, task):
+    url = reverse("tasks_index")
+    etag = _etag(client, url)
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert not response.templates
+    assert "Cookie" in response["Vary"]
+
+
+@pytest.mark.django_db
+def test_task_list_etag_varies_by_query_and_user(client, task):
+    url = reverse("tasks_index")
+    etag = _etag(client, url)
+
+    assert _etag(client, url, self_tasks="1") != etag
+    User.objects.create_user(username="other", password="pwd")
+    client.login(username="other", password="pwd")
+    other_etag = _etag(client, url)
+    assert other_etag != etag
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_task_list_etag_follows_changes(client, task, author):
+    url = reverse("tasks_index")
+    etags = [_etag(client, url)]
+
+    task.name = "Renamed"
+    task.save()
+    etags.append(_etag(client, url))
+    task.status.name = "In progress"
+    task.status.save()
+    etags.append(_etag(client, url))
+    task.labels.add(Label.objects.create(name="Bug"))
+    etags.append(_etag(client, url))
+    Task.objects.filter(pk=task.pk).delete()
+    etags.append(_etag(client, url))
+
+    assert len(set(etags)) == len(etags)
+
+
+@pytest.mark.django_db
+def test_task_detail_etag_follows_label_changes(client, task):
+    url = reverse("task_show", args=[task.pk])
+    label = Label.objects.create(name="Bug")
+    task.labels.add(label)
+    etag = _etag(client, url)
+    before = Task.objects.get(pk=task.pk).updated_at
+
+    task.labels.remove(label)
+
+    assert Task.objects.get(pk=task.pk).updated_at > before
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_pending_messages_skip_conditional_response(client, task):
+    url = reverse("statuses_index")
+    etag = _etag(client, url)
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    client.post(reverse("status_create"), {"name": "Done"})
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert "Done" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_task_list_etag_changes_after_login_again(client, task):
+    url = reverse("tasks_index")
+    etag = _etag(client, url)
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # Тот же пользователь с новой сессией должен получить страницу
+    # с актуальным CSRF-токеном, а не 304.
+    client.logout()
+    client.login(username="author", password="pwd")
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_task_list_etag_follows_csrf_cookie(client, task):
+    url = reverse("tasks_index")
+    etag = _etag(client, url)
+
+    del client.cookies[settings.CSRF_COOKIE_NAME]
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert settings.CSRF_COOKIE_NAME in response.cookies
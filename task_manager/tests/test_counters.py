@@ -0,0 +1,125 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+
+def _counts(*objects):
+    for obj in objects:
+        obj.refresh_from_db()
+    return [
+        (obj.authored_task_count, obj.executed_task_count)
+        if isinstance(obj, User) else obj.task_count
+        for obj in objects
+    ]
+
+
+@pytest.fixture
+def executor():
+    return User.objects.create_user(username="executor", password="pwd")
+
+
+@pytest.mark.django_db
+def test_counters_follow_task_lifecycle(author, executor, status):
+    open_status = status
+    done = Status.objects.create(name="Done")
+    bug = Label.objects.create(name="Bug")
+    feature = Label.objects.create(name="Feature")
+
+    task = Task.objects.create(
+        name="Task", status=open_status, author=author, executor=executor
+    )
+    task.labels.set([bug, feature])
+    assert _counts(open_status, done, bug, feature) == [1, 0, 1, 1]
+    assert _counts(author, executor) == [(1, 0), (0, 1)]
+
+    task = Task.objects.get(pk=task.pk)
+    task.status = done
+    task.executor = author
+    task.save()
+    task.labels.remove(feature)
+    assert _counts(open_status, done, bug, feature) == [0, 1, 1, 0]
+    assert _counts(author, executor) == [(1, 1), (0, 0)]
+
+    # Удаление несвязанной метки не должно уводить счётчик в минус.
+    task.labels.remove(feature)
+    feature.tasks.add(task)
+    assert _counts(feature) == [1]
+
+    task.delete()
+    assert _counts(open_status, done, bug, feature) == [0, 0, 0, 0]
+    assert _counts(author, executor) == [(0, 0), (0, 0)]
+
+
+@pytest.mark.django_db
+def test_counters_handle_clear_and_queryset_delete(
+    author, status, make_tasks
+):
+    label = Label.objects.create(name="Bug")
+    make_tasks(3, labels=[label])
+
+    label.tasks.clear()
+    assert _counts(label) == [0]
+
+    Task.objects.all().delete()
+    assert _counts(status, author) == [0, (0, 0)]
+
+
+@pytest.mark.django_db
+def test_saving_stale_instances_keeps_counters(author, status, make_tasks):
+    label = Label.objects.create(name="Bug")
+    make_tasks(1, labels=[label], executor=author)
+
+    # Экземпляры загружены до создания задачи и хранят нули.
+    status.name = "In progress"
+    status.save()
+    label.name = "Defect"
+    label.save()
+    author.first_name = "Anna"
+    author.save()
+
+    assert _counts(status, label, author) == [1, 1, (1, 1)]
+    assert status.name == "In progress"
+    assert author.first_name == "Anna"
+
+
+@pytest.mark.django_db
+def test_rebuild_task_counters_command(author, status, make_tasks):
+    label = Label.objects.create(name="Bug")
+    make_tasks(1, labels=[label], executor=author)
+    Status.objects.update(task_count=10)
+    Label.objects.update(task_count=10)
+    User.objects.update(authored_task_count=10, executed_task_count=10)
+
+    call_command("rebuild_task_counters", verbosity=0)
+
+    assert _counts(status, label, author) == [1, 1, (1, 1)]
+
+
+@pytest.mark.django_db
+def test_index_pages_show_counters(client, make_tasks):
+    label = Label.objects.create(name="Bug")
+    make_tasks(1, labels=[label])
+
+    statuses = client.get(reverse("statuses_index"))
+    assert statuses.context["statuses"][0].task_count == 1
+    labels = client.get(reverse("labels_index"))
+    assert labels.context["labels"][0].task_count == 1
+    users = client.get(reverse("users_index")).content.decode()
+    assert "1 / 0" in users
+
+
+@pytest.mark.django_db
+def test_user_delete_blocked_by_counter(client, author, make_tasks):
+    make_tasks(1)
+
+    response = client.post(reverse("user_delete", args=[author.pk]))
+
+    assert response.status_code == 302
+    assert User.objects.filter(pk=author.pk).exists()
@@ -0,0 +1,61 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+
+from task_manager import db_pool
+
+User = get_user_model()
+
+
+class FakePool:
+    timeout = 5
+
+    def __init__(self):
+        self.opened = []
+
+    def open(self, wait=False, timeout=30):
+        self.opened.append((wait, timeout))
+
+    def get_stats(self):
+        return {"pool_size": 2, "requests_waiting": 0}
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(db_pool, "get_pool", lambda alias: pool)
+    return pool
+
+
+def test_warm_up_waits_for_the_pool(pool):
+    db_pool.warm_up()
+
+    assert pool.opened == [(True, 5)]
+
+
+def test_warm_up_without_pool_opens_a_connection(db, monkeypatch):
+    monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", 60)
+    connection.close()
+
+    db_pool.warm_up()
+
+    assert connection.connection is not None
+
+
+def test_stats_view_is_for_staff(client, db, pool):
+    user = User.objects.create_user(username="user")
+    client.force_login(user)
+    assert client.get(reverse("db_pool_stats")).status_code == 403
+
+    user.is_staff = True
+    user.save()
+    response = client.get(reverse("db_pool_stats"))
+
+    assert response.json() == {
+        "pools": {"default": {"pool_size": 2, "requests_waiting": 0}}
+    }
+
+
+def test_stats_without_pool(db):
+    assert db_pool.stats() == {}
@@ -0,0 +1,135 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import AsyncClient
+from django.urls import reverse
+
+from task_manager import db_router
+from task_manager.statuses.models import Status
+
+User = get_user_model()
+
+# Тесты в транзакции всегда читают основную базу, поэтому transaction=True.
+pytestmark = pytest.mark.django_db(
+    transaction=True, databases=["default", "replica"]
+)
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    # Сессия в подписанной cookie не зависит от содержимого реплики.
+    settings.SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+    db_router.reset_health()
+    yield
+    db_router.reset_health()
+
+
+def _replicate(*objects):
+    for obj in objects:
+        type(obj).objects.using("replica").bulk_create([obj])
+
+
+@pytest.fixture
+def author(author):
+    _replicate(author)
+    return author
+
+
+def _status_names(response):
+    return [status.name for status in response.context["statuses"]]
+
+
+def test_get_reads_the_replica(client, author):
+    Status.objects.create(name="Written")
+    _replicate(Status(name="Replicated"))
+
+    response = client.get(reverse("statuses_index"))
+
+    assert _status_names(response) == ["Replicated"]
+
+
+def test_post_pins_the_browser_to_the_primary(client, author, settings):
+    response = client.post(reverse("status_create"), {"name": "Fresh"})
+
+    cookie = response.cookies[db_router.STICKY_COOKIE]
+    assert cookie["max-age"] == settings.DATABASE_REPLICA_STICKY_SECONDS
+    assert _status_names(client.get(reverse("statuses_index"))) == ["Fresh"]
+    assert not Status.objects.using("replica").exists()
+
+
+def test_lagging_replica_falls_back_to_the_primary(
+    client, author, monkeypatch
+):
+    Status.objects.create(name="Written")
+    monkeypatch.setattr(db_router, "replication_lag", lambda alias: 60)
+
+    response = client.get(reverse("statuses_index"))
+
+    assert _status_names(response) == ["Written"]
+
+
+def test_unreachable_replica_falls_back_to_the_primary(monkeypatch):
+    def fail(alias):
+        raise DatabaseError("replica is down")
+
+    monkeypatch.setattr(db_router, "replication_lag", fail)
+
+    assert db_router.is_healthy("replica") is False
+
+
+def test_health_is_cached(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        db_router, "replication_lag", lambda alias: calls.append(alias) or 0
+    )
+
+    assert db_router.is_healthy("replica")
+    assert db_router.is_healthy("replica")
+    assert calls == ["replica"]
+
+
+def test_objects_read_from_the_replica_are_saved_to_the_primary():
+    status = Status.objects.create(name="Open")
+    _replicate(status)
+    token = db_router._read_from_replica.set(True)
+    try:
+        replica_status = Status.objects.get(pk=status.pk)
+    finally:
+        db_router._read_from_replica.reset(token)
+    assert replica_status._state.db == "replica"
+
+    replica_status.name = "Closed"
+    replica_status.save()
+
+    assert Status.objects.get(pk=status.pk).name == "Closed"
+    assert Status.objects.using("replica").get(pk=status.pk).name == "Open"
+
+
+def test_caches_are_filled_from_the_primary(client, author):
+    Status.objects.create(name="Written")
+    User.objects.create_user(
+        username="newcomer", first_name="Nina", last_name="Orlova"
+    )
+
+    content = client.get(reverse("tasks_index")).content.decode()
+    response = client.get(reverse("user_autocomplete"), {"q": "newc"})
+
+    # Страница читает реплику, но кэшируемые списки — основную базу.
+    assert ">Written</option>" in content
+    assert [r["text"] for r in response.json()["results"]] == ["Nina Orlova"]
+
+
+@pytest.mark.urls("task_manager.asgi_urls")
+def test_async_views_read_the_replica(author):
+    _replicate(Status(name="Replicated"))
+
+    async def visit():
+        client = AsyncClient()
+        await client.aforce_login(author)
+        return await client.get(reverse("statuses_index"))
+
+    response = async_to_sync(visit)()
+
+    assert "Replicated" in response.content.decode()
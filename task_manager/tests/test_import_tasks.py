@@ -0,0 +1,122 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import read_model
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+
+@pytest.fixture
+def lookups():
+    author = User.objects.create_user(
+        username="author", password="pwd", first_name="Ann", last_name="Lee"
+    )
+    executor = User.objects.create_user(username="executor", password="pwd")
+    return {
+        "author": author,
+        "executor": executor,
+        "status": Status.objects.create(name="Open"),
+        "bug": Label.objects.create(name="Bug"),
+        "urgent": Label.objects.create(name="Urgent"),
+    }
+
+
+@pytest.mark.django_db
+def test_import_csv_in_batches(tmp_path, capsys, lookups):
+    path = tmp_path / "tasks.csv"
+    path.write_text(
+        "name,description,status,executor,labels\n"
+        "First,Text,Open,executor,\"Bug, Urgent\"\n"
+        "Second,,Open,,\n"
+        "Third,,Open,Ann Lee,Bug\n"
+        "Broken,,Missing,,\n",
+        encoding="utf-8",
+    )
+
+    call_command("import_tasks", str(path), author="author", batch_size=2)
+
+    out, err = capsys.readouterr()
+    assert "Imported 3 tasks" in out
+    assert "rows/sec" in out
+    assert "Row 4 skipped: unknown status 'Missing'" in err
+    first = Task.objects.get(name="First")
+    assert first.executor == lookups["executor"]
+    assert first.author == lookups["author"]
+    assert set(first.labels.values_list("name", flat=True)) == {
+        "Bug", "Urgent",
+    }
+    assert Task.objects.get(name="Third").executor == lookups["author"]
+
+    # Счётчики и строки списка обновлены без сигналов.
+    lookups["status"].refresh_from_db()
+    lookups["bug"].refresh_from_db()
+    assert lookups["status"].task_count == 3
+    assert lookups["bug"].task_count == 2
+    assert read_model.find_inconsistencies() == []
+
+
+@pytest.mark.django_db
+def test_import_jsonl_dry_run_writes_nothing(tmp_path, capsys, lookups):
+    path = tmp_path / "tasks.jsonl"
+    path.write_text(
+        json.dumps({
+            "name": "Task", "status": "Open", "author": "author",
+            "labels": ["Bug"],
+        }) + "\n",
+        encoding="utf-8",
+    )
+
+    call_command("import_tasks", str(path), dry_run=True)
+
+    assert "Validated 1 tasks" in capsys.readouterr().out
+    assert not Task.objects.exists()
+    lookups["bug"].refresh_from_db()
+    assert lookups["bug"].task_count == 0
+
+
+@pytest.mark.django_db
+def test_import_requires_known_author(tmp_path, lookups):
+    path = tmp_path / "tasks.csv"
+    path.write_text("name,status\nTask,Open\n", encoding="utf-8")
+
+    with pytest.raises(CommandError):
+        call_command("import_tasks", str(path), author="nobody")
+
+
+@pytest.mark.django_db
+def test_import_skips_rows_with_wrong_types(tmp_path, capsys, lookups):
+    path = tmp_path / "tasks.jsonl"
+    records = [
+        {"name": 1, "status": "Open"},
+        {"name": "Task", "status": ["Open"]},
+        {"name": "Task", "status": "Open", "executor": {"id": 1}},
+        {"name": "Task", "status": "Open", "description": 5},
+        {"name": "Task", "status": "Open", "labels": "Bug"},
+        {"name": "Task", "status": "Open", "labels": [1]},
+        {"name": "Valid", "status": "Open", "labels": ["Bug"]},
+    ]
+    path.write_text(
+        "".join(json.dumps(record) + "\n" for record in records),
+        encoding="utf-8",
+    )
+
+    call_command("import_tasks", str(path), author="author")
+
+    out, err = capsys.readouterr()
+    assert "Imported 1 tasks" in out
+    assert "skipped 6" in out
+    assert "Row 1 skipped: name is not a string" in err
+    assert "Row 5 skipped: labels is not a list of names" in err
+    assert list(Task.objects.values_list("name", flat=True)) == ["Valid"]
+
+
+@pytest.mark.django_db
+def test_import_missing_file_is_a_command_error(tmp_path, lookups):
+    with pytest.raises(CommandError, match="Cannot open"):
+        call_command("import_tasks", str(tmp_path / "missing.csv"))
@@ -0,0 +1,187 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import AsyncClient
+from django.urls import reverse
+
+from task_manager import metrics
+from task_manager.statuses.models import Status
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    metrics.registry.reset()
+    yield metrics.registry
+    metrics.registry.reset()
+
+
+@pytest.fixture
+def staff(client, db):
+    user = User.objects.create_user(username="staff", is_staff=True)
+    client.force_login(user)
+    return user
+
+
+def test_server_timing_header(client, staff):
+    Status.objects.create(name="Open")
+
+    response = client.get(reverse("statuses_index"))
+
+    parts = response["Server-Timing"].split(", ")
+    assert parts[0].startswith("total;dur=")
+    assert parts[1].startswith("db;dur=")
+    assert parts[1].endswith('queries"')
+    assert parts[2].startswith("template;dur=")
+    assert float(parts[2].split("=")[1]) > 0
+
+
+def test_requests_are_aggregated_by_view(client, staff, registry):
+    client.get(reverse("statuses_index"))
+    client.get(reverse("statuses_index"))
+    client.get("/missing/")
+
+    snapshot = registry.snapshot()
+    requests = snapshot["histograms"]["request_duration_seconds"]
+    assert requests["statuses_index"]["count"] == 2
+    assert requests[metrics.UNMATCHED_VIEW]["count"] == 1
+    assert snapshot["counters"]["db_queries_total"]["statuses_index"] >= 2
+
+
+def test_server_timing_is_only_for_staff_by_default(client, db, settings):
+    assert settings.SERVER_TIMING is False
+    client.force_login(User.objects.create_user(username="member"))
+
+    response = client.get(reverse("statuses_index"))
+
+    assert "Server-Timing" not in response
+    assert metrics.registry.snapshot()["histograms"][
+        "request_duration_seconds"
+    ]["statuses_index"]["count"] == 1
+
+    settings.SERVER_TIMING = True
+    assert "Server-Timing" in client.get(reverse("statuses_index"))
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.urls("task_manager.asgi_urls")
+def test_async_server_timing_for_staff():
+    staff = User.objects.create_user(username="staff", is_staff=True)
+    member = User.objects.create_user(username="member")
+
+    async def visit(user):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        return await client.get(reverse("statuses_index"))
+
+    assert "Server-Timing" in async_to_sync(visit)(staff)
+    assert "Server-Timing" not in async_to_sync(visit)(member)
+
+
+def test_async_requests_are_timed(rf, registry, settings):
+    settings.SERVER_TIMING = True
+
+    async def get_response(request):
+        return HttpResponse("ok")
+
+    middleware = metrics.timing_middleware(get_response)
+    response = async_to_sync(middleware)(rf.get("/"))
+
+    assert response["Server-Timing"].startswith("total;dur=")
+    histograms = registry.snapshot()["histograms"]
+    assert histograms["request_duration_seconds"][metrics.UNMATCHED_VIEW][
+        "count"
+    ] == 1
+
+
+def test_metrics_need_staff_or_token(client, db, settings):
+    url = reverse("metrics")
+    assert client.get(url).status_code == 403
+
+    settings.METRICS_TOKEN = "secret"
+    assert client.get(
+        url, headers={"Authorization": "Bearer wrong"}
+    ).status_code == 403
+    response = client.get(url, headers={"Authorization": "Bearer secret"})
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+
+
+def test_metrics_in_prometheus_format(client, staff):
+    client.get(reverse("statuses_index"))
+
+    body = client.get(reverse("metrics")).content.decode()
+
+    assert "# TYPE task_manager_request_duration_seconds histogram" in body
+    assert (
+        'task_manager_request_duration_seconds_bucket'
+        '{view="statuses_index",le="+Inf"} 1'
+    ) in body
+    assert (
+        'task_manager_request_duration_seconds_count{view="statuses_index"} 1'
+    ) in body
+    assert 'task_manager_db_queries_total{view="statuses_index"}' in body
+
+
+def test_metrics_add_up_worker_snapshots(tmp_path, settings, registry):
+    settings.METRICS_DIR = str(tmp_path)
+    other = {
+        "histograms": {
+            "request_duration_seconds": {
+                "index": {
+                    "buckets": [2] + [0] * (len(metrics.BUCKETS) - 1),
+                    "sum": 0.004,
+                    "count": 2,
+                },
+            },
+        },
+        "counters": {"db_queries_total": {"index": 3}},
+    }
+    (tmp_path / f"{os.getppid()}.json").write_text(json.dumps(other))
+    registry.observe("request_duration_seconds", "index", 0.2)
+    registry.increment("db_queries_total", "index", 4)
+
+    total = metrics.collect()
+
+    histogram = total["histograms"]["request_duration_seconds"]["index"]
+    assert histogram["count"] == 3
+    assert histogram["buckets"][0] == 2
+    assert histogram["buckets"][metrics.BUCKETS.index(0.25)] == 1
+    assert total["counters"]["db_queries_total"]["index"] == 7
+    # Снимок этого процесса записан для соседних воркеров.
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_snapshots_of_exited_workers_are_removed(
+    tmp_path, settings, registry
+):
+    settings.METRICS_DIR = str(tmp_path)
+    worker = subprocess.Popen([sys.executable, "-c", ""])
+    worker.wait()
+    stale = tmp_path / f"{worker.pid}.json"
+    stale.write_text(json.dumps({
+        "histograms": {}, "counters": {"db_queries_total": {"index": 5}},
+    }))
+
+    total = metrics.collect()
+
+    assert "index" not in total["counters"].get("db_queries_total", {})
+    assert not stale.exists()
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+
+
+def test_label_values_are_escaped():
+    text = metrics.render({
+        "histograms": {},
+        "counters": {"db_queries_total": {'a"b\\c': 1}},
+    })
+
+    assert 'task_manager_db_queries_total{view="a\\"b\\\\c"} 1' in text
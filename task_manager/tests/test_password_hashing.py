@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import aauthenticate, get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import AsyncClient
+from django.urls import reverse
+
+from task_manager.users import hashers
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashes(settings):
+    # Стоимость по умолчанию делает каждый вход заметно медленным.
+    settings.PASSWORD_SCRYPT_WORK_FACTOR = 2**10
+    settings.PASSWORD_SCRYPT_PARALLELISM = 1
+    settings.PASSWORD_PBKDF2_ITERATIONS = 1000
+
+
+@pytest.fixture
+def legacy_user(db):
+    return User.objects.create(
+        username="legacy",
+        first_name="Old",
+        last_name="Hash",
+        password=make_password("pwd", hasher="pbkdf2_sha256"),
+    )
+
+
+def test_new_passwords_use_the_configured_hasher(settings):
+    assert settings.PASSWORD_HASHERS[0].endswith("ScryptPasswordHasher")
+    assert make_password("pwd").startswith("scrypt$1024$")
+
+
+def test_scrypt_memory_limit_follows_the_cost(settings):
+    # 2**15 уже не помещается в 32 МиБ, которые OpenSSL даёт по умолчанию.
+    settings.PASSWORD_SCRYPT_WORK_FACTOR = 2**15
+    encoded = make_password("pwd")
+
+    assert encoded.startswith("scrypt$32768$")
+    assert hashers.ScryptPasswordHasher().verify("pwd", encoded)
+
+
+def test_pbkdf2_cost_comes_from_settings():
+    assert make_password("pwd", hasher="pbkdf2_sha256").startswith(
+        "pbkdf2_sha256$1000$"
+    )
+
+
+def test_login_upgrades_an_old_hash(client, legacy_user):
+    response = client.post(
+        reverse("login"), {"username": "legacy", "password": "pwd"}
+    )
+
+    assert response.status_code == 302
+    legacy_user.refresh_from_db()
+    assert legacy_user.password.startswith("scrypt$1024$")
+    assert legacy_user.check_password("pwd")
+
+
+def test_login_upgrades_the_cost(client, settings, legacy_user):
+    client.post(reverse("login"), {"username": "legacy", "password": "pwd"})
+    settings.PASSWORD_SCRYPT_WORK_FACTOR = 2**11
+
+    client.post(reverse("login"), {"username": "legacy", "password": "pwd"})
+
+    legacy_user.refresh_from_db()
+    assert legacy_user.password.startswith("scrypt$2048$")
+
+
+def test_executor_is_bounded(settings):
+    settings.PASSWORD_HASHING_WORKERS = 3
+
+    assert hashers.get_executor()._max_workers == 3
+
+
+def test_async_authentication_hashes_in_the_pool(legacy_user, monkeypatch):
+    threads = []
+    verify_password = hashers.hashers.verify_password
+
+    def recording_verify(*args):
+        threads.append(threading.current_thread().name)
+        return verify_password(*args)
+
+    monkeypatch.setattr(hashers.hashers, "verify_password", recording_verify)
+
+    user = async_to_sync(aauthenticate)(username="legacy", password="pwd")
+    wrong = async_to_sync(aauthenticate)(username="legacy", password="bad")
+
+    assert user == legacy_user and wrong is None
+    assert threads and all(
+        name.startswith("password-hashing") for name in threads
+    )
+    legacy_user.refresh_from_db()
+    assert legacy_user.password.startswith("scrypt$")
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.urls("task_manager.asgi_urls")
+def test_async_login_view(legacy_user):
+    async def log_in(password):
+        client = AsyncClient()
+        response = await client.post(
+            reverse("login"), {"username": "legacy", "password": password}
+        )
+        return client, response
+
+    client, response = async_to_sync(log_in)("pwd")
+    _, failed = async_to_sync(log_in)("bad")
+
+    assert response.status_code == 302
+    assert response.url == reverse("index")
+    assert client.session["_auth_user_id"] == str(legacy_user.pk)
+    assert failed.status_code == 200
+    assert "text-danger" in failed.content.decode()
+    legacy_user.refresh_from_db()
+    assert legacy_user.password.startswith("scrypt$")
+
+
+@pytest.mark.urls("task_manager.asgi_urls")
+def test_async_login_page(client, db):
+    response = client.get(reverse("login"))
+
+    assert response.status_code == 200
+    assert 'name="password"' in response.content.decode()
+    assert "no-cache" in response["Cache-Control"]
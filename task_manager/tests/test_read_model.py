@@ -0,0 +1,103 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.tasks import read_model
+from task_manager.tasks.filters import TaskListRowFilter
+from task_manager.tasks.models import Task, TaskListRow
+
+
+@pytest.mark.django_db
+def test_rows_follow_source_changes(author, status):
+    bug = Label.objects.create(name="Bug")
+    task = Task.objects.create(
+        name="Task", status=status, author=author, executor=author
+    )
+    task.labels.add(bug)
+
+    row = TaskListRow.objects.get(pk=task.pk)
+    assert (row.status_name, row.author_name, row.executor_name) == (
+        "Open", "Ann Lee", "Ann Lee",
+    )
+    assert row.labels == [[bug.pk, "Bug"]]
+
+    status.name = "In progress"
+    status.save()
+    author.first_name = "Anna"
+    author.save()
+    bug.name = "Defect"
+    bug.save()
+    task.name = "Renamed"
+    task.executor = None
+    task.save()
+
+    row.refresh_from_db()
+    assert row.name == "Renamed"
+    assert row.status_name == "In progress"
+    assert row.author_name == "Anna Lee"
+    assert row.executor_name == ""
+    assert row.labels == [[bug.pk, "Defect"]]
+
+    task.labels.clear()
+    row.refresh_from_db()
+    assert row.labels == []
+    assert read_model.find_inconsistencies() == []
+
+    task.delete()
+    assert not TaskListRow.objects.exists()
+
+
+@pytest.mark.django_db
+def test_task_list_served_from_read_model(client, settings, author, status):
+    settings.TASK_LIST_READ_MODEL = True
+    bug = Label.objects.create(name="Bug")
+    tagged = Task.objects.create(name="Tagged", status=status, author=author)
+    tagged.labels.add(bug)
+    Task.objects.create(name="Plain", status=status, author=author)
+    client.login(username="author", password="pwd")
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse("tasks_index"), {"labels": bug.pk})
+
+    assert [row.name for row in response.context["tasks"]] == ["Tagged"]
+    assert "Ann Lee" in response.content.decode()
+    row_queries = [
+        q["sql"] for q in ctx.captured_queries
+        if "tasks_tasklistrow" in q["sql"]
+    ]
+    assert row_queries
+    assert all("JOIN" not in sql for sql in row_queries)
+
+    response = client.get(reverse("tasks_index"), {"q": "plain"})
+    assert [task.name for task in response.context["tasks"]] == ["Plain"]
+
+
+@pytest.mark.django_db
+def test_label_filter_uses_the_task_label_index():
+    label = Label.objects.create(name="Bug")
+    queryset = TaskListRowFilter(
+        {"labels": label.pk}, queryset=TaskListRow.objects.all()
+    ).qs
+
+    plan = queryset.explain()
+
+    assert "tasklabel_label_task_idx" in plan
+    assert "LIKE" not in str(queryset.query)
+
+
+@pytest.mark.django_db
+def test_check_and_rebuild_commands(author, status):
+    task = Task.objects.create(name="Task", status=status, author=author)
+    TaskListRow.objects.filter(pk=task.pk).update(name="Stale")
+
+    with pytest.raises(CommandError):
+        call_command("check_task_list_rows", verbosity=0)
+    call_command("check_task_list_rows", fix=True, verbosity=0)
+    assert TaskListRow.objects.get(pk=task.pk).name == "Task"
+
+    TaskListRow.objects.all().delete()
+    call_command("rebuild_task_list_rows", verbosity=0)
+    assert read_model.find_inconsistencies() == []
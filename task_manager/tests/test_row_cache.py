@@ -0,0 +1,109 @@
+import pytest
+from django.urls import reverse
+from django.utils import translation
+
+from task_manager.statuses.models import Status
+from task_manager.tasks import bulk, row_cache
+from task_manager.tasks.models import Task
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Collect ids of tasks whose rows were rendered, not read from cache."""
+    task_ids = []
+    render = row_cache.render_to_string
+
+    def counting_render(template_name, context):
+        task_ids.append(context["task"].pk)
+        return render(template_name, context)
+
+    monkeypatch.setattr(row_cache, "render_to_string", counting_render)
+    return task_ids
+
+
+def _page(client):
+    response = client.get(reverse("tasks_index"))
+    assert response.status_code == 200
+    return response.content.decode()
+
+
+@pytest.mark.django_db
+def test_rows_are_rendered_once(client, rendered, make_tasks):
+    tasks = make_tasks(3)
+
+    _page(client)
+    content = _page(client)
+
+    assert sorted(rendered) == [task.pk for task in tasks]
+    assert all(task.name in content for task in tasks)
+
+
+@pytest.mark.django_db
+def test_changes_invalidate_only_affected_rows(
+    client, author, rendered, make_tasks
+):
+    first, second, third = make_tasks(3)
+    done = Status.objects.create(name="Done")
+    _page(client)
+    rendered.clear()
+
+    first.name = "Renamed"
+    first.save()
+    bulk.set_status([second.pk], done)
+    content = _page(client)
+
+    assert sorted(rendered) == [first.pk, second.pk]
+    assert "Renamed" in content
+    assert "Done" in content
+
+    rendered.clear()
+    author.first_name = "Anna"
+    author.save()
+    content = _page(client)
+
+    assert sorted(rendered) == [first.pk, second.pk, third.pk]
+    assert "Anna Lee" in content
+
+
+@pytest.mark.django_db
+def test_rows_changed_without_invalidation_are_rendered_again(
+    client, rendered, make_tasks
+):
+    first, second = make_tasks(2)
+    _page(client)
+    rendered.clear()
+
+    # update() не вызывает сигналы: закэшированная строка не удалена,
+    # но её значения уже не совпадают с задачей.
+    Task.objects.filter(pk=first.pk).update(name="Renamed")
+    content = _page(client)
+
+    assert rendered == [first.pk]
+    assert "Renamed" in content
+
+
+@pytest.mark.django_db
+def test_status_rename_and_delete_refresh_rows(client, make_tasks):
+    task, other = make_tasks(2)
+    _page(client)
+
+    task.status.name = "In progress"
+    task.status.save()
+    other.delete()
+    content = _page(client)
+
+    assert "In progress" in content
+    assert other.name not in content
+
+
+@pytest.mark.django_db
+def test_rows_are_cached_per_language(make_tasks):
+    task = make_tasks(1)[0]
+
+    with translation.override("ru"):
+        russian = row_cache.render_rows([task])
+    with translation.override("en"):
+        english = row_cache.render_rows([task])
+
+    assert "Изменить" in russian
+    assert "Update" in english
@@ -0,0 +1,138 @@
+from collections import Counter
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import transaction
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import read_model
+from task_manager.tasks.models import Task, TaskLabel
+from task_manager.tasks.search import search_tasks
+
+User = get_user_model()
+
+END = "2026-01-01T00:00:00+00:00"
+
+
+def seed(**options):
+    call_command("seed", **{
+        "users": 20,
+        "statuses": 3,
+        "labels": 5,
+        "tasks": 300,
+        "batch_size": 70,
+        "end": END,
+        **options,
+    })
+
+
+def snapshot():
+    return [
+        (
+            task.name,
+            task.status.name,
+            task.author.username,
+            task.executor.username if task.executor else None,
+            sorted(label.name for label in task.labels.all()),
+            task.created_at,
+        )
+        for task in Task.objects.select_related(
+            "status", "author", "executor"
+        ).prefetch_related("labels").order_by("pk")
+    ]
+
+
+@pytest.mark.django_db
+def test_seed_creates_consistent_data(capsys):
+    seed()
+
+    assert "300 tasks" in capsys.readouterr().out
+    assert User.objects.count() == 20
+    assert Status.objects.count() == 3
+    assert Label.objects.count() == 5
+    assert Task.objects.count() == 300
+    # Счётчики и строки списка записаны без сигналов.
+    for status in Status.objects.all():
+        assert status.task_count == status.tasks.count()
+    for label in Label.objects.all():
+        assert label.task_count == label.tasks.count()
+    for user in User.objects.all():
+        assert user.executed_task_count == user.executed_tasks.count()
+    assert read_model.find_inconsistencies() == []
+
+    # created_at растёт вместе с id и не позже --end.
+    dates = list(Task.objects.order_by("pk").values_list(
+        "created_at", flat=True
+    ))
+    assert dates == sorted(dates)
+    assert dates[-1].isoformat() <= END
+
+
+@pytest.mark.django_db
+def test_seeded_tasks_are_searchable():
+    seed()
+    task = Task.objects.order_by("pk").first()
+    word = task.name.split()[0]
+
+    assert search_tasks(Task.objects.all(), word).filter(pk=task.pk).exists()
+    # Триггер полнотекстового индекса восстановлен.
+    created = Task.objects.create(
+        name="unmistakable",
+        status=task.status,
+        author=task.author,
+    )
+    found = search_tasks(Task.objects.all(), "unmistakable")
+    assert list(found.values_list("pk", flat=True)) == [created.pk]
+
+
+@pytest.mark.django_db
+def test_seed_is_reproducible():
+    snapshots = []
+    for _ in range(2):
+        with transaction.atomic():
+            seed(seed=7)
+            snapshots.append(snapshot())
+            transaction.set_rollback(True)
+
+    assert snapshots[0] == snapshots[1]
+    with transaction.atomic():
+        seed(seed=8)
+        assert snapshot() != snapshots[0]
+
+
+@pytest.mark.django_db
+def test_seed_distribution_options():
+    seed(executor_skew=2, unassigned=0, max_labels=0)
+
+    executors = Counter(Task.objects.values_list("executor_id", flat=True))
+    assert None not in executors
+    # При показателе 2 самый загруженный исполнитель получает больше
+    # половины задач.
+    assert executors.most_common(1)[0][1] > 150
+    assert not TaskLabel.objects.exists()
+
+
+@pytest.mark.django_db
+def test_seed_continues_names_after_deletions_and_other_rows():
+    Status.objects.create(name="Open")
+    User.objects.create_user(username="admin")
+    seed(tasks=0)
+    User.objects.get(username="seed_user_3").delete()
+    Label.objects.get(name="seed label 0").delete()
+
+    seed(tasks=0)
+
+    assert User.objects.filter(username="seed_user_39").exists()
+    assert Label.objects.filter(name="seed label 9").exists()
+    assert Status.objects.filter(name="seed status 5").exists()
+    assert User.objects.count() == 40
+    assert Label.objects.count() == 9
+
+
+@pytest.mark.django_db
+def test_seed_needs_statuses_and_users():
+    with pytest.raises(CommandError):
+        call_command("seed", users=0, statuses=0, labels=0, tasks=5)
+    assert not Task.objects.exists()
@@ -0,0 +1,48 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager import settings as project_settings
+
+User = get_user_model()
+
+
+@pytest.fixture(params=["cached_db", "signed_cookies"])
+def storage(request, settings):
+    settings.SESSION_ENGINE = project_settings._SESSION_ENGINES[request.param]
+    settings.MESSAGE_STORAGE = (
+        "django.contrib.messages.storage.cookie.CookieStorage"
+    )
+    return request.param
+
+
+def _session_queries(queries):
+    return [q["sql"] for q in queries if "django_session" in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_visit_without_session_queries(client, storage):
+    User.objects.create_user(
+        username="author", password="pwd", first_name="Ann", last_name="Lee"
+    )
+
+    response = client.post(
+        reverse("login"), {"username": "author", "password": "pwd"}
+    )
+    assert response.status_code == 302
+
+    with CaptureQueriesContext(connection) as queries:
+        client.post(reverse("status_create"), {"name": "Open"})
+        response = client.get(reverse("statuses_index"))
+    assert _session_queries(queries.captured_queries) == []
+    assert "alert-success" in response.content.decode()
+
+    with CaptureQueriesContext(connection) as queries:
+        client.post(reverse("logout"))
+    if storage == "signed_cookies":
+        assert _session_queries(queries.captured_queries) == []
+    response = client.get(reverse("tasks_index"))
+    assert response.status_code == 302
+    assert response.url.startswith(reverse("login"))
@@ -1,6 +1,8 @@
 import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.crypto import get_random_string
 
@@ -31,6 +33,23 @@ def test_status_delete_success(client):
     )
 
 
+@pytest.mark.django_db
+def test_status_delete_loads_the_status_once(client):
+    user = User.objects.create_user(username="owner")
+    status = Status.objects.create(name="Temporary")
+    client.force_login(user)
+
+    with CaptureQueriesContext(connection) as ctx:
+        client.post(reverse("status_delete", args=[status.id]))
+
+    selects = [
+        q["sql"] for q in ctx.captured_queries
+        if q["sql"].startswith("SELECT") and '"statuses_status"' in q["sql"]
+    ]
+    assert len(selects) == 1
+    assert not Status.objects.filter(id=status.id).exists()
+
+
 @pytest.mark.django_db
 def test_status_delete_protected(client):
     password = get_random_string(8)
@@ -2,9 +2,11 @@ from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
+from django.db import NotSupportedError, models
 from django.utils.crypto import get_random_string
 from whitenoise.storage import CompressedManifestStaticFilesStorage
 
+from task_manager.operations import AddIndexConcurrently
 from task_manager.rollbar_middleware import CustomRollbarNotifierMiddleware
 
 
@@ -109,3 +111,30 @@ def test_rollbar_init_not_called_without_access_token(monkeypatch):
     middleware = _build_middleware()
     assert called["ran"] is False
     assert middleware.settings == {}
+
+
+def _index_operation():
+    return AddIndexConcurrently(
+        model_name="task",
+        index=models.Index(fields=["created_at"], name="test_idx"),
+    )
+
+
+def test_add_index_concurrently_only_on_postgresql():
+    operation = _index_operation()
+    sqlite_editor = SimpleNamespace(
+        connection=SimpleNamespace(vendor="sqlite", in_atomic_block=True),
+    )
+    postgres_editor = SimpleNamespace(
+        connection=SimpleNamespace(vendor="postgresql", in_atomic_block=False),
+    )
+    assert operation._concurrently(sqlite_editor) == {}
+    assert operation._concurrently(postgres_editor) == {"concurrently": True}
+
+
+def test_add_index_concurrently_rejects_transaction():
+    editor = SimpleNamespace(
+        connection=SimpleNamespace(vendor="postgresql", in_atomic_block=True),
+    )
+    with pytest.raises(NotSupportedError):
+        _index_operation()._concurrently(editor)
@@ -0,0 +1,223 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from task_manager.statuses.models import Status
+from task_manager.tasks import bulk, events
+from task_manager.tasks.async_views import TaskEventsView
+from task_manager.tasks.models import Task
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.events = []
+
+    def publish(self, event):
+        self.events.append(event)
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = RecordingBroker()
+    monkeypatch.setattr(events, "get_broker", lambda: broker)
+    return broker
+
+
+def _parse(messages):
+    parsed = []
+    for message in messages:
+        lines = dict(
+            line.split(": ", 1) for line in message.strip().splitlines()
+        )
+        parsed.append((lines["event"], json.loads(lines["data"])))
+    return parsed
+
+
+def _messages(batch, **params):
+    view = TaskEventsView()
+    view.request = type("Request", (), {"GET": params, "user": None})()
+    queryset = view.filter_tasks(Task.objects.for_list())
+    return _parse(async_to_sync(view.messages)(queryset, batch))
+
+
+@pytest.mark.django_db
+def test_task_changes_are_published_after_commit(
+    broker, author, status, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        task = Task.objects.create(name="Task", status=status, author=author)
+        assert broker.events == []
+    task_id = task.pk
+    with django_capture_on_commit_callbacks(execute=True):
+        task.name = "Renamed"
+        task.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        task.delete()
+
+    assert broker.events == [
+        {"type": "created", "ids": [task_id]},
+        {"type": "updated", "ids": [task_id]},
+        {"type": "deleted", "ids": [task_id]},
+    ]
+
+
+@pytest.mark.django_db
+def test_broker_failure_does_not_fail_the_write(
+    monkeypatch, author, status, django_capture_on_commit_callbacks
+):
+    class BrokenBroker:
+        def publish(self, event):
+            raise ConnectionError("broker is down")
+
+    monkeypatch.setattr(events, "get_broker", BrokenBroker)
+    with django_capture_on_commit_callbacks(execute=True):
+        task = Task.objects.create(name="Task", status=status, author=author)
+
+    assert Task.objects.filter(pk=task.pk).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_actions_publish_one_event(
+    broker, author, status, django_capture_on_commit_callbacks
+):
+    tasks = [
+        Task.objects.create(name=f"Task {i}", status=status, author=author)
+        for i in range(3)
+    ]
+    task_ids = [task.pk for task in tasks]
+    done = Status.objects.create(name="Done")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk.set_status(task_ids, done)
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk.delete(task_ids)
+
+    assert broker.events == [
+        {"type": "updated", "ids": task_ids},
+        {"type": "deleted", "ids": task_ids},
+    ]
+
+
+@pytest.mark.django_db
+def test_status_rename_asks_pages_to_reload(
+    broker, status, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        status.name = "In progress"
+        status.save()
+
+    assert {"type": "reload", "ids": []} in broker.events
+
+
+@pytest.mark.django_db
+def test_messages_render_matching_rows(author, status):
+    done = Status.objects.create(name="Done")
+    shown = Task.objects.create(name="Shown", status=status, author=author)
+    hidden = Task.objects.create(name="Hidden", status=done, author=author)
+
+    messages = _messages(
+        [
+            {"type": "created", "ids": [shown.pk]},
+            {"type": "updated", "ids": [hidden.pk]},
+            {"type": "deleted", "ids": [999]},
+        ],
+        status=str(status.pk),
+    )
+
+    (upsert, data), (remove, removed) = messages
+    assert upsert == "upsert"
+    assert data["id"] == shown.pk and data["created"]
+    assert f'id="task-{shown.pk}"' in data["html"]
+    assert remove == "remove"
+    assert removed == {"ids": [hidden.pk, 999]}
+
+
+@pytest.mark.django_db
+def test_messages_ask_to_reload(author, status, monkeypatch):
+    monkeypatch.setattr("task_manager.tasks.async_views.EVENTS_MAX_ROWS", 1)
+
+    assert _messages([{"type": "reload", "ids": []}]) == [("reload", {})]
+    assert _messages([{"type": "updated", "ids": [1, 2]}]) == [("reload", {})]
+
+
+@pytest.mark.django_db
+def test_batched_merges_events(broker, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        with events.batched():
+            events.publish(events.DELETED, [2])
+            events.publish(events.DELETED, [1])
+            events.publish(events.UPDATED, [])
+
+    assert broker.events == [{"type": "deleted", "ids": [1, 2]}]
+
+
+def test_subscription_overflow_turns_into_reload(monkeypatch):
+    monkeypatch.setattr(events, "QUEUE_SIZE", 2)
+
+    async def receive():
+        broker = events.LocalBroker()
+        async with broker.subscribe() as subscription:
+            broker.publish({"type": "updated", "ids": [1]})
+            await asyncio.sleep(0)
+            first = await subscription.get()
+            for task_id in range(3):
+                broker.publish({"type": "updated", "ids": [task_id]})
+            await asyncio.sleep(0)
+            return first, await subscription.get()
+
+    first, second = async_to_sync(receive)()
+
+    assert first == [{"type": "updated", "ids": [1]}]
+    assert second == [{"type": "reload", "ids": []}]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.urls("task_manager.asgi_urls")
+def test_stream_pushes_rows(author, status):
+    task = Task.objects.create(name="Live", status=status, author=author)
+
+    async def read_stream():
+        client = AsyncClient()
+        await client.aforce_login(author)
+        response = await client.get(reverse("task_events"))
+        chunks = aiter(response.streaming_content)
+        first = await anext(chunks)
+        events.get_broker().publish({"type": "updated", "ids": [task.pk]})
+        second = await anext(chunks)
+        await chunks.aclose()
+        return response, first, second
+
+    response, first, second = async_to_sync(read_stream)()
+
+    assert response["Content-Type"] == "text/event-stream"
+    assert first.decode().startswith("retry:")
+    [(event, data)] = _parse([second.decode()])
+    assert event == "upsert" and data["id"] == task.pk
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("task_manager.asgi_urls")
+def test_task_list_subscribes_to_events(client, author, status):
+    Task.objects.create(name="Live", status=status, author=author)
+    client.force_login(author)
+
+    response = client.get(reverse("tasks_index"), {"status": status.pk})
+
+    content = response.content.decode()
+    assert "new EventSource" in content
+    assert f"{reverse('task_events')}?status={status.pk}" in (
+        response.context["events_url"]
+    )
+
+
+@pytest.mark.django_db
+def test_wsgi_task_list_has_no_stream(client, author):
+    client.force_login(author)
+
+    response = client.get(reverse("tasks_index"))
+
+    assert "EventSource" not in response.content.decode()
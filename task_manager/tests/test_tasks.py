@@ -1,11 +1,20 @@
+import base64
+import csv
+import io
+import json
+
 import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 from task_manager.tasks.filters import TaskFilter
 from task_manager.tasks.models import Task
+from task_manager.tasks.views import TaskListView
 
 User = get_user_model()
 
@@ -171,3 +180,306 @@ def test_task_delete_by_author(client):
     assert not Task.objects.filter(id=task.id).exists()
     messages = [m.message.lower() for m in get_messages(response.wsgi_request)]
     assert any("deleted" in msg or "успешно" in msg for msg in messages)
+
+
+@pytest.mark.django_db
+def test_task_list_keyset_pagination(client, monkeypatch):
+    monkeypatch.setattr(TaskListView, "paginate_by", 2)
+    status = Status.objects.create(name="Open")
+    author = User.objects.create_user(username="author", password="pwd")
+    names = [f"Task {i}" for i in range(5)]
+    for name in names:
+        Task.objects.create(name=name, status=status, author=author)
+    # Одинаковое время создания не должно ломать порядок страниц.
+    Task.objects.update(created_at=Task.objects.first().created_at)
+    client.login(username="author", password="pwd")
+
+    seen = []
+    response = client.get(reverse("tasks_index"))
+    while True:
+        page = response.context["page_obj"]
+        seen.extend(task.name for task in page)
+        if not page.has_next():
+            break
+        response = client.get(
+            reverse("tasks_index"),
+            {"after": page.next_cursor},
+        )
+    assert seen == names
+
+    previous = client.get(
+        reverse("tasks_index"),
+        {"before": page.previous_cursor},
+    )
+    assert [t.name for t in previous.context["page_obj"]] == names[2:4]
+
+
+@pytest.mark.django_db
+def test_task_list_pagination_keeps_filters(client, monkeypatch):
+    monkeypatch.setattr(TaskListView, "paginate_by", 1)
+    status = Status.objects.create(name="Open")
+    author = User.objects.create_user(username="author", password="pwd")
+    other = User.objects.create_user(username="other", password="pwd")
+    Task.objects.create(name="Mine 1", status=status, author=author)
+    Task.objects.create(name="Foreign", status=status, author=other)
+    Task.objects.create(name="Mine 2", status=status, author=author)
+    client.login(username="author", password="pwd")
+
+    response = client.get(
+        reverse("tasks_index"),
+        {"self_tasks": "on", "status": status.id},
+    )
+    page = response.context["page_obj"]
+    assert [t.name for t in page] == ["Mine 1"]
+    next_link = f"after={page.next_cursor}"
+    content = response.content.decode()
+    assert next_link in content
+    assert "self_tasks=on" in content
+
+    response = client.get(
+        reverse("tasks_index"),
+        {"self_tasks": "on", "status": status.id, "after": page.next_cursor},
+    )
+    page = response.context["page_obj"]
+    assert [t.name for t in page] == ["Mine 2"]
+    assert not page.has_next()
+
+
+@pytest.mark.django_db
+def test_task_list_invalid_cursor_returns_404(client):
+    User.objects.create_user(username="author", password="pwd")
+    client.login(username="author", password="pwd")
+
+    response = client.get(reverse("tasks_index"), {"after": "not-a-cursor"})
+    assert response.status_code == 404
+
+
+def _cursor(values):
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("values", [
+    ["x", 1],
+    [None, None],
+    [[1], {"a": 1}],
+    ["2024-01-01T00:00:00+00:00", "abc"],
+    ["2024-01-01T00:00:00", 1],
+])
+def test_task_list_cursor_with_bad_values_returns_404(client, values):
+    User.objects.create_user(username="author", password="pwd")
+    client.login(username="author", password="pwd")
+
+    for param in ("after", "before"):
+        response = client.get(
+            reverse("tasks_index"), {param: _cursor(values)}
+        )
+        assert response.status_code == 404
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+def _create_tasks(count, status, author, labels):
+    for i in range(count):
+        task = Task.objects.create(
+            name=f"Task {i}",
+            status=status,
+            author=author,
+            executor=author,
+        )
+        task.labels.set(labels)
+
+
+@pytest.mark.django_db
+def test_task_list_query_count_does_not_depend_on_rows(client):
+    status = Status.objects.create(name="Open")
+    author = User.objects.create_user(
+        username="author", password="pwd", first_name="A", last_name="B"
+    )
+    labels = [Label.objects.create(name=f"Label {i}") for i in range(3)]
+    client.login(username="author", password="pwd")
+    url = reverse("tasks_index")
+
+    _create_tasks(1, status, author, labels)
+    # Первый запрос заполняет кэш списков выбора для фильтра.
+    _count_queries(client, url)
+    single = _count_queries(client, url)
+    _create_tasks(20, status, author, labels)
+    many = _count_queries(client, url)
+
+    assert many == single
+
+
+@pytest.mark.django_db
+def test_task_detail_query_count_does_not_depend_on_labels(client):
+    status = Status.objects.create(name="Open")
+    author = User.objects.create_user(username="author", password="pwd")
+    task = Task.objects.create(
+        name="Detail", status=status, author=author, executor=author
+    )
+    client.login(username="author", password="pwd")
+    url = reverse("task_show", args=[task.id])
+    # Первый запрос кэширует пользователя сессии.
+    client.get(url)
+
+    task.labels.set([Label.objects.create(name="Bug")])
+    single = _count_queries(client, url)
+    task.labels.set([Label.objects.create(name=f"L{i}") for i in range(10)])
+    many = _count_queries(client, url)
+
+    assert many == single
+    response = client.get(url)
+    assert "L9" in response.content.decode()
+
+
+def _search(client, **params):
+    response = client.get(reverse("tasks_index"), params)
+    assert response.status_code == 200
+    return [task.name for task in response.context["tasks"]]
+
+
+@pytest.mark.django_db
+def test_task_search_ranks_name_matches_first(client):
+    status = Status.objects.create(name="Open")
+    author = User.objects.create_user(username="author", password="pwd")
+    Task.objects.create(
+        name="Write docs",
+        description="Describe how we deploy",
+        status=status,
+        author=author,
+    )
+    Task.objects.create(name="Deploy release", status=status, author=author)
+    Task.objects.create(name="Unrelated", status=status, author=author)
+    client.login(username="author", password="pwd")
+
+    assert _search(client, q="deploy") == ["Deploy release", "Write docs"]
+    assert _search(client, q="depl") == ["Deploy release", "Write docs"]
+    assert _search(client, q="deploy release") == ["Deploy release"]
+
+
+@pytest.mark.django_db
+def test_task_search_combines_with_filters_and_tracks_changes(client):
+    open_status = Status.objects.create(name="Open")
+    done = Status.objects.create(name="Done")
+    author = User.objects.create_user(username="author", password="pwd")
+    task = Task.objects.create(
+        name="Починить сервер", status=open_status, author=author
+    )
+    Task.objects.create(name="Починить принтер", status=done, author=author)
+    client.login(username="author", password="pwd")
+
+    assert _search(client, q="починить", status=open_status.id) == [
+        "Починить сервер",
+    ]
+
+    task.name = "Настроить сервер"
+    task.save()
+    assert _search(client, q="починить") == ["Починить принтер"]
+    assert _search(client, q="настроить") == ["Настроить сервер"]
+
+    task.delete()
+    assert _search(client, q="сервер") == []
+
+
+@pytest.mark.django_db
+def test_task_search_paginates_by_rank(client, monkeypatch):
+    monkeypatch.setattr(TaskListView, "paginate_by", 1)
+    status = Status.objects.create(name="Open")
+    author = User.objects.create_user(username="author", password="pwd")
+    Task.objects.create(
+        name="Docs", description="deploy", status=status, author=author
+    )
+    Task.objects.create(name="Deploy", status=status, author=author)
+    client.login(username="author", password="pwd")
+
+    response = client.get(reverse("tasks_index"), {"q": "deploy"})
+    page = response.context["page_obj"]
+    assert [t.name for t in page] == ["Deploy"]
+
+    response = client.get(
+        reverse("tasks_index"),
+        {"q": "deploy", "after": page.next_cursor},
+    )
+    page = response.context["page_obj"]
+    assert [t.name for t in page] == ["Docs"]
+    assert not page.has_next()
+
+
+def _export(client, **params):
+    response = client.get(reverse("task_export"), params)
+    assert response.status_code == 200
+    return response, b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_task_export_csv_respects_filters(client):
+    status = Status.objects.create(name="Open")
+    closed = Status.objects.create(name="Closed")
+    author = User.objects.create_user(
+        username="author", password="pwd", first_name="Ann", last_name="Lee"
+    )
+    other = User.objects.create_user(username="other", password="pwd")
+    bug = Label.objects.create(name="Bug")
+    urgent = Label.objects.create(name="Urgent")
+    task = Task.objects.create(
+        name="Export me", description="Line, with comma",
+        status=status, author=author,
+    )
+    task.labels.set([urgent, bug])
+    Task.objects.create(name="Closed one", status=closed, author=author)
+    Task.objects.create(name="Foreign", status=status, author=other)
+    client.login(username="author", password="pwd")
+
+    response, content = _export(
+        client, status=status.pk, self_tasks="1", format="csv"
+    )
+
+    assert response["Content-Type"].startswith("text/csv")
+    assert 'filename="tasks.csv"' in response["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert [row["name"] for row in rows] == ["Export me"]
+    assert rows[0]["description"] == "Line, with comma"
+    assert rows[0]["author"] == "Ann Lee"
+    assert rows[0]["executor"] == ""
+    assert rows[0]["labels"] == "Bug, Urgent"
+
+
+@pytest.mark.django_db
+def test_task_export_jsonl_loads_labels_per_chunk(client, monkeypatch):
+    monkeypatch.setattr("task_manager.tasks.export.CHUNK_SIZE", 5)
+    status = Status.objects.create(name="Open")
+    author = User.objects.create_user(
+        username="author", password="pwd", first_name="A", last_name="B"
+    )
+    labels = [Label.objects.create(name=f"Label {i}") for i in range(2)]
+    _create_tasks(12, status, author, labels)
+    client.login(username="author", password="pwd")
+
+    with CaptureQueriesContext(connection) as ctx:
+        response, content = _export(client, format="jsonl")
+    label_queries = [
+        q for q in ctx.captured_queries if "tasks_task_labels" in q["sql"]
+    ]
+
+    records = [json.loads(line) for line in content.splitlines()]
+    assert response["Content-Type"].startswith("application/x-ndjson")
+    assert [r["name"] for r in records] == [f"Task {i}" for i in range(12)]
+    assert records[0]["labels"] == ["Label 0", "Label 1"]
+    assert records[0]["executor"] == "A B"
+    assert len(label_queries) == 3
+
+
+@pytest.mark.django_db
+def test_task_export_unknown_format_returns_404(client):
+    User.objects.create_user(username="author", password="pwd")
+    client.login(username="author", password="pwd")
+
+    response = client.get(reverse("task_export"), {"format": "xml"})
+
+    assert response.status_code == 404
@@ -18,6 +18,8 @@ from django.contrib import admin
 from django.urls import include, path
 
 from task_manager import views
+from task_manager.db_pool import DatabasePoolStatsView
+from task_manager.metrics import MetricsView
 from task_manager.users.views import UserLoginView, UserLogoutView
 
 urlpatterns = [
@@ -29,4 +31,11 @@ urlpatterns = [
     path('statuses/', include('task_manager.statuses.urls')),
     path('tasks/', include('task_manager.tasks.urls')),
     path('labels/', include('task_manager.labels.urls')),
+    path('api/', include('task_manager.api.urls')),
+    path(
+        'stats/db-pool/',
+        DatabasePoolStatsView.as_view(),
+        name='db_pool_stats',
+    ),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
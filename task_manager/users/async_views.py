@@ -0,0 +1,38 @@
+"""Async login for the ASGI deployment.
+
+Checking a password takes tens of milliseconds of CPU. The async view
+hands it to the bounded pool of ``task_manager/users/hashers.py``, so
+a burst of logins waits there while the event loop keeps serving other
+requests.
+"""
+
+from django.contrib import messages
+from django.contrib.auth import alogin
+from django.shortcuts import redirect
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import never_cache
+from django.views.decorators.debug import sensitive_post_parameters
+
+from task_manager.async_views import AsyncPageView
+from task_manager.users.forms import UserLoginForm
+from task_manager.users.views import UserLoginView
+
+
+@method_decorator([sensitive_post_parameters(), never_cache], 'dispatch')
+class UserLoginAsyncView(AsyncPageView):
+    http_method_names = ['get', 'post', 'head', 'options']
+    template_name = UserLoginView.template_name
+    success_message = UserLoginView.success_message
+    login_required = False
+
+    async def aget_context_data(self, **kwargs):
+        kwargs.setdefault('form', UserLoginForm(self.request))
+        return await super().aget_context_data(**kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        form = UserLoginForm(request, data=request.POST)
+        if not await form.ais_valid():
+            return self.render(await self.aget_context_data(form=form))
+        await alogin(request, form.get_user())
+        messages.success(request, self.success_message)
+        return redirect('index')
@@ -0,0 +1,129 @@
+"""Authentication backend of the project.
+
+``get_user()`` is what ``AuthenticationMiddleware`` calls on every request
+with a session. The user row is cached under the user's id for
+``AUTH_USER_CACHE_TIMEOUT`` seconds, so pages usually skip the users
+table. The entry keeps only the fields pages read and the session hashes
+that ``django.contrib.auth.get_user()`` compares, never the password
+hash; other fields are loaded from the database when accessed.
+``users/signals.py`` drops the entry whenever the user is saved or
+deleted, which covers a password change: the session hash is then
+computed from the new password again.
+
+Only a shared cache makes that drop visible to every worker. With the
+per-process cache the settings keep the timeout to a few seconds, so a
+blocked user or an old password outlives the change only that long.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from task_manager import cache_utils
+from task_manager.users import hashers
+
+# Увеличить при изменении формата записи в кэше.
+VERSION = 2
+
+User = get_user_model()
+
+
+def _key(user_id):
+    return f"auth:user:{user_id}"
+
+
+# from_db() ждёт значения в порядке полей модели.
+FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in {
+        "id", "username", "first_name", "last_name", "email", "is_active",
+        "is_staff",
+    }
+)
+
+
+def _serialize(user):
+    return {
+        "fields": [getattr(user, name) for name in FIELDS],
+        "session_auth_hashes": (
+            user.get_session_auth_hash(),
+            list(user.get_session_auth_fallback_hash()),
+        ),
+    }
+
+
+def _deserialize(data):
+    user = User.from_db(DEFAULT_DB_ALIAS, FIELDS, data["fields"])
+    user.session_auth_hashes = data["session_auth_hashes"]
+    return user
+
+
+def invalidate(user_id):
+    cache_utils.delete_after_commit([_key(user_id)], version=VERSION)
+
+
+class UserBackend(ModelBackend):
+    """ModelBackend with a cached get_user() and an async path that hashes
+    passwords outside the event loop."""
+
+    async def aauthenticate(
+        self, request, username=None, password=None, **kwargs
+    ):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await User._default_manager.aget_by_natural_key(username)
+        except User.DoesNotExist:
+            # Как и ModelBackend, тратим время на хэш и для несуществующего
+            # пользователя, чтобы не выдавать его отсутствие (#20760).
+            await hashers.amake_password(password)
+            return None
+        if await user.acheck_password(password) and self.user_can_authenticate(
+            user
+        ):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        data = cache.get(_key(user_id), version=VERSION)
+        if data is None:
+            # Запись в кэше живёт дольше задержки реплики, поэтому
+            # пользователь читается из основной базы.
+            try:
+                user = User._default_manager.db_manager(
+                    DEFAULT_DB_ALIAS
+                ).get(pk=user_id)
+            except User.DoesNotExist:
+                return None
+            data = _serialize(user)
+            cache.set(
+                _key(user_id),
+                data,
+                settings.AUTH_USER_CACHE_TIMEOUT,
+                version=VERSION,
+            )
+        user = _deserialize(data)
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        data = await cache.aget(_key(user_id), version=VERSION)
+        if data is None:
+            try:
+                user = await User._default_manager.db_manager(
+                    DEFAULT_DB_ALIAS
+                ).aget(pk=user_id)
+            except User.DoesNotExist:
+                return None
+            data = _serialize(user)
+            await cache.aset(
+                _key(user_id),
+                data,
+                settings.AUTH_USER_CACHE_TIMEOUT,
+                version=VERSION,
+            )
+        user = _deserialize(data)
+        return user if self.user_can_authenticate(user) else None
@@ -1,5 +1,5 @@
 from django import forms
-from django.contrib.auth import get_user_model
+from django.contrib.auth import aauthenticate, get_user_model
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.utils.translation import gettext_lazy as _
 
@@ -122,6 +122,9 @@ class UserUpdateForm(UserCreateForm):
 
 class UserLoginForm(NoLabelSuffixMixin, AuthenticationForm):
     label_suffix = ""
+    # Пароль уже проверен в ais_valid(), clean() не должен звать
+    # синхронный authenticate().
+    credentials_checked = False
     username = forms.CharField(
         label=_("Username"),
         widget=forms.TextInput(
@@ -140,3 +143,22 @@ class UserLoginForm(NoLabelSuffixMixin, AuthenticationForm):
             }
         ),
     )
+
+    async def ais_valid(self):
+        """is_valid() for async views: authenticate with aauthenticate()."""
+        username = self.fields["username"].to_python(self.data.get("username"))
+        password = self.fields["password"].to_python(self.data.get("password"))
+        if username and password:
+            self.user_cache = await aauthenticate(
+                self.request, username=username, password=password
+            )
+            self.credentials_checked = True
+        return self.is_valid()
+
+    def clean(self):
+        if not self.credentials_checked:
+            return super().clean()
+        if self.user_cache is None:
+            raise self.get_invalid_login_error()
+        self.confirm_login_allowed(self.user_cache)
+        return self.cleaned_data
@@ -0,0 +1,94 @@
+"""Password hashers with the cost taken from settings.
+
+``PASSWORD_HASHER`` picks the algorithm for new hashes (see
+``settings.py``), the ``PASSWORD_<ALGORITHM>_*`` settings pick its cost.
+Hashes made with another algorithm or cost still verify and are
+rehashed with the current one on the next successful login: Django
+calls the password setter when ``must_update()`` says so.
+
+Under ASGI a hash must not run on the event loop. ``averify_password()``
+and ``amake_password()`` run it in a thread pool of
+``PASSWORD_HASHING_WORKERS`` threads, so a burst of logins queues there
+instead of taking all CPUs or blocking other requests.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+    @property
+    def maxmem(self):
+        # По умолчанию OpenSSL даёт 32 МиБ, этого не хватит уже при
+        # n=2**15, поэтому лимит считаем от текущих параметров. Хэши
+        # с большей стоимостью, чем в настройках, он может не пропустить.
+        n, r, p = self.work_factor, self.block_size, self.parallelism
+        return 128 * r * (n + p + 2) + 1024 * 1024
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Needs the ``argon2-cffi`` package."""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+@functools.cache
+def get_executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASHING_WORKERS,
+        thread_name_prefix="password-hashing",
+    )
+
+
+@receiver(setting_changed)
+def reset_executor(*, setting, **kwargs):
+    if setting == "PASSWORD_HASHING_WORKERS":
+        get_executor.cache_clear()
+
+
+async def _run(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), func, *args)
+
+
+async def averify_password(password, encoded):
+    """Async ``verify_password()``: ``(is_correct, must_update)``."""
+    return await _run(hashers.verify_password, password, encoded)
+
+
+async def amake_password(password):
+    return await _run(hashers.make_password, password)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_user_first_name_alter_user_last_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='authored_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Authored tasks'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='executed_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Executed tasks'),
+        ),
+    ]
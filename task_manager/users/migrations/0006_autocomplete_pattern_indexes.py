@@ -0,0 +1,18 @@
+from django.db import migrations
+
+from task_manager.autocomplete import pattern_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(*pattern_indexes(
+            ('users_user', 'user_username_lower_idx', 'username'),
+            ('users_user', 'user_first_name_lower_idx', 'first_name'),
+            ('users_user', 'user_last_name_lower_idx', 'last_name'),
+        )),
+    ]
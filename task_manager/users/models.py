@@ -1,16 +1,74 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.tasks.counters import CountedModelMixin
+from task_manager.users import hashers
 
-class User(AbstractUser):
+
+class User(CountedModelMixin, AbstractUser):
     first_name = models.CharField(
         max_length=150, blank=False, verbose_name=_("First name")
     )
     last_name = models.CharField(
         max_length=150, blank=False, verbose_name=_("Last name")
     )
+    authored_task_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name=_("Authored tasks")
+    )
+    executed_task_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name=_("Executed tasks")
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name=_("Updated at")
+    )
     USERNAME_FIELD = "username"
+    COUNTER_FIELDS = ("authored_task_count", "executed_task_count")
+    # Готовые хэши сессии пользователя из кэша (users/backends.py), в
+    # котором нет хэша пароля.
+    session_auth_hashes = None
+
+    class Meta(AbstractUser.Meta):
+        # Поиск по префиксу в автодополнении (task_manager/autocomplete.py).
+        indexes = [
+            models.Index(Lower("username"), name="user_username_lower_idx"),
+            models.Index(
+                Lower("first_name"), name="user_first_name_lower_idx"
+            ),
+            models.Index(Lower("last_name"), name="user_last_name_lower_idx"),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
+
+    @property
+    def task_count(self):
+        return self.authored_task_count + self.executed_task_count
+
+    def get_session_auth_hash(self):
+        if self.session_auth_hashes is not None:
+            return self.session_auth_hashes[0]
+        return super().get_session_auth_hash()
+
+    def get_session_auth_fallback_hash(self):
+        if self.session_auth_hashes is not None:
+            yield from self.session_auth_hashes[1]
+        else:
+            yield from super().get_session_auth_fallback_hash()
+
+    def set_password(self, raw_password):
+        self.session_auth_hashes = None
+        super().set_password(raw_password)
+
+    async def acheck_password(self, raw_password):
+        # Хэш считается в пуле потоков (users/hashers.py), а не в цикле
+        # событий. Устаревший хэш заменяется, как и в check_password().
+        is_correct, must_update = await hashers.averify_password(
+            raw_password, self.password
+        )
+        if is_correct and must_update:
+            self.password = await hashers.amake_password(raw_password)
+            self._password = None
+            await self.asave(update_fields=["password"])
+        return is_correct
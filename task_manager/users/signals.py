@@ -0,0 +1,16 @@
+"""Signal handlers of the users app."""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import backends
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    # В том числе смена пароля: хэш сессии сверяется с новым паролем.
+    backends.invalidate(instance.pk)
@@ -1,9 +1,15 @@
 from django.urls import path
 
+from task_manager.autocomplete import USERS, AutocompleteView
 from task_manager.users import views
 
 urlpatterns = [
     path('', views.UsersIndexView.as_view(), name='users_index'),
+    path(
+        'autocomplete/',
+        AutocompleteView.as_view(source=USERS),
+        name='user_autocomplete',
+    ),
     path('create/', views.UserCreateView.as_view(), name='user_create'),
     path(
         '<int:pk>/update/',
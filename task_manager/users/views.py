@@ -9,6 +9,7 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.conditional import ConditionalGetMixin
 from task_manager.users.forms import (
     UserLoginForm,
     UserRegistrationForm,
@@ -18,7 +19,7 @@ from task_manager.users.forms import (
 User = get_user_model()
 
 
-class UsersIndexView(ListView):
+class UsersIndexView(ConditionalGetMixin, ListView):
     model = User
     template_name = 'users/index.html'
     context_object_name = 'users'
@@ -88,15 +89,20 @@ class UserDeleteView(
         return redirect('users_index')
 
     def post(self, request, *args, **kwargs):
+        if self.get_object().task_count:
+            return self._deny_delete()
         try:
             return super().post(request, *args, **kwargs)
         except ProtectedError:
-            messages.error(
-                request,
-                _("It is impossible to delete the user \
+            return self._deny_delete()
+
+    def _deny_delete(self):
+        messages.error(
+            self.request,
+            _("It is impossible to delete the user \
                     because it is being used")
-            )
-            return redirect(self.success_url)
+        )
+        return redirect(self.success_url)
 
 
 class UserLoginView(SuccessMessageMixin, LoginView):